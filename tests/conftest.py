@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def sem_arquivos_persistidos():
+    """Impede que os testes gravem caches e índices ao lado da base de casos do repositório. Os testes de persistência
+    religam as opções com o próprio monkeypatch, apontando a base para tmp_path."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("truco.dados.CACHE_BINARIO", False)
+        patch.setattr("truco.cbr.INDICE_PERSISTIDO", False)
+        patch.setattr("truco.cbr.DECISOES_PERSISTIDAS", False)
+        yield
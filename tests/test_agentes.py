@@ -0,0 +1,74 @@
+import pytest
+from truco.agentes import AgenteJogador, AgenteTerminal, Pergunta, perguntar
+from truco.interface import InterfaceSilenciosa
+from truco.jogador import Jogador
+from truco.motor import Motor
+from truco.simulacao import BotRoteirizado
+
+
+class AgenteFixo():
+    """Agente de teste que sempre dá a mesma resposta."""
+    def __init__(self, resposta):
+        self.resposta = resposta
+
+    def responder(self, pergunta):
+        return self.resposta
+
+
+def test_pergunta_desconhecida():
+    with pytest.raises(ValueError):
+        Pergunta('baralho', 1, None)
+
+
+def test_resposta_invalida_vale_o_padrao():
+    pergunta = Pergunta('truco', 1, None, opcoes={0: 'Recusar', 1: 'Aceitar'}, padrao=1)
+
+    assert perguntar(AgenteFixo(0), pergunta) == 0
+    assert perguntar(AgenteFixo(5), pergunta) == 1
+
+
+def test_agente_jogador_usa_o_proprio_cbr():
+    jogador = BotRoteirizado("roteirizado")
+    recebidos = []
+    jogador.avaliar_truco = lambda cbr, tipo, quem_pediu: recebidos.append(cbr) or 1
+
+    AgenteJogador('proprio').responder(Pergunta('truco', 2, jogador, 'pergunta', estado='truco'))
+    AgenteJogador().responder(Pergunta('truco', 2, jogador, 'pergunta', estado='truco'))
+
+    assert recebidos == ['proprio', 'pergunta']
+
+
+def test_agente_terminal_repete_ate_opcao_valida(monkeypatch):
+    respostas = iter(['7', '2', '1'])
+    monkeypatch.setattr('builtins.input', lambda mensagem: next(respostas))
+    pergunta = Pergunta('truco', 1, Jogador("humano"), opcoes={0: 'Recusar', 1: 'Aceitar'}, valor=2)
+
+    assert AgenteTerminal(InterfaceSilenciosa()).responder(pergunta) == 1
+    assert AgenteTerminal(InterfaceSilenciosa()).responder(Pergunta('pedir_envido', 1, None)) == 0
+
+
+def test_agente_terminal_informa_o_valor_da_aposta(monkeypatch):
+    mensagens = []
+    monkeypatch.setattr('builtins.input', lambda mensagem: mensagens.append(mensagem) or '1')
+    opcoes = {0: 'Recusar', 1: 'Aceitar'}
+    agente = AgenteTerminal(InterfaceSilenciosa())
+
+    agente.responder(Pergunta('truco', 1, Jogador("humano"), opcoes=opcoes, valor=2))
+    agente.responder(Pergunta('envido', 1, Jogador("humano"), opcoes=opcoes, valor=5))
+
+    assert "a mão passa a valer 2 pontos" in mensagens[0]
+    assert "o envido passa a valer 5 pontos" in mensagens[1]
+
+
+def test_partida_com_agente_terminal(monkeypatch, capsys):
+    # O humano joga sempre a primeira carta e aceita todos os pedidos
+    monkeypatch.setattr('builtins.input', lambda mensagem: '0' if 'carta' in mensagem else '1')
+    maos = []
+    motor = Motor(Jogador("humano"), BotRoteirizado("roteirizado"), {1: AgenteTerminal(InterfaceSilenciosa()), 2: AgenteJogador()},
+                  semente=4, ao_encerrar_mao=maos.append)
+
+    vencedor, total = motor.jogar_partida()
+
+    assert vencedor in [1, 2] and motor.jogador(vencedor).pontos >= 12
+    assert len(maos) == total and maos[0] is motor
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,67 @@
+import pytest
+from truco.apostas import ACEITAR, ACOES, PEDE, RECUSAR, RESPONDE, TRANSICOES, VALOR_FALTA
+from truco.envido import Envido
+from truco.interface import InterfaceSilenciosa
+from truco.jogador import Jogador
+from truco.truco import Truco
+
+
+class AgenteRoteirizado():
+    """Agente de teste que responde em sequência as respostas informadas."""
+    def __init__(self, respostas):
+        self.respostas = list(respostas)
+
+    def responder(self, pergunta):
+        return self.respostas.pop(0)
+
+
+@pytest.fixture
+def jogadores():
+    jogador1, jogador2 = Jogador("j1"), Jogador("j2")
+    jogador1.pontos, jogador2.pontos = 3, 7
+    return jogador1, jogador2
+
+
+def test_tabela_de_transicoes():
+    assert TRANSICOES[('truco', '', PEDE, 'truco')] == ('truco', 1, 2)
+    assert TRANSICOES[('truco', 'truco', RESPONDE, 2)] == ('retruco', 2, 3)
+    assert TRANSICOES[('envido', 6, RESPONDE, 3)] == (8, 5, VALOR_FALTA)
+    assert ('truco', 'vale_quatro', PEDE) not in ACOES
+    assert ACOES[('truco', 'vale_quatro', RESPONDE)] == {RECUSAR: 'Recusar', ACEITAR: 'Aceitar'}
+    assert ACOES[('envido', 6, RESPONDE)] == {0: 'Recusar', 1: 'Aceitar', 2: 'Real Envido', 3: 'Falta Envido'}
+
+
+def test_truco_ate_o_vale_quatro(jogadores):
+    jogador1, jogador2 = jogadores
+    agentes = {1: AgenteRoteirizado([2]), 2: AgenteRoteirizado([2, 1])}
+    truco = Truco(agentes, InterfaceSilenciosa())
+
+    assert truco.controlador_truco(None, None, 1, jogador1, jogador2) is True
+    assert truco.estado_atual == 'vale_quatro' and truco.retornar_valor_aposta() == 4
+    assert truco.acoes_validas(PEDE) == {}
+    assert truco.controlador_truco(None, None, 2, jogador1, jogador2) is None
+
+
+def test_truco_aceito_e_depois_retruco(jogadores):
+    jogador1, jogador2 = jogadores
+    truco = Truco({1: AgenteRoteirizado([0]), 2: AgenteRoteirizado([1])}, InterfaceSilenciosa())
+
+    assert truco.controlador_truco(None, None, 1, jogador1, jogador2) is True
+    assert truco.retornar_valor_aposta() == 2
+
+    # Quem aceitou pode pedir o retruco; a recusa dá a quem pediu os pontos do truco
+    assert truco.controlador_truco(None, None, 2, jogador1, jogador2) is False
+    assert truco.estado_atual == 'retruco' and jogador2.pontos == 7 + 2
+
+
+def test_envido_aumentado_para_falta_envido(jogadores):
+    jogador1, jogador2 = jogadores
+    jogador1.envido, jogador2.envido = 20, 31
+    envido = Envido({1: AgenteRoteirizado([1]), 2: AgenteRoteirizado([3])}, InterfaceSilenciosa())
+
+    envido.controlador_envido(None, None, 6, 1, jogador1, jogador2, InterfaceSilenciosa())
+
+    # O jogador 2 pediu o falta envido, que vale o que falta ao jogador 1 para vencer
+    assert envido.estado_atual == 8 and envido.valor_envido == 12 - 3
+    assert envido.quem_venceu_envido == 2 and jogador2.pontos == 7 + 9
+    assert envido.acoes_validas(PEDE) == {}
@@ -0,0 +1,21 @@
+import numpy as np
+from truco.avaliacao import avaliar_ivf, revocacao
+from truco.dados import Dados
+
+
+def test_revocacao_considera_empates():
+    exatas = np.array([[0.0, 1.0, 2.0]])
+
+    assert revocacao(np.array([[0.0, 1.0, 2.0]]), exatas) == 1.0
+    assert revocacao(np.array([[0.0, 2.0, 3.0]]), exatas) == 2 / 3
+
+
+def test_avaliar_ivf_na_base_de_casos():
+    casos = Dados().retornar_casos()
+    colunas = {coluna: i for i, coluna in enumerate(casos.columns)}
+    medicoes = avaliar_ivf(casos.to_numpy(), colunas, sondas=(1, 1000), consultas=20)
+
+    assert [medicao['sondas'] for medicao in medicoes] == [1, 1000]
+    assert medicoes[0]['revocacao'] <= medicoes[1]['revocacao'] == 1.0
+    assert medicoes[1]['concordancia'] == 1.0
+    assert all(medicao['tempo_ms'] > 0 for medicao in medicoes)
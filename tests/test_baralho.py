@@ -80,3 +80,34 @@ def test_retirar_carta_remove_carta_do_baralho(baralho_novo):
     assert tamanho_depois == tamanho_antes - 1
     assert tamanho_depois == 39
 
+
+
+def test_baralho_indices_reutiliza_as_cartas():
+    from truco.baralho import CARTAS, BaralhoIndices
+
+    baralho = BaralhoIndices(7)
+    baralho.embaralhar()
+    mao = [baralho.retirar_carta() for _ in range(6)]
+    assert all(any(carta is original for original in CARTAS) for carta in mao)
+    assert len({carta.retornar_carta() for carta in mao}) == 6
+
+    # Mesma semente, mesma distribuição
+    outro = BaralhoIndices(7)
+    outro.embaralhar()
+    assert [outro.retirar_carta() for _ in range(6)] == mao
+
+
+def test_distribuir_lote():
+    import numpy as np
+    from truco.baralho import BaralhoIndices
+
+    baralho = BaralhoIndices(3)
+    lote = baralho.distribuir_lote(2000)
+    assert lote.shape == (2000, 6) and lote.dtype == np.int8
+    assert all(len(set(linha)) == 6 for linha in lote.tolist())
+
+    # O buffer é reutilizado, e todas as cartas aparecem em todas as posições
+    saida = np.empty_like(lote)
+    assert baralho.distribuir_lote(2000, saida) is saida
+    assert (saida != lote).any()
+    assert all(len(np.unique(saida[:, coluna])) == 40 for coluna in range(6))
@@ -146,6 +146,18 @@ def test_avaliar_envido(bot, cbr):
     bot.envido = 25
     assert bot.avaliar_envido(cbr, 0, 2, 7) == 8
 
+def test_avaliar_flor(bot):
+    class CbrFlor():
+        def contraflor(self, estado, pontos_flor_robo):
+            self.pedido = (estado, pontos_flor_robo)
+            return 0
+
+    cbr = CbrFlor()
+    bot.mao = [Carta("1", "COPAS"), Carta("7", "COPAS"), Carta("12", "COPAS")]
+
+    assert bot.avaliar_flor(cbr, "Contraflor") == 0
+    assert cbr.pedido == ("Contraflor", 28)
+
 def test_avaliar_pedir_envido(bot):
     assert bot.avaliar_pedir_envido() == 1
 
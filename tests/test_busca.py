@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from sklearn.neighbors import NearestNeighbors
+from truco.busca import BuscaBruta, BuscaBrutaBlocos, BuscaIVF, calibrar, selecionar_vizinhos
+
+
+@pytest.fixture
+def casos():
+    rng = np.random.default_rng(3)
+    return rng.integers(-100, 60, (500, 52)).astype(np.int16)
+
+
+def test_busca_bruta_igual_ball_tree(casos):
+    arvore = NearestNeighbors(n_neighbors=100, algorithm='ball_tree').fit(casos)
+    bruta = BuscaBruta(casos, 100)
+    consultas = casos[:5] + 1
+
+    distancias_arvore, indices_arvore = arvore.kneighbors(consultas)
+    distancias, indices = bruta.kneighbors(consultas)
+
+    assert np.allclose(distancias, distancias_arvore)
+    assert (np.sort(indices, axis=1) == np.sort(indices_arvore, axis=1)).all()
+
+
+def test_busca_em_blocos_igual_bruta(casos):
+    bruta = BuscaBruta(casos, 100)
+    blocos = BuscaBrutaBlocos(casos, 100, tamanho_bloco=64)
+
+    for consulta in casos[::50]:
+        distancias, indices = bruta.kneighbors(consulta.reshape(1, -1))
+        distancias_blocos, indices_blocos = blocos.kneighbors(consulta.reshape(1, -1))
+
+        assert (indices == indices_blocos).all()
+        assert np.allclose(distancias, distancias_blocos)
+
+
+def test_empate_desfeito_pelo_menor_indice():
+    casos = np.array([[1, 1], [0, 0], [1, 1], [1, 1], [5, 5]])
+
+    distancias, indices = BuscaBruta(casos, 3).kneighbors([[1, 1]])
+
+    assert indices.tolist() == [[0, 2, 3]]
+    assert selecionar_vizinhos(np.array([2.0, 1.0, 1.0]), np.array([7, 9, 8]), 2)[1].tolist() == [8, 9]
+
+
+def test_k_limitado_ao_tamanho_da_base():
+    distancias, indices = BuscaBrutaBlocos(np.zeros((3, 4)), 100).kneighbors(np.zeros(4))
+
+    assert indices.shape == (1, 3)
+
+
+def test_calibrar_escolhe_o_mais_rapido(casos):
+    class BuscaLenta(BuscaBruta):
+        def kneighbors(self, X, n_neighbors=None):
+            super().kneighbors(X)
+            return super().kneighbors(X)
+
+    escolhido, tempos = calibrar({'lenta': BuscaLenta(casos), 'bruta': BuscaBruta(casos)}, casos[:4], repeticoes=2)
+
+    assert set(tempos) == {'lenta', 'bruta'}
+    assert escolhido == min(tempos, key=tempos.get)
+
+
+def test_busca_ivf_com_todas_as_listas_igual_bruta(casos):
+    bruta = BuscaBruta(casos, 100)
+    ivf = BuscaIVF(casos, 100, n_listas=10, n_sondas=10)
+    consultas = casos[::100] + 1
+
+    assert ivf.inicios[-1] == len(casos) and sorted(ivf.posicoes.tolist()) == list(range(500))
+    assert (ivf.kneighbors(consultas)[1] == bruta.kneighbors(consultas)[1]).all()
+
+
+def test_busca_ivf_sonda_ate_reunir_k_candidatos(casos):
+    ivf = BuscaIVF(casos, 100, n_listas=20, n_sondas=1)
+    distancias, indices = ivf.kneighbors(casos[:3])
+
+    assert indices.shape == (3, 100) and len(set(indices[0].tolist())) == 100
+    assert indices[:, 0].tolist() == [0, 1, 2]
+    assert (np.diff(distancias, axis=1) >= 0).all()
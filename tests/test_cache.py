@@ -0,0 +1,32 @@
+from truco.cache import CacheLRU
+
+
+def test_obter_conta_acertos_e_falhas():
+    cache = CacheLRU(2)
+
+    assert cache.obter('a') is None
+    cache.adicionar('a', 1)
+
+    assert cache.obter('a') == 1
+    assert cache.estatisticas() == {'acertos': 1, 'falhas': 1, 'itens': 1, 'taxa_acertos': 0.5}
+
+
+def test_descarta_item_usado_ha_mais_tempo():
+    cache = CacheLRU(2)
+    cache.adicionar('a', 1)
+    cache.adicionar('b', 2)
+    cache.obter('a')
+    cache.adicionar('c', 3)
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert len(cache) == 2
+
+
+def test_limpar():
+    cache = CacheLRU()
+    cache.adicionar('a', 1)
+    cache.limpar()
+
+    assert len(cache) == 0
+    assert cache.obter('a', 0) == 0
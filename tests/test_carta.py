@@ -179,3 +179,48 @@ def test_classificar_carta_cenario_completo(carta_instance):
 
 
 
+
+
+def test_codificacao_cobre_o_baralho():
+    from truco.baralho import Baralho
+    cartas = Baralho().cartas
+
+    codigos = [carta.retornar_codigo() for carta in cartas]
+
+    assert codigos == list(range(40))
+    for carta in cartas:
+        codigo = carta.retornar_codigo()
+        assert carta_modulo.NUMERO_CARTA[codigo] == carta.numero
+        assert carta_modulo.NAIPE_CARTA[codigo] == carta.naipe
+        assert carta_modulo.NAIPE_CODIGO_CARTA[codigo] == carta.retornar_naipe_codificado()
+
+
+def test_codificar_carta_numero_texto_e_naipe_invalido():
+    assert carta_modulo.codificar_carta('1', 'ESPADAS') == carta_modulo.codificar_carta(1, 'ESPADAS') == 0
+    assert carta_modulo.codificar_carta(1, 'ESPADA') is None
+    assert carta_modulo.codificar_carta(8, 'COPAS') is None
+
+
+def test_tabelas_de_forca_e_envido(mock_pontos_reais):
+    for codigo in range(40):
+        nome = f"{carta_modulo.NUMERO_CARTA[codigo]} de {carta_modulo.NAIPE_CARTA[codigo]}"
+        numero = str(carta_modulo.NUMERO_CARTA[codigo])
+        esperado = mock_pontos_reais["MANILHA"].get(nome, mock_pontos_reais["CARTAS_VALORES"][numero])
+        assert carta_modulo.FORCA_CARTA[codigo] == esperado
+        assert carta_modulo.ENVIDO_CARTA[codigo] == mock_pontos_reais["ENVIDO"][numero]
+        assert carta_modulo.MANILHA_CARTA[codigo] == (nome in mock_pontos_reais["MANILHA"])
+
+
+def test_forca_carta_fora_do_baralho_usa_dicionarios(carta_instance):
+    # Naipe escrito de outra forma não tem código, mas ainda é pontuado pelo número
+    assert carta_modulo.forca_carta(Carta('3', 'PAUS')) == 24
+    assert carta_instance.retornar_pontos_envido(Carta('7', 'PAUS')) == 7
+
+
+def test_classificar_carta_tres_cartas_iguais(carta_instance):
+    cartas = [Carta(3, 'OUROS'), Carta(3, 'COPAS'), Carta(3, 'BASTOS')]
+
+    lista_pontos, lista_classificacao = carta_instance.classificar_carta(cartas)
+
+    assert lista_pontos == [24, 24, 24]
+    assert sorted(lista_classificacao) == ['Alta', 'Baixa', 'Media']
@@ -115,6 +115,9 @@ class Partida:
 def partida(monkeypatch):
     mock_df = pd.DataFrame([{"idMao": 0, "ganhadorPrimeiraRodada": 0, "terceiraCartaRobo": 0, "quemGanhouTruco": 2, "qualidadeMaoHumano": 0, "pontosEnvidoHumano": 0, "quemPediuRealEnvido": 0, "quemPediuFaltaEnvido": 0, "quemGanhouEnvido": 0}])
     monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: mock_df)
+    # Base de casos compartilhada isolada, para que o dataframe falso não seja reaproveitado por outros testes
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", False)
 
     # Mock para 'kneighbors' do Cbr para evitar erro
     mock_knn = MagicMock()
@@ -162,14 +165,13 @@ def test_rf04_fazer_jogada_jogador(partida):
     assert carta_retornada == carta_jogada
 
 
-def test_rf06_determinar_ganhador_rodada(partida, monkeypatch):
-    test_manilhas = {'1 de ESPADAS': 13}
-    test_valores = {'4': 0}
-    monkeypatch.setattr('truco.jogo.MANILHA', test_manilhas)
-    monkeypatch.setattr('truco.jogo.CARTAS_VALORES', test_valores)
-
+def test_rf06_determinar_ganhador_rodada(partida):
+    # Ranking real das tabelas de truco.carta: o espadão é a manilha mais forte e o 4 a carta mais fraca
     espadao = Carta(1, "ESPADAS")
     quatro_paus = Carta(4, "BASTOS")
+    assert carta_modulo.e_manilha(espadao) and not carta_modulo.e_manilha(quatro_paus)
+    assert carta_modulo.forca_carta(espadao) == max(carta_modulo.FORCA_CARTA)
+    assert carta_modulo.forca_carta(quatro_paus) == min(carta_modulo.FORCA_CARTA)
 
     vencedor = partida.jogo.verificar_carta_vencedora(espadao, quatro_paus)
     assert vencedor == espadao
@@ -313,12 +315,6 @@ def test_rf30_nao_permitir_pedir_flor_sem_flor(partida):
 
 
 def test_rf24_tratar_empate_primeira_rodada(partida, monkeypatch):
-    # Mock das constantes
-    test_manilhas = {}
-    test_valores = {'7': 4, '1': 12, '2': 16, '3': 24, '4': 0}
-    monkeypatch.setattr('truco.jogo.MANILHA', test_manilhas)
-    monkeypatch.setattr('truco.jogo.CARTAS_VALORES', test_valores)
-
     # Mock para 'retornar_numero' da classe Carta
     def mock_retornar_numero(self):
         return str(self.numero)
@@ -330,6 +326,10 @@ def test_rf24_tratar_empate_primeira_rodada(partida, monkeypatch):
     partida.jogador1.mao = [carta_j1, Carta(1, 'BASTOS'), Carta(2, 'BASTOS')]
     partida.jogador2.mao = [carta_j2, Carta(3, 'BASTOS'), Carta(4, 'BASTOS')]
 
+    # Pelo ranking real, 7 de copas e 7 de bastos são cartas comuns de mesma força: o empate favorece o jogador 1
+    assert not carta_modulo.e_manilha(carta_j1) and not carta_modulo.e_manilha(carta_j2)
+    assert carta_modulo.forca_carta(carta_j1) == carta_modulo.forca_carta(carta_j2)
+
     ganhador = partida.jogo.verificar_carta_vencedora(carta_j1, carta_j2)
 
     assert ganhador == carta_j1
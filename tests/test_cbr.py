@@ -1,4 +1,5 @@
 from truco.cbr import Cbr
+import numpy as np
 import pytest
 import sys
 
@@ -35,3 +36,317 @@ def test_envido(cbr):
     assert cbr.envido(6, 1, 0, True) == 1
     assert cbr.envido(6, 1, -3, True) == 1
     assert cbr.envido(7, 1, 0, False) == 0
+
+
+def test_cache_de_vizinhos(cbr):
+    cbr.truco(1, 1, 0)
+    cbr.jogar_carta(1, [1, 4, 12])
+    cbr.envido(6, 1, 0, True)
+
+    assert cbr.estatisticas_cache()['falhas'] == 1
+    assert cbr.estatisticas_cache()['acertos'] == 2
+
+    cbr.dados.registro.cartaAltaRobo = 52
+    vizinhos = cbr.recuperar_vizinhos()
+
+    assert cbr.cache.falhas == 2
+    assert cbr.recuperar_vizinhos() is vizinhos
+    assert len(cbr.cache) == 2
+
+
+def test_motor_de_busca_configuravel():
+    from sklearn.neighbors import NearestNeighbors
+    from truco.busca import BuscaBruta
+
+    assert isinstance(Cbr(busca='kd_tree').nbrs, NearestNeighbors)
+    assert isinstance(Cbr(busca='bruta').nbrs, BuscaBruta)
+    with pytest.raises(ValueError):
+        Cbr(busca='hnsw')
+
+
+def test_calibracao_registra_tempos():
+    cbr = Cbr(busca='auto')
+
+    assert Cbr().busca == 'ball_tree'
+    assert cbr.busca in ('ball_tree', 'kd_tree', 'bruta', 'blocos')
+    assert set(cbr.tempos_busca) == {'ball_tree', 'kd_tree', 'bruta', 'blocos'}
+
+
+def test_indices_projetados_por_decisao():
+    from truco.cbr import COLUNAS_DECISAO
+
+    cbr = Cbr(busca='bruta', projecoes=True)
+    assert cbr.indices_decisao == {}
+
+    cbr.dados.registro.cartaAltaRobo = 52
+    cbr.truco(1, 1, 0)
+
+    assert list(cbr.indices_decisao) == ['truco']
+    motor, posicoes = cbr.indices_decisao['truco']
+    assert motor.casos.shape == (len(cbr.matriz), len(set(COLUNAS_DECISAO['truco'])))
+    assert len(cbr.recuperar_vizinhos('truco').indices) == 100
+
+    cbr.jogar_carta(1, [1, 4, 12])
+    assert set(cbr.indices_decisao) == {'truco', 'jogada_1'}
+
+
+def test_indices_por_particao():
+    from truco.votos import PARTICOES
+
+    cbr = Cbr(busca='bruta', particoes=True)
+    cbr.truco(1, 1, 0)
+
+    assert set(cbr.indices_particao) == {('truco_ganho', None), ('truco_perdido', None)}
+    casos = cbr.casos_particao('truco_ganho')
+    assert len(casos) == 100
+    assert (casos[:, cbr.colunas['quemGanhouTruco']] == 2).all()
+
+    motor, linhas, posicoes = cbr.indice_particao('jogadas_vencidas')
+    assert PARTICOES['jogadas_vencidas'](cbr.matriz[linhas], cbr.colunas).all()
+    assert cbr.jogar_carta(1, [1, 4, 12]) in (-1, 0, 1, 2)
+
+
+def test_indice_persistido(tmp_path, monkeypatch):
+    from truco.dados import Dados
+
+    csv_path = tmp_path / "casos.csv"
+    df = Dados().tratamento_inicial_df().head(300).reset_index()
+    df.to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.cbr.INDICE_PERSISTIDO", True)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+
+    cbr = Cbr(busca='bruta')
+    caminho = cbr.caminho_indice()
+    assert caminho.is_file()
+
+    # Segunda construção: índice carregado do disco, sem ajuste
+    monkeypatch.setattr(Cbr, "criar_busca", lambda self, *args: pytest.fail("índice ajustado novamente"))
+    carregado = Cbr(busca='bruta')
+    assert (carregado.nbrs.casos == cbr.nbrs.casos).all()
+    monkeypatch.undo()
+
+    # Índice desatualizado (CSV alterado) é reconstruído e salvo novamente
+    df.head(200).to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.cbr.INDICE_PERSISTIDO", True)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+    reconstruido = Cbr(busca='bruta')
+
+    assert len(reconstruido.nbrs.casos) == 200
+    assert reconstruido.carregar_indice() is not None
+    monkeypatch.setattr("sklearn.__version__", "0.0")
+    assert reconstruido.carregar_indice() is None
+
+
+def test_retencao_online_de_casos(monkeypatch):
+    monkeypatch.setattr("truco.cbr.LIMITE_COMPACTACAO", 2)
+    cbr = Cbr(busca='bruta')
+    cbr.retencao.em_segundo_plano = False
+    total = len(cbr.matriz)
+
+    cbr.dados.registro.cartaAltaRobo = 52
+    cbr.recuperar_vizinhos()
+    assert cbr.reter_caso() == 1
+    assert len(cbr.cache) == 0
+
+    # O caso retido é o vizinho mais próximo do próprio registro, antes mesmo da compactação
+    vizinhos = cbr.recuperar_vizinhos()
+    assert total in vizinhos.indices
+    assert (vizinhos.casos[vizinhos.indices.tolist().index(total)] == cbr.dados.registro.valores).all()
+
+    cbr.reter_caso()
+    cbr.truco(1, 1, 0)
+    assert cbr.versao_base == 1 and len(cbr.matriz) == total + 2
+    assert cbr.retencao.pendentes() == 0 and len(cbr.nbrs.casos) == total + 2
+
+
+def test_busca_aproximada_ivf(monkeypatch):
+    from truco.busca import BuscaIVF
+
+    monkeypatch.setattr("truco.cbr.INDICE_PERSISTIDO", False)
+    exata = Cbr(busca='bruta')
+    cbr = Cbr(busca='ivf', sondas=2)
+    assert isinstance(cbr.nbrs, BuscaIVF) and cbr.nbrs.n_sondas == 2
+
+    cbr.recuperar_vizinhos()
+    cbr.definir_sondas(len(cbr.nbrs.centroides))
+    assert cbr.nbrs.n_sondas == len(cbr.nbrs.centroides) and len(cbr.cache) == 0
+    assert (cbr.recuperar_vizinhos().indices == exata.recuperar_vizinhos().indices).all()
+
+
+def test_indice_de_estados_exatos(cbr, monkeypatch):
+    primeira = cbr.jogar_carta(1, [1, 4, 12])
+    cbr.truco(1, 1, 0)
+    assert cbr.estatisticas_decisoes()['falhas'] == 2
+
+    # Estados repetidos não passam pela busca nem pela votação
+    monkeypatch.setattr(cbr, "obter_votos", lambda decisao: pytest.fail("estado repetido recuperado novamente"))
+    assert cbr.jogar_carta(1, [1, 4, 12]) == primeira
+    assert cbr.estatisticas_decisoes()['acertos'] == 1
+    monkeypatch.undo()
+
+    cbr.decisoes.capacidade = 2
+    cbr.envido(6, 1, 0, True)
+    assert len(cbr.decisoes) == 2
+
+    cbr.reter_caso()
+    assert len(cbr.decisoes) == 0
+
+
+def test_decisoes_persistidas(tmp_path, monkeypatch):
+    import gc
+    import weakref
+    from truco.dados import Dados
+
+    csv_path = tmp_path / "casos.csv"
+    Dados().tratamento_inicial_df().head(300).reset_index().to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.cbr.DECISOES_PERSISTIDAS", True)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+    pendentes = weakref.WeakValueDictionary()
+    monkeypatch.setattr("truco.cbr._DECISOES_PENDENTES", pendentes)
+
+    cbr = Cbr(busca='bruta')
+    decisao = cbr.truco(1, 1, 2)
+    assert cbr.salvar_decisoes() and cbr.caminho_decisoes().is_file()
+
+    # Próximo processo começa com o índice preenchido; configurações diferentes não reaproveitam as decisões
+    carregado = Cbr(busca='bruta')
+    assert len(carregado.decisoes) == 1
+    monkeypatch.setattr(carregado, "obter_votos", lambda decisao: pytest.fail("decisão persistida recalculada"))
+    assert carregado.truco(1, 1, 2) == decisao
+
+    particionado = Cbr(busca='bruta', particoes=True)
+    assert len(particionado.decisoes) == 0
+
+    # Decisões que dependem de casos retidos na sessão não são salvas
+    particionado.reter_caso()
+    assert particionado.salvar_decisoes() is False
+
+    # Um Cbr por arquivo é salvo ao encerrar o processo, sem que o registro o mantenha vivo
+    assert list(pendentes.values()) == [particionado]
+    del cbr, carregado, particionado
+    gc.collect()
+    assert len(pendentes) == 0
+
+
+def test_vizinhos_repetidos_pela_multiplicidade(tmp_path, monkeypatch):
+    from truco.condensacao import deduplicar, salvar_base_condensada
+    from truco.dados import Dados
+
+    origem, condensada = tmp_path / "casos.csv", tmp_path / "condensada.csv"
+    df = Dados().tratamento_inicial_df().head(150).reset_index()
+    df = df.iloc[list(range(150)) + list(range(60))]
+    df.assign(idMao=range(len(df))).to_csv(origem, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: origem)
+    completa = Cbr(busca='bruta')
+
+    linhas, pesos = deduplicar(completa.matriz)
+    salvar_base_condensada(origem, condensada, linhas, pesos)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: condensada)
+    reduzida = Cbr(busca='bruta')
+
+    assert len(reduzida.matriz) == 150 and reduzida.pesos.sum() == 210
+    vizinhos = reduzida.recuperar_vizinhos()
+    assert len(vizinhos.indices) == 100
+    assert sorted(vizinhos.casos.tolist()) == sorted(completa.recuperar_vizinhos().casos.tolist())
+
+
+def test_base_compacta(tmp_path, monkeypatch):
+    from truco.dados import Dados
+    from truco.lote import Pedido
+
+    # Base completa lida por um link em tmp_path, para que os caches e os índices sejam gravados fora do repositório
+    csv_path = tmp_path / "casos.csv"
+    csv_path.symlink_to(Dados().caminho_casos().resolve())
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+
+    padrao = Cbr(busca='bruta')
+    compacta = Cbr(busca='bruta', compacta=True)
+    assert compacta.matriz.dtype == np.int8 and compacta.matriz.flags.c_contiguous
+    assert compacta.memoria_base()['economia'] == 0.5
+    assert compacta.caminho_indice() != padrao.caminho_indice()
+
+    # Mesmos vizinhos (com os valores originais) e mesmas decisões da base em int16
+    consultas = padrao.matriz[::400]
+    pedidos = [Pedido(consulta, 'truco', (1, 1, 2)) for consulta in consultas] + [Pedido(consulta, 'envido', (6, 1, 25, False)) for consulta in consultas]
+    assert compacta.decidir_lote(pedidos) == padrao.decidir_lote(pedidos)
+    assert (compacta.recuperar_vizinhos().casos == padrao.recuperar_vizinhos().casos).all()
+
+    compacta.retencao.limite_compactacao = 1
+    compacta.retencao.em_segundo_plano = False
+    compacta.reter_caso()
+    compacta.sincronizar_base()
+    assert compacta.matriz.dtype == np.int8 and len(compacta.matriz) == len(padrao.matriz) + 1
+
+
+@pytest.mark.parametrize("ganhas, perdidas, pontos_jogador, pontos_robo, contraflor, contraflor_e_resto", [
+    (3, 1, 25, 30, 1, 1),   # vizinhos favoráveis e flor maior
+    (3, 1, 25, 20, 1, 0),   # vizinhos favoráveis, flor menor
+    (1, 3, 25, 30, 1, 0),   # vizinhos desfavoráveis, flor maior
+    (1, 3, 25, 20, 0, 0),   # vizinhos desfavoráveis e flor menor
+    (2, 0, None, 20, 1, 1), # nenhuma flor perdida entre os vizinhos
+    (0, 0, None, 33, 0, 0), # nenhuma flor disputada entre os vizinhos
+])
+def test_decidir_contraflor(ganhas, perdidas, pontos_jogador, pontos_robo, contraflor, contraflor_e_resto):
+    from truco.cbr import decidir_contraflor
+    from truco.votos import SEM_VOTOS, VotosFlor
+
+    votos = VotosFlor(ganhas, perdidas, SEM_VOTOS if pontos_jogador is None else pontos_jogador)
+    assert decidir_contraflor(votos, 'Contraflor', pontos_robo) == contraflor
+    assert decidir_contraflor(votos, 'Contraflor e Resto', pontos_robo) == contraflor_e_resto
+
+
+def test_contraflor():
+    # Com partições, os votos da flor continuam vindo da vizinhança
+    cbr = Cbr(busca='bruta')
+    particionado = Cbr(busca='bruta', particoes=True)
+    assert particionado.contraflor('Contraflor', 33) == cbr.contraflor('Contraflor', 33)
+    assert cbr.estatisticas_decisoes()['falhas'] == 1
+
+
+def test_cbr_compartilhado():
+    cbr = Cbr(busca='bruta')
+    outro = cbr.compartilhado()
+
+    assert outro.nbrs is cbr.nbrs and outro.decisoes is cbr.decisoes
+    assert outro.dados is not cbr.dados
+    outro.dados.registro.cartaAltaRobo = 52
+    assert cbr.dados.registro.cartaAltaRobo != 52
+
+
+def test_indice_persistido_sem_cache_binario(tmp_path, monkeypatch):
+    from truco.dados import Dados
+
+    csv_path = tmp_path / "casos.csv"
+    Dados().tratamento_inicial_df().head(200).reset_index().to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.cbr.INDICE_PERSISTIDO", True)
+
+    cbr = Cbr(busca='bruta')
+
+    assert cbr.caminho_indice().is_file() and cbr.carregar_indice() is not None
+    assert not Dados().caminhos_cache(csv_path)[0].exists()
+
+
+def test_decisoes_sem_votos():
+    from truco.cbr import decidir_envido, decidir_truco
+    from truco.votos import SEM_VOTOS, VotosEnvido, VotosTruco
+
+    # Sem vizinhos com truco ou envido ganho, o bot recusa (ou não pede), qualquer que seja a sua mão
+    assert decidir_truco(VotosTruco(SEM_VOTOS, 1, SEM_VOTOS, SEM_VOTOS), 'truco', 1, 40) == 0
+    sem_envido_ganho = VotosEnvido(SEM_VOTOS, 1, SEM_VOTOS, 1, SEM_VOTOS, 1, SEM_VOTOS)
+    assert decidir_envido(sem_envido_ganho, 6, 1, 33, True) == 0
+    assert decidir_envido(sem_envido_ganho, 6, 2, 33, True) == 0
+
+    # Sem vizinhos com truco perdido, a votação segue normalmente
+    assert decidir_truco(VotosTruco(2, SEM_VOTOS, 0, 20), 'truco', 1, 30) == 2
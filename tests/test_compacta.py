@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from truco.busca import BuscaBruta
+from truco.compacta import LayoutCompacto, criar_layout, economia_memoria, tipo_minimo
+
+
+@pytest.fixture
+def casos():
+    rng = np.random.default_rng(5)
+    casos = rng.integers(-100, 53, (300, 6)).astype(np.int16)
+    casos[::7, 2] = -130
+    return casos
+
+
+def test_tipo_minimo():
+    assert tipo_minimo(-100, 52) == np.int8
+    assert tipo_minimo(-130, 52) == np.int16
+    assert tipo_minimo(0, 40000) == np.int32
+
+
+def test_sentinel_deslocado_para_caber_em_int8(casos):
+    layout = criar_layout(casos)
+    compacta = layout.codificar(casos)
+
+    assert layout.deslocamentos.tolist() == [0, 0, -2, 0, 0, 0]
+    assert compacta.dtype == np.int8 and compacta.flags.c_contiguous
+    assert (layout.decodificar(compacta) == casos).all()
+    assert economia_memoria(compacta, layout)['economia'] == 0.5
+
+
+def test_deslocamento_preserva_os_vizinhos(casos):
+    layout = criar_layout(casos)
+    consultas = casos[:10] + 3
+
+    distancias, indices = BuscaBruta(casos, 20).kneighbors(consultas)
+    distancias_compacta, indices_compacta = BuscaBruta(layout.codificar(casos), 20).kneighbors(layout.codificar_consulta(consultas))
+
+    assert (indices == indices_compacta).all()
+    assert np.allclose(distancias, distancias_compacta)
+
+
+def test_colunas_largas_e_valores_fora_do_layout():
+    casos = np.array([[1, -300], [2, 300]], dtype=np.int16)
+    layout = criar_layout(casos)
+
+    assert layout.tipo == np.int16 and [str(tipo) for tipo in layout.tipos] == ['int8', 'int16']
+    assert (layout.decodificar(layout.codificar(casos)) == casos).all()
+    with pytest.raises(ValueError):
+        LayoutCompacto([0, 0], [np.int8, np.int8]).codificar([1, 200])
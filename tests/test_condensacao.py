@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from truco.condensacao import Condensador, consultas_decisao, deduplicar, salvar_base_condensada
+from truco.dados import COLUNA_PESO, Dados
+
+
+@pytest.fixture
+def base():
+    dados = Dados()
+    casos = dados.retornar_casos()
+    colunas = {coluna: i for i, coluna in enumerate(casos.columns)}
+    return casos.to_numpy()[:400], colunas, dados.modelo_registro()[1]
+
+
+def test_deduplicar_mantem_primeira_ocorrencia_e_multiplicidade():
+    matriz = np.array([[1, 2], [3, 4], [1, 2], [5, 6], [3, 4], [1, 2]])
+    linhas, pesos = deduplicar(matriz)
+
+    assert linhas.tolist() == [0, 1, 3]
+    assert pesos.tolist() == [3, 2, 1]
+    assert deduplicar(matriz[linhas], pesos)[1].tolist() == [3, 2, 1]
+
+
+def test_pesos_equivalem_as_linhas_repetidas(base):
+    matriz, colunas, modelo = base
+    repetida = np.concatenate([matriz[:150], matriz[:50]])
+    linhas, pesos = deduplicar(repetida)
+    consultas, decisoes = consultas_decisao(matriz, colunas, modelo, np.arange(0, 400, 7))
+
+    completa, condensada = Condensador(repetida, colunas), Condensador(repetida[linhas], colunas, pesos)
+    votos_completa = completa.assinaturas(completa.vizinhos(consultas), decisoes)
+    votos_condensada = condensada.assinaturas(condensada.vizinhos(consultas), decisoes)
+
+    assert len(linhas) == 150 and pesos.sum() == 200
+    assert (votos_completa == votos_condensada).all(axis=1).mean() > 0.95
+
+
+def test_condensar_preserva_votos_das_consultas_de_ajuste(base):
+    matriz, colunas, modelo = base
+    consultas, decisoes = consultas_decisao(matriz, colunas, modelo, np.arange(0, 400, 20))
+    condensador = Condensador(matriz, colunas)
+    referencia = condensador.assinaturas(condensador.vizinhos(consultas), decisoes)
+    mantidos = condensador.condensar(consultas, decisoes, tamanho_lote=32)
+
+    assert 100 <= mantidos.sum() < len(matriz)
+    assert (condensador.assinaturas(condensador.vizinhos(consultas), decisoes) == referencia).all()
+
+
+def test_base_condensada_carregada_com_pesos(tmp_path, monkeypatch):
+    origem, destino = tmp_path / "casos.csv", tmp_path / "condensada.csv"
+    Dados().tratamento_inicial_df().head(300).reset_index().to_csv(origem, sep='\t', index=False)
+    salvar_base_condensada(origem, destino, np.array([0, 5, 7]), np.array([2, 1, 3]))
+
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: destino)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+    dados = Dados()
+
+    assert len(dados.retornar_casos()) == 3 and COLUNA_PESO not in dados.retornar_casos().columns
+    assert dados.pesos_casos().tolist() == [2, 1, 3]
+
+    # Segunda carga pelo cache binário mantém os pesos
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    assert Dados().pesos_casos().tolist() == [2, 1, 3]
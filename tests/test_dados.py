@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import os
 from truco.dados import Dados
@@ -34,28 +35,124 @@ def test_resetar(dados):
     df_casos = dados.tratamento_inicial_df()
     df_registro = dados.carregar_modelo_zerado()
 
+    dados.registro.quemTruco = 2
+    dados.registro.qualidadeMaoBot = 1
     dados.resetar()
 
-    assert dados.registro.equals(df_registro)
+    assert dados.registro.para_dataframe().astype('int64').equals(df_registro)
+    assert not hasattr(dados.registro, 'qualidadeMaoBot')
     assert dados.casos.equals(df_casos)
 
+
+def test_registro_vetor_int16(dados):
+    registro = dados.retornar_registro()
+    valores = registro.valores
+
+    assert valores.dtype == 'int16'
+    assert registro.colunas == dados.casos.columns.to_list()
+
+    dados.primeira_rodada([1,2,3], ["Alta", "Media", "Baixa"], 1, Carta('3', "COPAS"))
+    dados.resetar()
+
+    assert registro is dados.registro and registro.valores is valores
+    registro.cartaAltaRobo = 52
+    registro.naipePrimeiraCartaHumano = None
+    assert valores[registro.indices['cartaAltaRobo']] == 52
+    assert registro.naipePrimeiraCartaHumano[0] == -100
+
+
+def test_base_de_casos_compartilhada(dados, monkeypatch):
+    outro = Dados()
+    assert outro.casos is dados.casos
+
+    def ler_csv(*args, **kwargs):
+        raise AssertionError("a base de casos não deve ser lida novamente")
+
+    monkeypatch.setattr(pd, "read_csv", ler_csv)
+    dados.registro.jogadorMao = 1
+    dados.resetar()
+
+    assert dados.casos is outro.casos
+    assert dados.registro.jogadorMao[0] == 0
+    assert not dados.casos.to_numpy().flags.writeable
+
+def test_cache_binario_da_base_de_casos(dados, tmp_path, monkeypatch):
+    csv_path = tmp_path / "casos.csv"
+    df = dados.tratamento_inicial_df().head(50).reset_index()
+    df['naipeCartaAltaRobo'] = 'ESPADAS'
+    df.to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+
+    casos = Dados().casos
+    npy_path, json_path = dados.caminhos_cache(csv_path)
+
+    assert npy_path.is_file() and json_path.is_file()
+    assert casos.equals(dados.tratamento_inicial_df(csv_path))
+    assert (casos.naipeCartaAltaRobo == 1).all()
+
+    # Segunda carga: lida do cache com mmap, sem tratar o CSV novamente
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "tratamento_inicial_df", lambda self, csv_path=None: pytest.fail("CSV lido novamente"))
+    casos_cache = Dados().casos
+
+    assert isinstance(np.load(npy_path, mmap_mode='r'), np.memmap)
+    assert not casos_cache.to_numpy().flags.writeable
+    assert casos_cache.equals(casos)
+    monkeypatch.undo()
+
+    # Alteração do CSV invalida o cache
+    df['naipeCartaAltaRobo'] = 'COPAS'
+    df.to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+
+    assert (Dados().casos.naipeCartaAltaRobo == 4).all()
+
+def test_cache_compacto_da_base_de_casos(dados, tmp_path, monkeypatch):
+    csv_path = tmp_path / "casos.csv"
+    df = dados.tratamento_inicial_df().head(50).reset_index()
+    df.loc[0, 'ganhadorPrimeiraRodada'] = -130
+    df.to_csv(csv_path, sep='\t', index=False)
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr(Dados, "caminho_casos", lambda self: csv_path)
+    monkeypatch.setattr("truco.dados.CACHE_BINARIO", True)
+
+    novo = Dados()
+    matriz, layout = novo.casos_compactos()
+    npy_path, json_path = dados.caminhos_cache_compacto(csv_path)
+
+    assert npy_path.is_file() and json_path.is_file()
+    assert matriz.dtype == np.int8 and not matriz.flags.writeable
+    assert (layout.decodificar(matriz) == novo.casos.to_numpy()).all()
+
+    # Segunda carga: matriz compacta e layout lidos do cache com mmap
+    monkeypatch.setattr("truco.dados._BASE_CASOS", {})
+    monkeypatch.setattr("truco.dados.criar_layout", lambda matriz: pytest.fail("layout recalculado"))
+    matriz_cache, layout_cache = Dados().casos_compactos()
+
+    assert isinstance(matriz_cache, np.memmap)
+    assert (matriz_cache == matriz).all() and (layout_cache.deslocamentos == layout.deslocamentos).all()
+
 def test_cartas_jogadas_pelo_bot(dados):
     c1 = Carta('1', "COPAS")
 
     dados.cartas_jogadas_pelo_bot("primeira", c1)
 
-    assert dados.registro.primeiraCartaRobo[0] == c1.retornar_numero()
+    assert dados.registro.primeiraCartaRobo[0] == int(c1.retornar_numero())
     assert dados.registro.naipePrimeiraCartaRobo[0] == c1.retornar_naipe_codificado()
 
 
     dados.cartas_jogadas_pelo_bot("segunda", c1)
 
-    assert dados.registro.segundaCartaRobo[0] == c1.retornar_numero()
+    assert dados.registro.segundaCartaRobo[0] == int(c1.retornar_numero())
     assert dados.registro.naipeSegundaCartaRobo[0] == c1.retornar_naipe_codificado()
 
     dados.cartas_jogadas_pelo_bot("terceira", c1)
 
-    assert dados.registro.terceiraCartaRobo[0] == c1.retornar_numero()
+    assert dados.registro.terceiraCartaRobo[0] == int(c1.retornar_numero())
     assert dados.registro.naipeTerceiraCartaRobo[0] == c1.retornar_naipe_codificado()
 
 def test_primeira_rodada(dados):
@@ -67,7 +164,7 @@ def test_primeira_rodada(dados):
     assert dados.registro.cartaMediaRobo[0] == 2
     assert dados.registro.cartaBaixaRobo[0] == 3
     assert dados.registro.qualidadeMaoBot == 1 # definido na função
-    assert dados.registro.primeiraCartaHumano[0] == "3"
+    assert dados.registro.primeiraCartaHumano[0] == 3
     assert dados.registro.naipePrimeiraCartaHumano[0] == 4
 
 def test_segunda_rodada(dados):
@@ -75,9 +172,9 @@ def test_segunda_rodada(dados):
     dados.segunda_rodada(Carta('3', "COPAS"), Carta('4', "BASTOS"), 1)
 
     assert dados.registro.ganhadorPrimeiraRodada[0] == 1
-    assert dados.registro.primeiraCartaHumano[0] == "3"
+    assert dados.registro.primeiraCartaHumano[0] == 3
     assert dados.registro.naipePrimeiraCartaHumano[0] == 4
-    assert dados.registro.terceiraCartaRobo[0] == "4"
+    assert dados.registro.terceiraCartaRobo[0] == 4
 
 def test_terceira_rodada(dados):
 
@@ -86,16 +183,16 @@ def test_terceira_rodada(dados):
     assert dados.registro.ganhadorSegundaRodada[0] == 1
     assert dados.registro.SegundaCartaHumano[0] == "3"
     assert dados.registro.naipeSegundaCartaHumano[0] == 4
-    assert dados.registro.terceiraCartaRobo[0] == "4"
+    assert dados.registro.terceiraCartaRobo[0] == 4
 
 def test_finalizar_rodadas(dados):
 
     dados.finalizar_rodadas(Carta('12', "OUROS"), Carta('3', "ESPADAS"), 1)
 
     assert dados.registro.ganhadorTerceiraRodada[0] == 1
-    assert dados.registro.terceiraCartaHumano[0] == "12"
+    assert dados.registro.terceiraCartaHumano[0] == 12
     assert dados.registro.naipeTerceiraCartaHumano[0] == 2
-    assert dados.registro.terceiraCartaRobo[0] == "12"
+    assert dados.registro.terceiraCartaRobo[0] == 12
 
 def test_envido(dados):
 
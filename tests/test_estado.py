@@ -0,0 +1,55 @@
+import pytest
+from truco.carta import Carta
+from truco.estado import EstadoJogo
+from truco.simulacao import BotAleatorio, BotRoteirizado, Simulador
+from truco.truco import Truco
+
+
+@pytest.fixture
+def simulador():
+    return Simulador(BotAleatorio("aleatorio", semente=1), BotRoteirizado("roteirizado"), semente=42)
+
+
+def test_clone_igualdade_e_hash():
+    estado = EstadoJogo()
+    estado.registrar_carta(1, Carta(1, 'ESPADAS'))
+    copia = estado.clone()
+
+    assert copia == estado and hash(copia) == hash(estado) and copia is not estado
+    assert estado.mesa == (0,) and estado.vez == 2
+
+    copia.registrar_rodada(1)
+    assert copia != estado and estado.mesa == (0,)
+    assert len({estado, copia, estado.clone()}) == 2
+
+    with pytest.raises(AttributeError):
+        estado.campo_inexistente = 1
+
+
+def test_classes_de_regras_leem_e_escrevem_o_estado():
+    estado = EstadoJogo()
+    truco = Truco(estado=estado)
+
+    truco.valor_aposta = 3
+    truco.estado_atual = "retruco"
+    assert estado.valor_truco == 3 and estado.estado_truco == "retruco"
+
+    truco.resetar()
+    assert estado.valor_truco == 1 and estado.estado_truco == ""
+
+
+def test_motor_mantem_o_estado_da_mao(simulador):
+    simulador.preparar_mao(2)
+    estado = simulador.estado
+
+    assert simulador.truco.estado is estado and simulador.envido.estado is estado and simulador.flor.estado is estado
+    assert [len(mao) for mao in estado.maos] == [3, 3] and estado.vez == 2
+    assert len(set(estado.maos[0] + estado.maos[1])) == 6
+
+    instantaneo = simulador.instantaneo()
+    simulador.envido.definir_pontos_jogadores(simulador.jogador1, simulador.jogador2)
+    simulador.truco.valor_aposta = 4
+    assert estado.pontos_envido == (simulador.jogador1.envido, simulador.jogador2.envido)
+
+    simulador.usar_estado(instantaneo)
+    assert simulador.truco.retornar_valor_aposta() == 1 and simulador.envido.jogador1_pontos == 0
@@ -0,0 +1,28 @@
+from truco.fluxos import chave_partida, distribuir_mao, semente_agente
+from truco.simulacao import Simulador, BotAleatorio, BotRoteirizado
+
+
+def test_fluxos_dependem_da_partida():
+    assert list(chave_partida(7, 3)) == list(chave_partida(7, 3))
+    assert list(chave_partida(7, 3)) != list(chave_partida(7, 4))
+    assert semente_agente(7, 3, 1) != semente_agente(7, 3, 2)
+
+
+def test_distribuir_mao_sem_jogar_as_anteriores():
+    simulador = Simulador(BotAleatorio("aleatorio"), BotRoteirizado("roteirizado"), semente=5)
+    simulador.iniciar_partida(2)
+    simulador.numero_mao = 4
+    simulador.preparar_mao()
+    maos = simulador.estado.maos
+
+    assert tuple(int(codigo) for codigo in distribuir_mao(5, 2, 4)) == maos[0] + maos[1]
+    assert len(set(maos[0] + maos[1])) == 6
+
+
+def test_partida_regenerada_pelo_numero():
+    sequencial = Simulador(BotAleatorio("aleatorio"), BotRoteirizado("roteirizado"), semente=11)
+    resultados = [sequencial.jogar_partida() for _ in range(3)]
+    avulso = Simulador(BotAleatorio("aleatorio"), BotRoteirizado("roteirizado"), semente=11)
+    resultado = avulso.jogar_partida(2)
+
+    assert (resultado.vencedor, resultado.pontos, resultado.maos) == (resultados[2].vencedor, resultados[2].pontos, resultados[2].maos)
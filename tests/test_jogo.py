@@ -1,9 +1,10 @@
+import numpy as np
 import pytest
 from truco.jogo import Jogo
 from truco.jogador import Jogador
 from truco.bot import Bot
 from truco.baralho import Baralho
-from truco.carta import Carta
+from truco.carta import Carta, NUMERO_CARTA, NAIPE_CARTA
 from truco.interface import Interface
 
 @pytest.fixture
@@ -58,6 +59,27 @@ def test_verificar_carta_vencedora(jogo, manilha_alta, manilha_baixa, carta_comu
     assert jogo.verificar_carta_vencedora(carta_comum_alta, carta_comum_alta) == carta_comum_alta
 
 
+def test_verificar_cartas_vencedoras_em_lote(jogo):
+    cartas = [Carta(numero, naipe) for numero, naipe in zip(NUMERO_CARTA, NAIPE_CARTA)]
+    cartas_01, cartas_02 = np.divmod(np.arange(40 * 40), 40)
+
+    vencedores = jogo.verificar_cartas_vencedoras(cartas_01, cartas_02)
+
+    for codigo_01, codigo_02, vencedor in zip(cartas_01, cartas_02, vencedores):
+        carta_01, carta_02 = cartas[codigo_01], cartas[codigo_02]
+        escalar = jogo.verificar_carta_vencedora(carta_01, carta_02)
+        if (vencedor == 1):
+            assert escalar is carta_01
+        elif (vencedor == 2):
+            assert escalar is carta_02
+        else:
+            # Empate: a regra escalar favorece o jogador 1, ou não retorna vencedor para a mesma manilha
+            assert carta_01.retornar_pontos_carta(carta_01) == carta_02.retornar_pontos_carta(carta_02)
+            assert escalar in (carta_01, None)
+
+    assert jogo.verificar_cartas_vencedoras([0, 3], [3, 13]).tolist() == [1, 0]
+
+
 def test_criar_jogador(jogo, mock_baralho):
     jogador = jogo.criar_jogador("Humano", mock_baralho)
     assert jogador.nome == "Humano"
@@ -0,0 +1,108 @@
+import numpy as np
+import threading
+import pytest
+from truco.cbr import Cbr
+from truco.lote import FilaDecisoes, Pedido
+
+
+def pedidos_aleatorios(cbr, quantidade=60):
+    gerador = np.random.default_rng(11)
+    pedidos = []
+    for i in range(quantidade):
+        consulta = cbr.matriz[gerador.integers(len(cbr.matriz))].copy()
+        consulta[gerador.integers(len(consulta))] += 1
+        if (i % 3 == 0):
+            pedidos.append(Pedido(consulta, 'jogar_carta', (int(gerador.integers(1, 4)), [1, 4, 12])))
+        elif (i % 3 == 1):
+            pedidos.append(Pedido(consulta, 'truco', (1, 1, int(gerador.integers(0, 4)))))
+        else:
+            pedidos.append(Pedido(consulta, 'envido', (6, 1, int(gerador.integers(0, 33)), bool(i % 2))))
+
+    return pedidos
+
+
+def decisoes_individuais(cbr, pedidos):
+    """Decide cada pedido pelo método individual, sem reaproveitar as decisões memorizadas pelo lote."""
+    cbr.limpar_caches()
+    falhas = cbr.estatisticas_decisoes()['falhas']
+    decisoes = []
+    for pedido in pedidos:
+        cbr.dados.registro.valores[:] = pedido.consulta
+        decisoes.append(getattr(cbr, pedido.decisao)(*pedido.argumentos))
+
+    assert cbr.estatisticas_decisoes()['falhas'] - falhas == len(pedidos)
+    return decisoes
+
+
+@pytest.mark.parametrize('opcoes', [{}, {'projecoes': True}, {'particoes': True}])
+def test_decidir_lote_igual_decisoes_individuais(opcoes):
+    cbr = Cbr(busca='bruta', **opcoes)
+    pedidos = pedidos_aleatorios(cbr)
+    resultados = cbr.decidir_lote(pedidos)
+
+    assert decisoes_individuais(cbr, pedidos) == resultados
+    assert cbr.decidir_lote([]) == []
+
+
+def test_decidir_lote_com_casos_retidos():
+    cbr = Cbr(busca='bruta')
+    pedidos = pedidos_aleatorios(cbr, 30)
+    for pedido in pedidos[:5]:
+        cbr.reter_caso(pedido.consulta)
+
+    resultados = cbr.decidir_lote(pedidos)
+    assert decisoes_individuais(cbr, pedidos) == resultados
+
+
+def test_pedido_com_decisao_desconhecida():
+    with pytest.raises(ValueError):
+        Pedido(np.zeros(52), 'flor')
+
+
+class CbrLotes():
+    """Cbr falso que registra o tamanho dos lotes recebidos."""
+    def __init__(self):
+        self.lotes = []
+
+    def decidir_lote(self, pedidos):
+        self.lotes.append(len(pedidos))
+        return [int(pedido.consulta[0]) for pedido in pedidos]
+
+
+def test_fila_agrupa_pelo_tamanho_do_lote():
+    cbr = CbrLotes()
+    with FilaDecisoes(cbr, tamanho_lote=4, prazo=10) as fila:
+        futuros = [fila.submeter([i, 0], 'truco', 1, 1, 0) for i in range(8)]
+        assert [futuro.result(timeout=5) for futuro in futuros] == list(range(8))
+
+    assert cbr.lotes == [4, 4]
+    assert fila.tamanho_medio_lote() == 4
+
+
+def test_fila_processa_pelo_prazo():
+    cbr = CbrLotes()
+    with FilaDecisoes(cbr, tamanho_lote=100, prazo=0.01) as fila:
+        assert fila.decidir([7, 0], 'envido', 6, 1, 0) == 7
+        resultados = {}
+        threads = [threading.Thread(target=lambda i=i: resultados.update({i: fila.decidir([i], 'truco', 1, 1, 0)})) for i in range(5)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(5)
+
+    assert resultados == {i: i for i in range(5)}
+    assert sum(cbr.lotes) == 6 and max(cbr.lotes) < 100
+
+
+def test_fila_repassa_erros():
+    class CbrComErro():
+        def decidir_lote(self, pedidos):
+            raise RuntimeError('falha na busca')
+
+    with FilaDecisoes(CbrComErro(), prazo=0) as fila:
+        with pytest.raises(RuntimeError):
+            fila.decidir([0], 'truco', 1, 1, 0)
+
+    with pytest.raises(RuntimeError):
+        fila.submeter([0], 'truco', 1, 1, 0)
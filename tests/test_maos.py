@@ -0,0 +1,106 @@
+import itertools
+import pytest
+from truco import maos
+from truco.bot import Bot
+from truco.carta import Carta, NUMERO_CARTA, NAIPE_CARTA
+from truco.jogador import Jogador
+
+
+@pytest.fixture
+def cartas():
+    return [Carta(numero, naipe) for numero, naipe in zip(NUMERO_CARTA, NAIPE_CARTA)]
+
+
+def test_tabela_possui_todas_as_maos():
+    assert maos.MAOS.shape == (9880, 3)
+    assert len(maos.ENVIDO_MAO) == len(maos.FLOR_MAO) == len(maos.PONTOS_FLOR_MAO) == len(maos.QUALIDADE_MAO) == 9880
+    assert sorted(set(maos.INDICE_ORDENADO.tolist())) == list(range(-1, 9880))
+
+
+def test_indice_independe_da_ordem_das_cartas():
+    for permutacao in itertools.permutations([3, 17, 38]):
+        assert maos.indice_mao(permutacao) == maos.indice_mao([3, 17, 38])
+
+    assert maos.indice_mao([5, 5, 12]) == -1
+
+
+def envido_por_pares(mao):
+    """Cálculo original do envido, comparando as cartas duas a duas."""
+    pontos_envido = []
+    for carta_01, carta_02 in itertools.combinations(mao, 2):
+        envido_01, envido_02 = carta_01.retornar_pontos_envido(carta_01), carta_02.retornar_pontos_envido(carta_02)
+        if (carta_01.naipe == carta_02.naipe):
+            pontos_envido.append(20 + envido_01 + envido_02 if envido_01 > 0 and envido_02 > 0 else 0)
+        else:
+            pontos_envido.append(max(envido_01, envido_02))
+
+    return max(pontos_envido)
+
+
+def test_avaliacao_igual_ao_calculo_original(cartas):
+    bot = Bot("bot")
+    for codigos in itertools.permutations(range(40), 3):
+        mao = [cartas[codigo] for codigo in codigos]
+        avaliacao = maos.avaliar_mao(mao)
+        carta_alta = mao[0].verificar_carta_alta(mao[0].verificar_carta_alta(mao[0], mao[1]), mao[2])
+        carta_baixa = mao[0].verificar_carta_baixa(mao[0].verificar_carta_baixa(mao[0], mao[1]), mao[2])
+        if (carta_alta == carta_baixa):
+            carta_alta = mao[0]
+
+        assert avaliacao.classificacao[mao.index(carta_alta)] == 'Alta'
+        assert avaliacao.classificacao[mao.index(carta_baixa)] == 'Baixa'
+        assert avaliacao.pontos == [mao[0].retornar_pontos_carta(carta) for carta in mao]
+        assert avaliacao.envido == envido_por_pares(mao)
+        assert avaliacao.flor == (mao[0].naipe == mao[1].naipe == mao[2].naipe)
+        assert avaliacao.pontos_flor == ((20 + sum(carta.retornar_pontos_envido(carta) for carta in mao)) if avaliacao.flor else 0)
+        bot.calcular_qualidade_mao(avaliacao.pontos, avaliacao.classificacao)
+        assert avaliacao.qualidade == bot.qualidade_mao
+
+
+def test_classificacao_com_empates_depende_da_ordem():
+    # Três cartas comuns de mesmo valor: a primeira é 'Alta' e a última 'Baixa'
+    mao = [Carta(4, "OUROS"), Carta(4, "COPAS"), Carta(4, "BASTOS")]
+    avaliacao = maos.avaliar_mao(mao)
+
+    assert avaliacao.classificacao == ['Alta', 'Media', 'Baixa']
+    assert avaliacao.pontos == [1, 1, 1]
+
+
+def test_maos_fora_da_tabela_usam_calculo_original():
+    mao = [Carta(1, "ESPADA"), Carta(7, "ESPADA"), Carta(6, "ESPADA")]
+    jogador = Jogador("jogador")
+    jogador.mao = mao
+
+    assert maos.avaliar_mao(mao) is None
+    assert maos.avaliar_mao(mao[:2]) is None
+    assert jogador.checa_flor() is True
+    assert jogador.calcula_envido(mao) == 33
+
+
+def test_criar_mao_do_bot_usa_tabela(cartas):
+    class BaralhoFixo():
+        def __init__(self, cartas):
+            self.cartas = list(cartas)
+
+        def retirar_carta(self):
+            return self.cartas.pop(0)
+
+    bot = Bot("bot")
+    bot.criar_mao(BaralhoFixo([cartas[0], cartas[6], cartas[3]]))
+    avaliacao = maos.avaliar_mao(bot.mao)
+
+    assert bot.flor is True
+    assert bot.envido == avaliacao.envido == 31
+    assert bot.mao_rank == ['Alta', 'Media', 'Baixa']
+    assert bot.qualidade_mao == avaliacao.qualidade
+
+
+def test_indices_lote():
+    import numpy as np
+    from truco.baralho import BaralhoIndices
+
+    lote = BaralhoIndices(11).distribuir_lote(500)
+    indices = maos.indices_lote(lote[:, 3:])
+
+    assert indices.tolist() == [maos.indice_mao(linha) for linha in lote[:, 3:].tolist()]
+    assert (maos.ENVIDO_MAO[indices] >= 0).all() and (indices >= 0).all()
@@ -0,0 +1,77 @@
+import numpy as np
+import threading
+from truco.busca import BuscaBruta
+from truco.retencao import BaseIncremental
+
+
+def criar_base(limite=4, em_segundo_plano=False):
+    matriz = np.random.default_rng(3).integers(-5, 5, size=(200, 6)).astype(np.int16)
+    return BaseIncremental(matriz, BuscaBruta(matriz, 10), lambda casos: BuscaBruta(casos, 10), limite, em_segundo_plano)
+
+
+def busca_completa(casos, consulta):
+    """Resultado esperado: busca exaustiva sobre todos os casos, desempatando pelo menor índice."""
+    distancias2 = ((casos.astype(np.int64) - consulta) ** 2).sum(axis=1)
+    return np.lexsort((np.arange(len(casos)), distancias2))[:10]
+
+
+def test_buffer_delta_mesclado_pela_distancia():
+    base = criar_base(limite=100)
+    consulta = base.estado.matriz[7].copy()
+    indices, casos = base.vizinhos(consulta)
+
+    assert indices[0] == 7 and base.pendentes() == 0
+
+    base.adicionar(consulta)
+    base.adicionar(consulta + 50)
+    todos = np.concatenate([base.estado.matriz, base.estado.delta])
+    indices, casos = base.vizinhos(consulta)
+
+    assert base.pendentes() == 2 and base.estado.versao == 0
+    assert indices.tolist() == busca_completa(todos, consulta).tolist()
+    assert 200 in indices and 201 not in indices
+    assert (casos == todos[indices]).all()
+
+
+def test_compactacao_troca_o_indice():
+    base = criar_base(limite=3)
+    casos = [base.estado.matriz[i] + 1 for i in range(5)]
+    for caso in casos[:2]:
+        base.adicionar(caso)
+
+    assert base.estado.versao == 0
+    base.adicionar(casos[2])
+
+    assert base.estado.versao == 1 and base.compactacoes == 1
+    assert base.pendentes() == 0 and len(base.estado.matriz) == 203
+    assert not base.estado.matriz.flags.writeable
+
+    for caso in casos[3:]:
+        base.adicionar(caso)
+
+    todos = np.concatenate([base.estado.matriz, base.estado.delta])
+    for consulta in casos:
+        assert base.vizinhos(consulta)[0].tolist() == busca_completa(todos, consulta).tolist()
+
+
+def test_compactacao_em_segundo_plano_preserva_casos_novos():
+    base = criar_base(limite=2, em_segundo_plano=True)
+    liberar = threading.Event()
+    criar_motor = base.criar_motor
+
+    def criar_motor_lento(casos):
+        liberar.wait(5)
+        return criar_motor(casos)
+
+    base.criar_motor = criar_motor_lento
+    base.adicionar(base.estado.matriz[0])
+    base.adicionar(base.estado.matriz[1])
+    # Durante a construção, as consultas continuam na base antiga e novos casos entram no buffer
+    base.adicionar(base.estado.matriz[2])
+
+    assert base.estado.versao == 0 and base.pendentes() == 3
+    liberar.set()
+    base.aguardar_compactacao()
+
+    assert base.estado.versao == 1 and base.compactacao is None
+    assert len(base.estado.matriz) == 202 and base.pendentes() == 1
@@ -0,0 +1,106 @@
+import pytest
+from truco.bot import Bot
+from truco.simulacao import Simulador, BotAleatorio, BotRoteirizado, ResumoSimulacao, ResultadoPartida, criar_agente
+
+
+class CbrFixo():
+    """CBR de teste com respostas fixas, sem carregar a base de casos."""
+    def jogar_carta(self, rodada, pontuacao_cartas):
+        return 0
+
+    def truco(self, tipo, quem_pediu, qualidade_mao_bot):
+        return 1
+
+    def envido(self, tipo, quem_pediu, pontos_envido_robo, robo_perdendo=None):
+        return 1
+
+
+@pytest.fixture
+def simulador():
+    return Simulador(BotAleatorio("aleatorio", semente=1), BotRoteirizado("roteirizado"), semente=42)
+
+
+def test_partida_termina_com_vencedor(simulador):
+    resultado = simulador.jogar_partida()
+
+    assert resultado.vencedor in [1, 2]
+    assert resultado.pontos[resultado.vencedor] >= 12
+    assert resultado.maos > 0
+
+
+def test_simular_resumo(simulador):
+    resumo = simulador.simular(20)
+
+    assert resumo.partidas == 20
+    assert resumo.vitorias[1] + resumo.vitorias[2] == 20
+    assert resumo.maos >= 20
+    assert resumo.maos_por_segundo() > 0
+
+
+def test_simulacao_reprodutivel_com_semente():
+    resumo1 = Simulador(BotAleatorio("a", semente=5), BotAleatorio("b", semente=6), semente=7).simular(10)
+    resumo2 = Simulador(BotAleatorio("a", semente=5), BotAleatorio("b", semente=6), semente=7).simular(10)
+
+    assert resumo1.vitorias == resumo2.vitorias
+    assert resumo1.pontos == resumo2.pontos
+    assert resumo1.maos == resumo2.maos
+
+
+def test_simulacao_sem_saida_no_terminal(simulador, capsys):
+    simulador.simular(5)
+
+    out, err = capsys.readouterr()
+    assert out == ""
+
+
+def test_simulacao_com_bot_cbr():
+    simulador = Simulador(Bot("bot"), BotRoteirizado("roteirizado"), cbr1=CbrFixo(), semente=3)
+
+    resumo = simulador.simular(3)
+
+    assert resumo.partidas == 3
+
+
+def test_resposta_do_jogador1_vem_do_agente(simulador):
+    simulador.preparar_mao()
+    simulador.jogador1.avaliar_truco = lambda cbr, tipo, quem_pediu: 0
+
+    assert simulador.truco.controlador_truco(None, None, 2, simulador.jogador1, simulador.jogador2) is False
+    assert simulador.jogador2.pontos == 1
+
+
+def test_resumo_combinar():
+    resumo1 = ResumoSimulacao()
+    resumo1.adicionar(ResultadoPartida(1, 12, 5, 4))
+    resumo1.duracao = 2.0
+    resumo2 = ResumoSimulacao()
+    resumo2.adicionar(ResultadoPartida(2, 3, 13, 6))
+    resumo2.duracao = 1.0
+
+    resumo1.combinar(resumo2)
+
+    assert resumo1.partidas == 2
+    assert resumo1.vitorias == {1: 1, 2: 1}
+    assert resumo1.pontos == {1: 15, 2: 18}
+    assert resumo1.maos == 10
+    assert resumo1.maos_por_segundo() == 5.0
+
+
+def test_bot_roteirizado_avalia_flor_pelo_limite():
+    from truco.carta import Carta
+
+    bot = BotRoteirizado("roteirizado")
+    bot.mao = [Carta("1", "COPAS"), Carta("7", "COPAS"), Carta("12", "COPAS")]
+    assert bot.avaliar_flor(None, "Contraflor") is False
+
+    bot.limite_flor = 28
+    assert bot.avaliar_flor(None, "Contraflor") is True
+
+
+def test_criar_agente():
+    assert isinstance(criar_agente('aleatorio', 'a', 1), BotAleatorio)
+    assert isinstance(criar_agente('roteirizado', 'r'), BotRoteirizado)
+    assert type(criar_agente('bot', 'b')) is Bot
+
+    with pytest.raises(ValueError):
+        criar_agente('humano', 'h')
@@ -0,0 +1,63 @@
+from truco.torneio import dividir_shards, executar_torneio, medir_escalabilidade, _CONTEXTO, _inicializar_trabalhador, _jogar_shard
+
+
+def test_dividir_shards():
+    shards = dividir_shards(60, 25, 1)
+
+    assert [tamanho for tamanho, _ in shards] == [25, 25, 10]
+    assert shards == dividir_shards(60, 25, 1)
+    assert shards != dividir_shards(60, 25, 2)
+
+
+def test_torneio_nao_depende_da_quantidade_de_trabalhadores():
+    resumo1 = executar_torneio('aleatorio', 'roteirizado', 12, trabalhadores=1, semente=3, tamanho_shard=4)
+    resumo2 = executar_torneio('aleatorio', 'roteirizado', 12, trabalhadores=2, semente=3, tamanho_shard=4)
+
+    assert resumo1.partidas == 12
+    assert resumo1.vitorias == resumo2.vitorias
+    assert resumo1.pontos == resumo2.pontos
+    assert resumo1.maos == resumo2.maos
+
+
+def test_shard_reprodutivel_no_processo_atual():
+    resumo1 = _jogar_shard('aleatorio', 'aleatorio', 5, 99)
+    resumo2 = _jogar_shard('aleatorio', 'aleatorio', 5, 99)
+
+    assert resumo1.pontos == resumo2.pontos
+    assert resumo1.maos == resumo2.maos
+
+
+def test_medir_escalabilidade():
+    medicoes = medir_escalabilidade('aleatorio', 'aleatorio', 4, max_trabalhadores=2, tamanho_shard=2)
+
+    assert [m['trabalhadores'] for m in medicoes] == [1, 2]
+    assert medicoes[0]['aceleracao'] == 1.0
+    assert all(m['resumo'].partidas == 4 for m in medicoes)
+
+
+def test_torneio_nao_depende_do_tamanho_do_shard():
+    resumo1 = executar_torneio('aleatorio', 'aleatorio', 9, trabalhadores=1, semente=4, tamanho_shard=9)
+    resumo2 = executar_torneio('aleatorio', 'aleatorio', 9, trabalhadores=2, semente=4, tamanho_shard=2)
+
+    assert resumo1.vitorias == resumo2.vitorias
+    assert resumo1.pontos == resumo2.pontos
+    assert resumo1.maos == resumo2.maos
+
+
+def test_torneio_com_bot_nao_depende_da_quantidade_de_trabalhadores():
+    resumo1 = executar_torneio('bot', 'aleatorio', 4, trabalhadores=1, semente=5, tamanho_shard=1)
+    resumo2 = executar_torneio('bot', 'aleatorio', 4, trabalhadores=2, semente=5, tamanho_shard=1)
+
+    assert resumo1.partidas == 4
+    assert resumo1.vitorias == resumo2.vitorias
+    assert resumo1.pontos == resumo2.pontos
+    assert resumo1.maos == resumo2.maos
+
+
+def test_trabalhador_compartilha_o_cbr_entre_os_bots():
+    _inicializar_trabalhador('bot', 'bot')
+    cbr1, cbr2 = _CONTEXTO['cbr'][1], _CONTEXTO['cbr'][2]
+    _CONTEXTO.clear()
+
+    assert cbr1.nbrs is cbr2.nbrs and cbr1.busca == cbr2.busca == 'bruta'
+    assert cbr1.dados is not cbr2.dados
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from truco.votos import SEM_VOTOS, moda, moda_lote, Vizinhanca
+
+
+@pytest.fixture
+def vizinhanca():
+    colunas = ['quemGanhouTruco', 'quemRetruco', 'qualidadeMaoHumano', 'ganhadorPrimeiraRodada', 'ganhadorSegundaRodada', 'ganhadorTerceiraRodada', 'primeiraCartaRobo', 'segundaCartaRobo', 'terceiraCartaRobo']
+    casos = np.array([
+        [2, 1, 30, 2, 2, 2, 52, 24, 12],
+        [2, 0, 30, 1, 2, 2, 52, 8, 7],
+        [1, 2, 12, 2, 1, 1, 1, 2, 3],
+        [2, 0, 18, 2, 1, 2, 16, 8, 7],
+        [1, 0, 40, 1, 1, 2, 4, 4, 4],
+    ], dtype=np.int16)
+    return Vizinhanca(np.arange(len(casos)), casos, {coluna: i for i, coluna in enumerate(colunas)})
+
+
+def test_moda_desempata_pelo_primeiro_vizinho():
+    assert moda(np.array([3, -3, 2, 2, -1, -1], dtype=np.int16)) == 2
+    assert moda(np.array([-100, 5, -100], dtype=np.int16)) == -100
+
+    with pytest.raises(IndexError):
+        moda(np.array([], dtype=np.int16))
+
+
+def test_moda_igual_value_counts_sem_empate():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        valores = rng.integers(-130, 117, rng.integers(1, 100)).astype(np.int16)
+        contagem = pd.Series(valores).value_counts()
+        if (len(contagem) == 1 or contagem.iloc[0] > contagem.iloc[1]):
+            assert moda(valores) == contagem.index[0]
+
+
+def test_votos_truco(vizinhanca):
+    votos = vizinhanca.votos_truco()
+
+    assert (votos.vencidas, votos.perdidas) == (2, 1)
+    assert votos.retruco == 0
+    assert votos.qualidade_mao_humana == 30
+    assert vizinhanca.votos_truco() is votos
+
+
+def test_votos_jogada(vizinhanca):
+    # Vizinhos em que o bot venceu a terceira rodada e a primeira ou a segunda: linhas 0, 1 e 3
+    referencias = vizinhanca.votos_jogada().referencias
+
+    assert referencias == {3: 52, 2: 8, 1: 7}
+
+
+def test_votos_sem_vizinhos_no_filtro():
+    colunas = {'quemGanhouTruco': 0, 'quemRetruco': 1, 'qualidadeMaoHumano': 2}
+    vizinhanca = Vizinhanca(np.arange(2), np.array([[1, 0, 20], [1, 2, 30]], dtype=np.int16), colunas)
+
+    votos = vizinhanca.votos_truco()
+
+    assert (votos.vencidas, votos.perdidas, votos.retruco, votos.qualidade_mao_humana) == (SEM_VOTOS, 1, SEM_VOTOS, SEM_VOTOS)
+    assert moda(np.array([], dtype=np.int16), 7) == 7
+
+
+def test_moda_lote_igual_moda_por_linha():
+    gerador = np.random.default_rng(5)
+    valores = gerador.integers(-3, 4, size=(50, 20)).astype(np.int16)
+    mascara = gerador.random((50, 20)) < 0.3
+    mascara[0] = False
+    modas = moda_lote(valores, mascara, padrao=-7)
+
+    assert modas[0] == -7
+    for linha in range(1, 50):
+        esperado = moda(valores[linha][mascara[linha]], -7)
+        assert modas[linha] == esperado
+
+    assert moda_lote(valores[:, :0]).tolist() == [SEM_VOTOS] * 50
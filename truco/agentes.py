@@ -0,0 +1,97 @@
+from .interface import Interface
+
+# Decisões que o motor pede aos agentes
+DECISOES_AGENTE = ('jogada', 'pedir_envido', 'truco', 'envido', 'flor')
+
+
+class Pergunta():
+    """Decisão pedida pelo motor a um agente: o tipo da decisão (DECISOES_AGENTE), a posição (1 ou 2) e o jogador que responde,
+    o CBR disponível, as opções válidas (código: descrição) e o contexto da aposta. Como na base de casos, quem_pediu é visto
+    por quem responde: 1 é o adversário."""
+    __slots__ = ('decisao', 'quem', 'jogador', 'cbr', 'opcoes', 'estado', 'valor', 'pontos', 'quem_pediu', 'padrao')
+
+    def __init__(self, decisao, quem, jogador, cbr=None, opcoes=None, estado=None, valor=0, pontos=0, quem_pediu=1, padrao=None):
+        if (decisao not in DECISOES_AGENTE):
+            raise ValueError(f"Decisão desconhecida: {decisao}. Opções: {', '.join(DECISOES_AGENTE)}")
+
+        self.decisao = decisao
+        self.quem = quem
+        self.jogador = jogador
+        self.cbr = cbr
+        self.opcoes = opcoes
+        self.estado = estado
+        self.valor = valor
+        self.pontos = pontos
+        self.quem_pediu = quem_pediu
+        self.padrao = padrao
+
+
+def perguntar(agente, pergunta):
+    """Pede a decisão ao agente; respostas fora das opções valem como a resposta padrão da pergunta, quando houver."""
+    escolha = agente.responder(pergunta)
+    if (pergunta.padrao is not None and escolha not in pergunta.opcoes):
+        return pergunta.padrao
+
+    return escolha
+
+
+class AgenteJogador():
+    """Agente que repassa as perguntas ao próprio jogador (Bot e agentes da simulação), pelos métodos jogar_carta,
+    avaliar_truco, avaliar_envido e avaliar_flor. Sem um CBR próprio, usa o CBR informado na pergunta."""
+    def __init__(self, cbr=None):
+        self.cbr = cbr
+
+
+    def responder(self, pergunta):
+        """Responde à pergunta com a decisão do jogador."""
+        cbr = pergunta.cbr if self.cbr is None else self.cbr
+        jogador = pergunta.jogador
+        if (pergunta.decisao == 'jogada'):
+            return jogador.jogar_carta(cbr, pergunta.estado)
+
+        if (pergunta.decisao == 'pedir_envido'):
+            return jogador.avaliar_envido(cbr, 'Envido', 2, pergunta.pontos)
+
+        if (pergunta.decisao == 'truco'):
+            return jogador.avaliar_truco(cbr, pergunta.estado, pergunta.quem_pediu)
+
+        if (pergunta.decisao == 'envido'):
+            return jogador.avaliar_envido(cbr, pergunta.estado, pergunta.quem_pediu, pergunta.pontos)
+
+        return int(bool(jogador.avaliar_flor(cbr, pergunta.estado)))
+
+
+class AgenteTerminal():
+    """Agente humano: exibe as opções da pergunta e lê a escolha pelo terminal, repetindo até receber uma opção válida."""
+    def __init__(self, interface=None):
+        self.interface = interface or Interface()
+
+
+    def responder(self, pergunta):
+        """Lê a resposta do jogador humano."""
+        # O humano pede envido pelas opções da própria jogada, e não antes dela
+        if (pergunta.decisao == 'pedir_envido'):
+            return 0
+
+        if (pergunta.decisao == 'jogada'):
+            self.interface.mostrar_opcoes_jogada(pergunta.jogador.nome, pergunta.quem, pergunta.opcoes)
+            return self.ler_escolha(f"\n{pergunta.jogador.nome} Qual carta você quer jogar? ", pergunta.opcoes)
+
+        if (pergunta.decisao == 'flor'):
+            mensagem = f"Jogador {pergunta.quem}, você aceita o pedido de {pergunta.estado}?"
+        elif (pergunta.decisao == 'envido'):
+            # O envido é disputado à parte: o valor é o do próprio envido, e não o da mão
+            mensagem = f"Jogador {pergunta.quem}, você aceita o pedido (o envido passa a valer {pergunta.valor} pontos)?"
+        else:
+            mensagem = f"Jogador {pergunta.quem}, você aceita o pedido (a mão passa a valer {pergunta.valor} pontos)?"
+
+        return self.ler_escolha(mensagem + ''.join(f"\n[{codigo}] {descricao}" for codigo, descricao in pergunta.opcoes.items()), pergunta.opcoes)
+
+
+    def ler_escolha(self, mensagem, opcoes):
+        """Lê a resposta pelo terminal, repetindo a pergunta até receber uma opção válida."""
+        escolha = -1
+        while (escolha not in opcoes):
+            escolha = int(input(mensagem))
+
+        return escolha
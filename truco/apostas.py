@@ -0,0 +1,105 @@
+# Papéis em uma aposta: quem pede (abre ou aumenta a aposta pelo próprio turno) e quem responde a um pedido
+PEDE, RESPONDE = 1, 2
+
+# Respostas comuns a todos os pedidos; os demais códigos de resposta aumentam a aposta
+RECUSAR, ACEITAR = 0, 1
+
+# Valor do falta envido, que depende do placar e é calculado pela classe Envido
+VALOR_FALTA = -1
+
+# Níveis de cada aposta: nome, valor em jogo caso aceito, pontos de quem pediu caso o adversário recuse
+# e os aumentos que quem responde pode pedir (código da resposta: próximo nível)
+NIVEIS = {
+    'truco': {
+        'truco': ('Truco', 2, 1, {2: 'retruco'}),
+        'retruco': ('Retruco', 3, 2, {2: 'vale_quatro'}),
+        'vale_quatro': ('Vale 4', 4, 3, {}),
+    },
+    'envido': {
+        6: ('Envido', 2, 1, {2: 7, 3: 8}),
+        7: ('Real Envido', 5, 2, {2: 8}),
+        8: ('Falta Envido', VALOR_FALTA, 5, {}),
+    },
+    'flor': {
+        'Flor': ('Flor', 3, 0, {}),
+        'Contraflor': ('Contraflor', 6, 4, {}),
+        'Contraflor e Resto': ('Contraflor e Resto', 3, 4, {}),
+    },
+}
+
+# Pedidos que quem está na vez pode fazer a partir de cada estado (estado atual: níveis que podem ser pedidos)
+PEDIDOS = {
+    'truco': {'': ('truco',), 'truco': ('retruco',), 'retruco': ('vale_quatro',)},
+    'envido': {0: (6, 7, 8)},
+    'flor': {'': ('Flor',), 'Flor': ('Contraflor', 'Contraflor e Resto')},
+}
+
+# Descrição das respostas de aumento de cada aposta
+DESCRICAO_AUMENTOS = {'truco': 'Aumentar Aposta', 'flor': None, 'envido': None}
+
+
+def compilar_transicoes(niveis, pedidos):
+    """Monta a tabela de transições (aposta, estado, papel, ação) -> (próximo estado, pontos em caso de recusa, valor em jogo)
+    e a tabela de ações válidas (aposta, estado, papel) -> {código: descrição}."""
+    transicoes, acoes = {}, {}
+    for aposta, estados in pedidos.items():
+        for estado, proximos in estados.items():
+            acoes[(aposta, estado, PEDE)] = {}
+            for proximo in proximos:
+                nome, valor, pontos_recusa, aumentos = niveis[aposta][proximo]
+                transicoes[(aposta, estado, PEDE, proximo)] = (proximo, pontos_recusa, valor)
+                acoes[(aposta, estado, PEDE)][proximo] = nome
+
+    for aposta, estados in niveis.items():
+        for estado, (nome, valor, pontos_recusa, aumentos) in estados.items():
+            respostas = {RECUSAR: 'Recusar', ACEITAR: 'Aceitar'}
+            transicoes[(aposta, estado, RESPONDE, RECUSAR)] = (estado, pontos_recusa, valor)
+            transicoes[(aposta, estado, RESPONDE, ACEITAR)] = (estado, pontos_recusa, valor)
+            for codigo, proximo in aumentos.items():
+                nome_proximo, valor_proximo, recusa_proximo, _ = niveis[aposta][proximo]
+                transicoes[(aposta, estado, RESPONDE, codigo)] = (proximo, recusa_proximo, valor_proximo)
+                respostas[codigo] = DESCRICAO_AUMENTOS[aposta] or nome_proximo
+
+            acoes[(aposta, estado, RESPONDE)] = respostas
+
+    return transicoes, acoes
+
+
+TRANSICOES, ACOES = compilar_transicoes(NIVEIS, PEDIDOS)
+
+# Sem ações válidas no estado (por exemplo, pedir truco depois do vale quatro)
+_SEM_ACOES = {}
+
+
+class Aposta():
+    """Base das classes de truco, envido e flor: consultas à tabela de transições da aposta (atributo APOSTA)
+    e o bloqueio que impede o mesmo jogador de aumentar a aposta seguidamente."""
+    APOSTA = None
+
+    def inverter_jogador_bloqueado(self):
+        """Lógica para impedir que o mesmo jogador não peça o aumento de aposta seguidamente."""
+        if (self.jogador_bloqueado == 1):
+            self.jogador_bloqueado = 2
+
+        else:
+            self.jogador_bloqueado = 1
+
+
+    def inicializar_jogador_bloqueado(self, quem_pediu):
+        """Inicialização do jogador que foi bloqueado e não pode pedir aumento da aposta."""
+        self.jogador_bloqueado = quem_pediu
+
+
+    def acoes_validas(self, papel, estado=None):
+        """Ações válidas (código: descrição) para quem pede ou responde no estado informado (por padrão, o atual)."""
+        return ACOES.get((self.APOSTA, self.estado_atual if estado is None else estado, papel), _SEM_ACOES)
+
+
+    def transicao(self, papel, acao, estado=None):
+        """Retorna (próximo estado, pontos em caso de recusa, valor em jogo) da ação, ou None se ela não é válida."""
+        return TRANSICOES.get((self.APOSTA, self.estado_atual if estado is None else estado, papel, acao))
+
+
+    def nome_nivel(self, estado):
+        """Nome do nível da aposta, para as mensagens da interface."""
+        return NIVEIS[self.APOSTA][estado][0]
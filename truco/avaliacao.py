@@ -0,0 +1,97 @@
+import argparse
+import numpy as np
+from pathlib import Path
+from .busca import BuscaBruta, BuscaIVF, calibrar
+from .cbr import decidir_envido, decidir_jogada, decidir_truco
+from .dados import Dados
+from .votos import (mascara_envido_ganho, mascara_envido_perdido, mascara_jogadas_vencidas, mascara_truco_ganho, mascara_truco_perdido,
+                    votar_envido_lote, votar_jogada_lote, votar_truco_lote)
+
+# Bases de casos distribuídas com o projeto
+BASES = ['dbtrucocbr_maos.csv', 'dbaprendizadoativo_maos.csv']
+
+# Decisões que consultam os vizinhos, cada uma com os seus votos
+DECISOES_VOTOS = ('truco', 'envido', 'jogada_1', 'jogada_2', 'jogada_3')
+
+
+def carregar_base(csv_path):
+    """Trata um CSV de casos e retorna a matriz int16 e o mapa de colunas."""
+    df = Dados().tratamento_inicial_df(csv_path)
+    return np.ascontiguousarray(df.to_numpy(dtype=np.int16)), {coluna: i for i, coluna in enumerate(df.columns)}
+
+
+def decisoes_votos(casos, colunas, decisao):
+    """Decisões do Cbr para uma grade fixa de argumentos, a partir dos vizinhos (lote, k, colunas) de cada consulta,
+    para uma decisão ('truco', 'envido' ou 'jogada_<rodada>')."""
+    if (decisao == 'truco'):
+        votos = votar_truco_lote(casos, mascara_truco_ganho(casos, colunas), casos, mascara_truco_perdido(casos, colunas), colunas)
+        return np.array([[decidir_truco(voto, 1, 1, qualidade) for qualidade in range(4)] for voto in votos]).reshape(len(votos), -1)
+
+    if (decisao == 'envido'):
+        votos = votar_envido_lote(casos, mascara_envido_ganho(casos, colunas), casos, mascara_envido_perdido(casos, colunas), colunas)
+        return np.array([[decidir_envido(voto, tipo, quem_pediu, pontos, perdendo) for tipo in (6, 7, 8) for quem_pediu in (1, 2) for pontos in (0, 20, 30)
+                          for perdendo in (False, True)] for voto in votos]).reshape(len(votos), -1)
+
+    rodada = int(decisao.split('_')[1])
+    votos = votar_jogada_lote(casos, mascara_jogadas_vencidas(casos, colunas), colunas)
+    return np.array([[decidir_jogada(voto, rodada, pontuacao) for pontuacao in ([1, 7, 12], [4, 8, 14], [2, 3, 5])] for voto in votos]).reshape(len(votos), -1)
+
+
+def decisoes(casos, colunas):
+    """Decisões do Cbr para uma grade fixa de argumentos de todas as decisões, a partir dos vizinhos (lote, k, colunas) de cada consulta."""
+    return np.concatenate([decisoes_votos(casos, colunas, decisao) for decisao in DECISOES_VOTOS], axis=1)
+
+
+def revocacao(distancias_aproximadas, distancias_exatas):
+    """Revocação@k considerando empates: um vizinho aproximado conta como acerto se está dentro do raio do k-ésimo vizinho exato."""
+    raio = distancias_exatas[:, -1:] * (1 + 1e-6)
+    return float((distancias_aproximadas <= raio).mean())
+
+
+def avaliar_ivf(matriz, colunas, sondas=(1, 2, 4, 8, 16), consultas=200, n_listas=None, semente=0):
+    """Mede revocação@100, concordância das decisões e tempo por consulta da busca 'ivf' em relação à busca exata."""
+    gerador = np.random.default_rng(semente)
+    amostra = matriz[gerador.choice(len(matriz), min(consultas, len(matriz)), replace=False)]
+    exata = BuscaBruta(matriz, 100)
+    aproximada = BuscaIVF(matriz, 100, n_listas, semente=semente)
+    distancias_exatas, indices_exatos = exata.kneighbors(amostra)
+    decisoes_exatas = decisoes(matriz[indices_exatos], colunas)
+    tempo_exata = calibrar({'bruta': exata}, amostra, 1)[1]['bruta']
+
+    medicoes = []
+    for n_sondas in sondas:
+        aproximada.n_sondas = n_sondas
+        distancias, indices = aproximada.kneighbors(amostra)
+        tempo = calibrar({'ivf': aproximada}, amostra, 1)[1]['ivf']
+        medicoes.append({'listas': len(aproximada.centroides), 'sondas': n_sondas, 'revocacao': revocacao(distancias, distancias_exatas),
+                         'concordancia': float((decisoes(matriz[indices], colunas) == decisoes_exatas).mean()),
+                         'tempo_ms': tempo * 1000, 'tempo_exata_ms': tempo_exata * 1000})
+
+    return medicoes
+
+
+def main(argumentos=None):
+    """Avalia a busca aproximada nas bases de casos pela linha de comando e exibe a tabela de medições."""
+    parser = argparse.ArgumentParser(description='Revocação, concordância das decisões e tempo da busca aproximada (ivf) em relação à busca exata.')
+    parser.add_argument('--bases', nargs='+', default=None)
+    parser.add_argument('--sondas', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--listas', type=int, default=None)
+    parser.add_argument('--consultas', type=int, default=200)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argumentos)
+
+    base_dir = Path(__file__).resolve().parent.parent
+    resultados = {}
+    for base in (args.bases or [base_dir / nome for nome in BASES]):
+        matriz, colunas = carregar_base(base)
+        resultados[str(base)] = avaliar_ivf(matriz, colunas, args.sondas, args.consultas, args.listas, args.semente)
+        print(f"{Path(base).name}: {len(matriz)} casos")
+        for medicao in resultados[str(base)]:
+            print(f"  {medicao['sondas']:>3}/{medicao['listas']} listas: revocação@100 {medicao['revocacao']:.3f}, concordância {medicao['concordancia']:.3f}, "
+                  f"{medicao['tempo_ms']:.3f} ms/consulta (exata {medicao['tempo_exata_ms']:.3f} ms)")
+
+    return resultados
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,16 @@
-from .carta import Carta
+from .carta import Carta, NAIPE_CARTA, NUMERO_CARTA
+import numpy as np
 import random
 
+# Conjunto imutável das 40 cartas, na ordem dos códigos de truco.carta; o BaralhoIndices reutiliza sempre os mesmos objetos
+CARTAS = tuple(Carta(numero, naipe) for numero, naipe in zip(NUMERO_CARTA, NAIPE_CARTA))
+
+# Cartas distribuídas por mão: três para cada jogador
+CARTAS_POR_MAO = 6
+
+# Ordem inicial da permutação, restaurada antes de cada embaralhamento
+_IDENTIDADE = np.arange(len(CARTAS), dtype=np.int8)
+
 
 class Baralho():
     
@@ -17,9 +27,12 @@ class Baralho():
                 if n < 8 or n >= 10:
                     self.cartas.append(Carta(n, i))
     
-    def embaralhar(self):
-        """Embaralha o baralho de forma aleatõria."""
-        random.shuffle(self.cartas)
+    def embaralhar(self, rng=None):
+        """Embaralha o baralho de forma aleatõria, usando o gerador informado (ou o global do módulo random)."""
+        if (rng is None):
+            rng = random
+
+        rng.shuffle(self.cartas)
 
     def retirar_carta(self):
         """Retira uma carta quando o jogador for receber as cartas na mesa."""
@@ -34,4 +47,68 @@ class Baralho():
     def printar_baralho(self):
         """Exibe o baralho inteiro."""
         for c in self.cartas:
-            c.exibir_carta()
\ No newline at end of file
+            c.exibir_carta()
+
+
+class BaralhoIndices():
+    """Baralho sem alocação de cartas: guarda uma permutação dos códigos 0 a 39, embaralhada no próprio array por um
+    numpy.random.Generator da partida, e entrega as cartas do conjunto imutável CARTAS. Tem a mesma interface do Baralho
+    usada pelos jogadores e pelo motor, e distribui lotes de mãos como arrays de códigos."""
+    def __init__(self, gerador=None):
+        self.gerador = gerador if isinstance(gerador, np.random.Generator) else np.random.default_rng(gerador)
+        self.ordem = np.arange(len(CARTAS), dtype=np.int8)
+        self.topo = 0
+        self.lote = None
+        self.linhas = None
+
+
+    def criar_baralho(self):
+        """Devolve todas as cartas ao baralho; a permutação atual é mantida até o próximo embaralhamento."""
+        self.topo = 0
+
+
+    def resetar(self):
+        """Devolve todas as cartas ao baralho."""
+        self.topo = 0
+
+
+    def embaralhar(self, gerador=None):
+        """Embaralha a permutação no próprio array, com o gerador informado ou o da partida, e devolve as cartas ao baralho.
+        A permutação parte sempre da ordem inicial, então a distribuição depende apenas do estado do gerador."""
+        np.copyto(self.ordem, _IDENTIDADE)
+        (gerador or self.gerador).shuffle(self.ordem)
+        self.topo = 0
+
+
+    def retirar_codigo(self):
+        """Retira a próxima carta do baralho e retorna o seu código."""
+        codigo = self.ordem[self.topo]
+        self.topo += 1
+        return int(codigo)
+
+
+    def retirar_carta(self):
+        """Retira a próxima carta do baralho, sem criar um novo objeto Carta."""
+        return CARTAS[self.retirar_codigo()]
+
+
+    def distribuir_lote(self, quantidade, saida=None):
+        """Distribui as cartas de várias mãos de uma vez: retorna um array (quantidade, 6) de códigos, em que as colunas 0 a 2
+        são a mão do jogador 1 e 3 a 5 a do jogador 2, na ordem em que retirar_carta as entregaria."""
+        if (self.lote is None or len(self.lote) != quantidade):
+            self.lote = np.tile(np.arange(len(CARTAS), dtype=np.int8), (quantidade, 1))
+            self.linhas = np.arange(quantidade)
+
+        # Fisher-Yates parcial em todas as linhas do buffer, com os sorteios do lote feitos em uma única chamada ao gerador.
+        # Cada linha do buffer continua sendo uma permutação, por isso ele é reutilizado sem ser reiniciado.
+        alvos = self.gerador.integers(np.arange(CARTAS_POR_MAO), len(CARTAS), size=(quantidade, CARTAS_POR_MAO))
+        for posicao in range(CARTAS_POR_MAO):
+            trocadas = self.lote[self.linhas, alvos[:, posicao]]
+            self.lote[self.linhas, alvos[:, posicao]] = self.lote[:, posicao]
+            self.lote[:, posicao] = trocadas
+
+        if (saida is None):
+            return self.lote[:, :CARTAS_POR_MAO].copy()
+
+        np.copyto(saida, self.lote[:, :CARTAS_POR_MAO])
+        return saida
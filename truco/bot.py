@@ -1,5 +1,6 @@
 import random 
 import pandas as pd
+from .maos import avaliar_mao
 
 class Bot():
     def __init__(self, nome):
@@ -25,6 +26,15 @@ class Bot():
         for i in range(3):
             self.mao.append(baralho.retirar_carta())
 
+        # Uma única consulta à tabela de mãos substitui os cálculos de flor, ranks, qualidade e envido
+        avaliacao = avaliar_mao(self.mao)
+        if (avaliacao is not None):
+            self.flor = avaliacao.flor
+            self.pontuacao_cartas, self.mao_rank = avaliacao.pontos, avaliacao.classificacao
+            self.qualidade_mao = avaliacao.qualidade
+            self.envido = avaliacao.envido
+            return
+
         self.flor = self.checa_flor()
         self.pontuacao_cartas, self.mao_rank = self.mao[0].classificar_carta(self.mao)
         self.calcular_qualidade_mao(self.pontuacao_cartas, self.mao_rank)
@@ -87,6 +97,10 @@ class Bot():
 
     def calcula_envido(self, mao):
         """Realização do cálculo de envido."""
+        avaliacao = avaliar_mao(mao)
+        if (avaliacao is not None):
+            return avaliacao.envido
+
         pontos_envido = []
 
         for i in range(len(mao)):
@@ -142,6 +156,10 @@ class Bot():
 
     def checa_flor(self):
         """Verifica se o bot possui flor em sua mão."""
+        avaliacao = avaliar_mao(self.mao)
+        if (avaliacao is not None):
+            return avaliacao.flor
+
         if all(carta.retornar_naipe() == self.mao[0].retornar_naipe() for carta in self.mao):
             # print('Flor do Bot!')
             return True
@@ -167,6 +185,14 @@ class Bot():
         # CHAMADA DO CBR OU OUTRA INTELIGÊNCIA DEVE OCORRER AQUI
         return cbr.envido(tipo, quem_pediu, self.envido, perdendo)
 
+    def avaliar_flor(self, cbr, estado):
+        """Verifica se a melhor jogada para o bot seria aceitar a contraflor ou contraflor e resto."""
+        avaliacao = avaliar_mao(self.mao)
+        pontos_flor = int(avaliacao.pontos_flor) if avaliacao is not None else 0
+        # CHAMADA DO CBR OU OUTRA INTELIGÊNCIA DEVE OCORRER AQUI
+        return cbr.contraflor(estado, pontos_flor)
+
+
     def avaliar_pedir_envido(self):
         """Verifica se a melhor jogada para o bot seria pedir envido."""
         return 1
@@ -0,0 +1,137 @@
+import time
+import numpy as np
+from sklearn.cluster import KMeans
+
+# Motores de busca dos casos vizinhos. Todos seguem a interface de kneighbors do NearestNeighbors do scikit-learn,
+# retornando (distancias, indices) com uma linha por consulta, para que o Cbr possa usar qualquer um deles.
+BUSCAS = ('ball_tree', 'kd_tree', 'bruta', 'blocos')
+
+# Motores aproximados: não participam da calibração automática, pois trocam exatidão por velocidade
+BUSCAS_APROXIMADAS = ('ivf',)
+
+
+def selecionar_vizinhos(distancias2, indices, k):
+    """Seleciona os k menores pares (distância², índice), desempatando distâncias iguais pelo menor índice."""
+    if (len(distancias2) > k):
+        limite = np.partition(distancias2, k - 1)[k - 1]
+        candidatos = distancias2 <= limite
+        distancias2, indices = distancias2[candidatos], indices[candidatos]
+
+    ordem = np.lexsort((indices, distancias2))[:k]
+    return distancias2[ordem], indices[ordem]
+
+
+class BuscaBruta():
+    """Busca exaustiva em float32: normas dos casos pré-calculadas e um único produto matriz-vetor por consulta."""
+    def __init__(self, casos, n_neighbors=100):
+        self.casos = np.ascontiguousarray(casos, dtype=np.float32)
+        self.normas = np.einsum('ij,ij->i', self.casos, self.casos)
+        self.n_neighbors = n_neighbors
+        self.posicoes = np.arange(len(self.casos))
+
+
+    def distancias2(self, consulta, inicio=0, fim=None):
+        """Distâncias euclidianas ao quadrado entre a consulta e os casos do intervalo [inicio, fim)."""
+        casos = self.casos[inicio:fim]
+        return self.normas[inicio:fim] - 2 * (casos @ consulta) + consulta @ consulta
+
+
+    def kneighbors(self, X, n_neighbors=None):
+        """Retorna as distâncias e os índices dos k casos mais próximos de cada consulta."""
+        k = min(n_neighbors or self.n_neighbors, len(self.casos))
+        consultas = np.asarray(X, dtype=np.float32).reshape(-1, self.casos.shape[1])
+        distancias = np.empty((len(consultas), k))
+        indices = np.empty((len(consultas), k), dtype=np.intp)
+        # Um único produto matriz-matriz para todas as consultas do lote; a seleção dos k vizinhos continua por consulta
+        todas = self.normas - 2 * (consultas @ self.casos.T) + np.einsum('ij,ij->i', consultas, consultas)[:, None]
+        for i in range(len(consultas)):
+            distancias2, indices[i] = selecionar_vizinhos(todas[i], self.posicoes, k)
+            distancias[i] = np.sqrt(np.maximum(distancias2, 0))
+
+        return distancias, indices
+
+
+class BuscaBrutaBlocos(BuscaBruta):
+    """Busca exaustiva processada em blocos de casos, mantendo apenas os k melhores candidatos, para bases grandes."""
+    def __init__(self, casos, n_neighbors=100, tamanho_bloco=4096):
+        super().__init__(casos, n_neighbors)
+        self.tamanho_bloco = tamanho_bloco
+
+
+    def kneighbors(self, X, n_neighbors=None):
+        """Retorna as distâncias e os índices dos k casos mais próximos de cada consulta, bloco a bloco."""
+        k = min(n_neighbors or self.n_neighbors, len(self.casos))
+        consultas = np.asarray(X, dtype=np.float32).reshape(-1, self.casos.shape[1])
+        distancias = np.empty((len(consultas), k))
+        indices = np.empty((len(consultas), k), dtype=np.intp)
+        for i, consulta in enumerate(consultas):
+            melhores_distancias = np.empty(0, dtype=np.float32)
+            melhores_indices = np.empty(0, dtype=np.intp)
+            for inicio in range(0, len(self.casos), self.tamanho_bloco):
+                fim = inicio + self.tamanho_bloco
+                melhores_distancias, melhores_indices = selecionar_vizinhos(
+                    np.concatenate([melhores_distancias, self.distancias2(consulta, inicio, fim)]),
+                    np.concatenate([melhores_indices, self.posicoes[inicio:fim]]), k)
+
+            distancias[i] = np.sqrt(np.maximum(melhores_distancias, 0))
+            indices[i] = melhores_indices
+
+        return distancias, indices
+
+
+class BuscaIVF(BuscaBruta):
+    """Busca aproximada por listas invertidas: os casos são agrupados por k-means e cada consulta percorre apenas as n_sondas listas
+    de centroides mais próximos (ou mais, até reunir k candidatos). Com n_sondas igual ao número de listas o resultado é exato."""
+    def __init__(self, casos, n_neighbors=100, n_listas=None, n_sondas=8, semente=0):
+        super().__init__(casos, n_neighbors)
+        n_listas = min(n_listas or max(1, int(np.sqrt(len(self.casos)))), len(self.casos))
+        kmeans = KMeans(n_clusters=n_listas, n_init=1, random_state=semente).fit(self.casos)
+        self.centroides = kmeans.cluster_centers_.astype(np.float32)
+        # Casos reordenados por lista, para que cada lista seja um intervalo contíguo da matriz
+        ordem = np.argsort(kmeans.labels_, kind='stable')
+        self.casos, self.normas, self.posicoes = self.casos[ordem], self.normas[ordem], ordem
+        self.inicios = np.searchsorted(kmeans.labels_[ordem], np.arange(n_listas + 1))
+        self.tamanhos = np.diff(self.inicios)
+        self.linhas = np.arange(len(self.casos))
+        self.normas_centroides = np.einsum('ij,ij->i', self.centroides, self.centroides)
+        self.n_sondas = n_sondas
+
+
+    def linhas_sondadas(self, distancias_centroides, k):
+        """Retorna as linhas das listas sondadas para uma consulta, garantindo ao menos k candidatos."""
+        listas = np.argsort(distancias_centroides, kind='stable')
+        acumulado = np.cumsum(self.tamanhos[listas])
+        sondas = max(self.n_sondas, int(np.searchsorted(acumulado, k)) + 1)
+        return np.concatenate([self.linhas[self.inicios[lista]:self.inicios[lista + 1]] for lista in listas[:sondas]])
+
+
+    def kneighbors(self, X, n_neighbors=None):
+        """Retorna as distâncias e os índices dos k casos mais próximos de cada consulta entre as listas sondadas."""
+        k = min(n_neighbors or self.n_neighbors, len(self.casos))
+        consultas = np.asarray(X, dtype=np.float32).reshape(-1, self.casos.shape[1])
+        distancias = np.empty((len(consultas), k))
+        indices = np.empty((len(consultas), k), dtype=np.intp)
+        # Distâncias (a menos de uma constante por consulta) de todas as consultas a todos os centroides em um produto de matrizes
+        distancias_centroides = self.normas_centroides - 2 * (consultas @ self.centroides.T)
+        for i, consulta in enumerate(consultas):
+            linhas = self.linhas_sondadas(distancias_centroides[i], k)
+            distancias2 = self.normas[linhas] - 2 * (self.casos[linhas] @ consulta) + consulta @ consulta
+            distancias2, indices[i] = selecionar_vizinhos(distancias2, self.posicoes[linhas], k)
+            distancias[i] = np.sqrt(np.maximum(distancias2, 0))
+
+        return distancias, indices
+
+
+def calibrar(motores, consultas, repeticoes=3):
+    """Mede o tempo médio por consulta de cada motor e retorna o nome do mais rápido e os tempos medidos."""
+    tempos = {}
+    for nome, motor in motores.items():
+        motor.kneighbors(consultas[:1])
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            for consulta in consultas:
+                motor.kneighbors(consulta.reshape(1, -1))
+
+        tempos[nome] = (time.perf_counter() - inicio) / (repeticoes * len(consultas))
+
+    return min(tempos, key=tempos.get), tempos
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+
+class CacheLRU():
+    """Cache de tamanho limitado que descarta o item usado há mais tempo, com contadores de acertos e falhas."""
+    def __init__(self, capacidade=1024):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor da chave, marcando-o como o mais recente, ou o padrão caso a chave não esteja no cache."""
+        if (chave in self.itens):
+            self.itens.move_to_end(chave)
+            self.acertos += 1
+            return self.itens[chave]
+
+        self.falhas += 1
+        return padrao
+
+
+    def adicionar(self, chave, valor):
+        """Adiciona o valor ao cache, descartando o item mais antigo caso a capacidade seja excedida."""
+        self.itens[chave] = valor
+        self.itens.move_to_end(chave)
+        if (len(self.itens) > self.capacidade):
+            self.itens.popitem(last=False)
+
+
+    def limpar(self):
+        """Remove todos os itens do cache, mantendo os contadores."""
+        self.itens.clear()
+
+
+    def taxa_acertos(self):
+        """Retorna a fração das consultas atendidas pelo cache."""
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+
+    def estatisticas(self):
+        """Retorna os contadores do cache para monitoramento."""
+        return {'acertos': self.acertos, 'falhas': self.falhas, 'itens': len(self.itens), 'taxa_acertos': self.taxa_acertos()}
+
+
+    def __len__(self):
+        return len(self.itens)
+
+
+    def __contains__(self, chave):
+        return chave in self.itens
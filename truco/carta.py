@@ -1,72 +1,110 @@
 import itertools
 from .pontos import MANILHA, CARTAS_VALORES, ENVIDO
 
+# Codificação compacta: cada uma das 40 cartas é um inteiro de 0 a 39 (naipe * 10 + posição do número),
+# na mesma ordem em que o baralho é criado. As tabelas abaixo são indexadas por esse código.
+NAIPES = ('ESPADAS', 'OUROS', 'COPAS', 'BASTOS')
+NUMEROS = (1, 2, 3, 4, 5, 6, 7, 10, 11, 12)
+NAIPES_CODIFICADOS = {'ESPADAS': 1, 'OUROS': 2, 'BASTOS': 3, 'COPAS': 4}
+
+NUMERO_CARTA = tuple(numero for naipe in NAIPES for numero in NUMEROS)
+NAIPE_CARTA = tuple(naipe for naipe in NAIPES for numero in NUMEROS)
+FORCA_CARTA = tuple(MANILHA.get(f"{numero} de {naipe}", CARTAS_VALORES[str(numero)]) for numero, naipe in zip(NUMERO_CARTA, NAIPE_CARTA))
+ENVIDO_CARTA = tuple(ENVIDO[str(numero)] for numero in NUMERO_CARTA)
+NAIPE_CODIGO_CARTA = tuple(NAIPES_CODIFICADOS[naipe] for naipe in NAIPE_CARTA)
+MANILHA_CARTA = tuple(f"{numero} de {naipe}" in MANILHA for numero, naipe in zip(NUMERO_CARTA, NAIPE_CARTA))
+
+# Aceita o número tanto como inteiro quanto como texto, como ocorre nas cartas criadas pelo jogo e pelos testes
+_CODIGOS = {}
+for _codigo, (_numero, _naipe) in enumerate(zip(NUMERO_CARTA, NAIPE_CARTA)):
+    _CODIGOS[(_numero, _naipe)] = _codigo
+    _CODIGOS[(str(_numero), _naipe)] = _codigo
+
+
+def codificar_carta(numero, naipe):
+    """Retorna o código (0 a 39) da carta, ou None caso a carta não pertença ao baralho."""
+    return _CODIGOS.get((numero, naipe))
+
+
+def forca_carta(carta):
+    """Retorna a força da carta na disputa das rodadas (pontuação de manilha ou da tabela de valores)."""
+    codigo = _CODIGOS.get((carta.numero, carta.naipe))
+    if (codigo is not None):
+        return FORCA_CARTA[codigo]
+
+    if (str(carta.numero)+" de "+str(carta.naipe)) in MANILHA:
+        return MANILHA[str(carta.numero)+" de "+str(carta.naipe)]
+
+    return CARTAS_VALORES[str(carta.numero)]
+
+
+def e_manilha(carta):
+    """Verifica se a carta é uma manilha."""
+    codigo = _CODIGOS.get((carta.numero, carta.naipe))
+    if (codigo is not None):
+        return MANILHA_CARTA[codigo]
+
+    return (str(carta.numero)+" de "+str(carta.naipe)) in MANILHA
+
+
 class Carta():
+    __slots__ = ('numero', 'naipe')
+
     def __init__(self, numero, naipe):
         self.numero = numero
         self.naipe = naipe
 
     def verificar_carta_alta(self, carta_01, carta_02):
         """Verificação de qual carta é a carta mais alta, entre duas cartas."""
-        if (str(carta_01.numero)+" de "+carta_01.naipe) in MANILHA and (str(carta_02.numero)+" de "+carta_02.naipe) in MANILHA:
-            if MANILHA[str(carta_01.numero)+" de "+carta_01.naipe] > MANILHA[str(carta_02.numero)+" de "+carta_02.naipe]:
-                return carta_01
-            elif MANILHA[str(carta_02.numero)+" de "+carta_02.naipe] > MANILHA[str(carta_01.numero)+" de "+carta_01.naipe]:
-                return carta_02
-
-        elif (str(carta_01.numero)+" de "+carta_01.naipe) in MANILHA:
+        forca_01 = forca_carta(carta_01)
+        forca_02 = forca_carta(carta_02)
+        if (forca_01 > forca_02):
             return carta_01
 
-        elif (str(carta_02.numero)+" de "+carta_02.naipe) in MANILHA:
+        elif (forca_02 > forca_01):
             return carta_02
 
-        else:
-            if CARTAS_VALORES[str(carta_01.numero)] > CARTAS_VALORES[str(carta_02.numero)]:
-                return carta_01
-            else:
-                return carta_02
+        # Empate: entre cartas comuns vence a segunda; a mesma manilha comparada consigo retorna a primeira
+        elif (e_manilha(carta_01)):
+            return carta_01
 
-        return carta_01
+        return carta_02
 
 
     def verificar_carta_baixa(self, carta_01, carta_02):
         """Verificação de qual é a carta mais baixa entre duas cartas."""
-        if (str(carta_01.numero)+" de "+carta_01.naipe) in MANILHA and (str(carta_02.numero)+" de "+carta_02.naipe) in MANILHA:
-            if MANILHA[str(carta_01.numero)+" de "+carta_01.naipe] < MANILHA[str(carta_02.numero)+" de "+carta_02.naipe]:
-                return carta_01
-
-            elif MANILHA[str(carta_02.numero)+" de "+carta_02.naipe] < MANILHA[str(carta_01.numero)+" de "+carta_01.naipe]:
-                return carta_02
+        forca_01 = forca_carta(carta_01)
+        forca_02 = forca_carta(carta_02)
+        if (forca_01 < forca_02):
+            return carta_01
 
-        elif (str(carta_01.numero)+" de "+carta_01.naipe) in MANILHA:
+        elif (forca_02 < forca_01):
             return carta_02
 
-        elif (str(carta_02.numero)+" de "+carta_02.naipe) in MANILHA:
+        elif (e_manilha(carta_01)):
             return carta_01
 
-        else:
-            if CARTAS_VALORES[str(carta_01.numero)] < CARTAS_VALORES[str(carta_02.numero)]:
-                return carta_01
-
-            else:
-                return carta_02
-
-        return carta_01
+        return carta_02
 
     
     def retornar_pontos_carta(self, carta):
         """Retorna a pontuação equivalente de determinada carta."""
-        if (str(carta.numero)+" de "+carta.naipe) in MANILHA:
-            return MANILHA[str(carta.numero)+" de "+carta.naipe]
-
-        else:
-            return CARTAS_VALORES[str(carta.numero)]
+        return forca_carta(carta)
 
 
     def classificar_carta(self, cartas):
         """Método para classificar as cartas por ranks (alto, médio, baixo) e retorna a pontuação individual de cada carta."""
+        from .maos import avaliar_mao
+        avaliacao = avaliar_mao(cartas)
+        if (avaliacao is not None):
+            return avaliacao.pontos, avaliacao.classificacao
+
         carta_alta = self.verificar_carta_alta(self.verificar_carta_alta(cartas[0], cartas[1]), cartas[2])
         carta_baixa = self.verificar_carta_baixa(self.verificar_carta_baixa(cartas[0], cartas[1]), cartas[2])
+        # Três cartas de mesmo valor: sem desempate a mão ficaria sem carta 'Alta'
+        if (carta_alta == carta_baixa):
+            carta_alta = cartas[0]
+
         lista_classificacao = ['', '', '']
         lista_pontos = ['', '', '']
         
@@ -99,6 +137,10 @@ class Carta():
 
     def retornar_pontos_envido(self, carta):
         """Retorna os pontos do envido para determinada carta, de acordo com a codificação."""
+        codigo = _CODIGOS.get((carta.numero, carta.naipe))
+        if (codigo is not None):
+            return ENVIDO_CARTA[codigo]
+
         return ENVIDO[str(carta.retornar_numero())]
 
 
@@ -113,18 +155,13 @@ class Carta():
 
 
     def retornar_naipe_codificado(self):
-        naipe = self.naipe 
-        if (naipe == 'ESPADAS'):
-            return 1
+        """Retorna o naipe codificado (1 a 4) de determinada carta, ou None caso o naipe seja desconhecido."""
+        return NAIPES_CODIFICADOS.get(self.naipe)
 
-        elif (naipe == 'OUROS'):
-            return 2
 
-        elif (naipe == 'BASTOS'):
-            return 3
-            
-        elif (naipe == 'COPAS'):
-            return 4
+    def retornar_codigo(self):
+        """Retorna o código compacto (0 a 39) da carta, ou None caso ela não pertença ao baralho."""
+        return _CODIGOS.get((self.numero, self.naipe))
     
     # Codificação exemplo
     # df.replace('ESPADAS', '1', inplace=True)
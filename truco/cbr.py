@@ -1,16 +1,243 @@
 from sklearn.neighbors import NearestNeighbors
+import atexit
+import copy
+import numpy as np
+import os
 import pandas as pd
-import warnings
+import pickle
+import platform
+import sklearn
+import weakref
 from pathlib import Path
+from .busca import BUSCAS, BUSCAS_APROXIMADAS, BuscaBruta, BuscaBrutaBlocos, BuscaIVF, calibrar
+from .cache import CacheLRU
+from .compacta import LayoutCompacto, economia_memoria
 from .dados import Dados
+from .retencao import BaseIncremental
+from .votos import (PARTICOES, SEM_VOTOS, Vizinhanca, mascara_envido_ganho, mascara_envido_perdido, mascara_jogadas_vencidas, mascara_truco_ganho, mascara_truco_perdido,
+                    votar_envido, votar_envido_lote, votar_jogada, votar_jogada_lote, votar_truco, votar_truco_lote)
+
+# Motor de busca dos vizinhos: um dos nomes em BUSCAS ou BUSCAS_APROXIMADAS, ou 'auto', que mede todos na base carregada e usa o mais rápido.
+# Os motores desempatam vizinhos à mesma distância de formas diferentes, então 'auto' pode mudar as decisões conforme a máquina;
+# o padrão é fixo (o ball_tree usado originalmente) e a calibração é opcional, por Cbr(busca='auto')
+BUSCA_PADRAO = 'ball_tree'
+
+# Busca aproximada 'ivf': número de listas do k-means (None usa a raiz do número de casos) e listas sondadas por consulta.
+# Mais sondas aumentam a revocação e o tempo de consulta; veja python -m truco.avaliacao para as medições nas bases do projeto.
+IVF_LISTAS = None
+IVF_SONDAS = 8
+
+# Índice de vizinhos já ajustado, salvo ao lado do CSV e reaproveitado enquanto o CSV e as versões das bibliotecas não mudarem.
+# O índice (e as decisões persistidas) são arquivos pickle: carregá-los executa código, então só devem ser lidos de um diretório confiável
+INDICE_PERSISTIDO = True
+VERSAO_INDICE = 1
+
+# Armazenamento compacto da base (python -m truco.compacta mede a economia): matriz C-contígua no tipo mais estreito que comporta
+# todas as colunas, com as colunas deslocadas pelo layout; os motores de busca usam a matriz compacta e as consultas deslocadas
+BASE_COMPACTA = False
+
+# Casos retidos durante a sessão ficam em um buffer buscado por força bruta até atingirem este limite e serem compactados no índice
+LIMITE_COMPACTACAO = 256
+
+# Índice de estados exatos: decisão final por (método, argumentos, vetor do registro), limitado por LRU e, opcionalmente,
+# salvo ao lado do CSV para que o próximo processo já comece com as decisões repetidas resolvidas
+CAPACIDADE_DECISOES = 65536
+DECISOES_PERSISTIDAS = False
+
+# Cbr cujas decisões são salvas ao encerrar o processo: um por arquivo de decisões (o mais recente), guardado por referência
+# fraca para que o registro não mantenha vivos a base, os índices e o LRU de cada Cbr criado
+_DECISOES_PENDENTES = weakref.WeakValueDictionary()
+
+
+def _salvar_decisoes_pendentes():
+    """Salva as decisões dos Cbr ainda vivos registrados em _DECISOES_PENDENTES (executado ao encerrar o processo)."""
+    for cbr in list(_DECISOES_PENDENTES.values()):
+        cbr.salvar_decisoes()
+
+
+atexit.register(_salvar_decisoes_pendentes)
+
+# Colunas relevantes para cada tipo de decisão, usadas pelos índices projetados (Cbr(projecoes=True)).
+# As do truco seguem o subconjunto colunas_truco da análise em cbr.py; a jogada de carta tem um índice por rodada do bot.
+COLUNAS_MAO_ROBO = ['jogadorMao', 'cartaAltaRobo', 'cartaMediaRobo', 'cartaBaixaRobo', 'naipeCartaAltaRobo', 'naipeCartaMediaRobo', 'naipeCartaBaixaRobo']
+COLUNAS_DECISAO = {
+    'truco': COLUNAS_MAO_ROBO + ['ganhadorPrimeiraRodada', 'ganhadorSegundaRodada', 'ganhadorTerceiraRodada', 'quemFlor', 'quemContraFlor', 'pontosFlorRobo', 'pontosFlorHumano', 'quemTruco', 'qualidadeMaoRobo'],
+    'envido': COLUNAS_MAO_ROBO + ['pontosEnvidoRobo', 'quemPediuEnvido', 'quemPediuRealEnvido', 'quemPediuFaltaEnvido', 'quemEnvidoEnvido', 'quemFlor'],
+    'flor': COLUNAS_MAO_ROBO + ['pontosFlorRobo', 'quemFlor', 'quemContraFlor', 'quemContraFlorResto'],
+    'jogada_1': COLUNAS_MAO_ROBO + ['primeiraCartaHumano', 'naipePrimeiraCartaHumano'],
+    'jogada_2': COLUNAS_MAO_ROBO + ['primeiraCartaHumano', 'naipePrimeiraCartaHumano', 'primeiraCartaRobo', 'ganhadorPrimeiraRodada', 'segundaCartaHumano', 'naipeSegundaCartaHumano'],
+    'jogada_3': COLUNAS_MAO_ROBO + ['primeiraCartaHumano', 'naipePrimeiraCartaHumano', 'primeiraCartaRobo', 'ganhadorPrimeiraRodada', 'segundaCartaHumano', 'naipeSegundaCartaHumano',
+                                    'segundaCartaRobo', 'ganhadorSegundaRodada', 'terceiraCartaHumano', 'naipeTerceiraCartaHumano'],
+}
+
+
+def decidir_jogada(votos, rodada, pontuacao_cartas):
+    """Considera as jogadas em que o bot saiu vitorioso e retorna a pontuação mais próxima a ser jogada em determinada rodada."""
+    valor_referencia = votos.referencias[rodada]
+    if (valor_referencia <= 0):
+        return -1
+
+    carta_escolhida = min(pontuacao_cartas, key=lambda x:abs(x-valor_referencia))
+    # print(pontuacao_cartas)
+    # print(carta_escolhida)
+    # return carta_escolhida
+    return pontuacao_cartas.index(int(carta_escolhida))
+
+
+def decidir_truco(votos, tipo, quem_pediu, qualidade_mao_bot):
+    """Considera o pedido de truco e retorna a melhor opção entre aceitar, aumentar ou fugir."""
+    vencidas, perdidas, qualidade_mao_humana = votos.vencidas, votos.perdidas, votos.qualidade_mao_humana
+
+    # Sem vizinhos com truco ganho não há evidência para aceitar ou pedir: resposta conservadora
+    if (vencidas == SEM_VOTOS):
+        return 0
+
+    if (vencidas > perdidas and qualidade_mao_bot > qualidade_mao_humana):
+        return 2
+
+    elif (qualidade_mao_bot > qualidade_mao_humana):
+        return 1
+
+    else:
+        return 0
+
+
+def decidir_envido(votos, tipo, quem_pediu, pontos_envido_robo, robo_perdendo=None):
+    """Considera o pedido de envido e retorna a melhor opção entre aceitar, pedir real envido, falta envido ou fugir."""
+    envido_ganhas, envido_perdidas = votos.envido_ganhas, votos.envido_perdidas
+    real_envido_ganhas, real_envido_perdidas = votos.real_envido_ganhas, votos.real_envido_perdidas
+    falta_envido_ganhas, falta_envido_perdidas = votos.falta_envido_ganhas, votos.falta_envido_perdidas
+    pontos_jogador = votos.pontos_jogador
+
+    # Sem vizinhos com envido ganho não há evidência para aceitar ou pedir: resposta conservadora
+    if (envido_ganhas == SEM_VOTOS):
+        return 0
+
+    # Condição especial quando o robô considera pedir o envido na primeira jogada
+    if (quem_pediu == 2 and pontos_envido_robo > 5):
+        if (pontos_jogador < pontos_envido_robo and real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas):
+            if (robo_perdendo):
+                return 8
+
+            return 7
+
+        elif (envido_ganhas > envido_perdidas or envido_ganhas < envido_perdidas):
+            if (robo_perdendo):
+                return 8
+
+            return 6
+
+    if (tipo == 6):
+        if (pontos_jogador < pontos_envido_robo and real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas):
+            return 2
+
+        elif (real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas and robo_perdendo):
+            return 3
+
+        elif (envido_ganhas > envido_perdidas or envido_ganhas < envido_perdidas):
+            return 1
+
+        else:
+            return 0
+
+    elif (tipo == 7):
+        if ((pontos_jogador < pontos_envido_robo) or (envido_ganhas > envido_perdidas and real_envido_ganhas > real_envido_perdidas)):
+            return 1
+
+        else:
+            return 0
+
+    else:
+        if ((pontos_jogador < pontos_envido_robo) or falta_envido_ganhas > falta_envido_perdidas and pontos_jogador < pontos_envido_robo):
+            return 1
+
+        else:
+            return 0
+
+
+def decidir_contraflor(votos, estado, pontos_flor_robo):
+    """Considera o pedido de contraflor e retorna 1 para aceitar ou 0 para recusar. A contraflor e resto, que decide a partida,
+    só é aceita quando os vizinhos favorecem o bot e os seus pontos de flor superam os mais comuns do adversário."""
+    # Sem vizinhos em que a flor foi disputada não há evidência a favor do bot: resposta conservadora
+    if (votos.ganhas == 0 and votos.perdidas == 0):
+        return 0
+
+    favoravel = votos.ganhas > votos.perdidas
+    pontos_maiores = pontos_flor_robo > votos.pontos_jogador
+    if (estado == 'Contraflor e Resto'):
+        return int(favoravel and pontos_maiores)
+
+    return int(favoravel or pontos_maiores)
+
+
+# Decisões atendidas pelo Cbr, com a função que decide a partir dos votos (as três primeiras também por decidir_lote)
+DECISOES = {'jogar_carta': decidir_jogada, 'truco': decidir_truco, 'envido': decidir_envido, 'contraflor': decidir_contraflor}
+
+
+def chave_decisao(decisao, argumentos, consulta):
+    """Chave do índice de estados exatos: método de decisão, argumentos (listas viram tuplas) e bytes do vetor do registro."""
+    return (decisao, tuple(tuple(argumento) if isinstance(argumento, list) else argumento for argumento in argumentos), consulta.tobytes())
+
+
+def decisao_votos(decisao, argumentos):
+    """Retorna a decisão cujos votos são usados por um método de decisão ('truco', 'envido', 'flor' ou 'jogada_<rodada>')."""
+    if (decisao == 'jogar_carta'):
+        return f'jogada_{argumentos[0]}'
+
+    if (decisao == 'contraflor'):
+        return 'flor'
+
+    return decisao
+
 
 class Cbr():
-    def __init__(self):
+    def __init__(self, capacidade_cache=1024, busca=None, projecoes=False, particoes=False, sondas=None, compacta=None):
         self.indice = 0
         self.dados = Dados()
         self.dataset = self.dados.retornar_casos()
         # self.dados = self.retornarSimilares()
-        self.nbrs = self.vizinhos_proximos()
+        self.compacta = BASE_COMPACTA if compacta is None else compacta
+        if (self.compacta):
+            self.matriz, self.layout = self.dados.casos_compactos()
+        else:
+            self.matriz, self.layout = self.dataset.to_numpy(), None
+
+        self.colunas = {coluna: i for i, coluna in enumerate(self.dataset.columns)}
+        self.origem = self.dados.origem_casos()
+        # Multiplicidade dos casos de uma base condensada (None quando cada linha vale um caso)
+        self.pesos = self.dados.pesos_casos()
+        self.tempos_busca = {}
+        self.busca_configurada = self.busca = busca or BUSCA_PADRAO
+        self.sondas = sondas or IVF_SONDAS
+        self.nbrs = self.carregar_indice() if INDICE_PERSISTIDO else None
+        if (self.nbrs is None):
+            if (self.busca == 'auto'):
+                self.nbrs = self.calibrar_busca()
+            else:
+                self.nbrs = self.criar_busca(self.busca)
+
+            if (INDICE_PERSISTIDO):
+                self.salvar_indice()
+
+        if (isinstance(self.nbrs, BuscaIVF)):
+            self.nbrs.n_sondas = self.sondas
+
+        self.cache = CacheLRU(capacidade_cache)
+        self.decisoes = CacheLRU(CAPACIDADE_DECISOES)
+        # Índices projetados por decisão, construídos apenas quando a decisão é pedida pela primeira vez
+        self.projecoes = projecoes
+        self.indices_decisao = {}
+        # Índices por partição de resultado (PARTICOES), para buscar k casos já filtrados em vez de filtrar os vizinhos
+        self.particoes = particoes
+        self.indices_particao = {}
+        # Retenção online: os índices projetados e por partição passam a incluir os casos retidos após cada compactação
+        self.retencao = BaseIncremental(self.matriz, self.nbrs, self.motor_compactado, LIMITE_COMPACTACAO)
+        self.versao_base = 0
+        if (DECISOES_PERSISTIDAS):
+            self.carregar_decisoes()
+            caminho = self.caminho_decisoes()
+            if (caminho is not None):
+                _DECISOES_PENDENTES[caminho] = self
 
 
     def carregar_dataset(self):
@@ -41,117 +268,476 @@ class Cbr():
         return df
 
 
-    def vizinhos_proximos(self, df=None):
+    def vizinhos_proximos(self, df=None, algoritmo='ball_tree'):
         """Cálculo dos 100 Nearest Neighbors."""
+        # O ajuste é feito sobre a matriz, sem nomes de colunas, pois as consultas usam o vetor do registro diretamente
         if (df is None):
-            return NearestNeighbors(n_neighbors=100, algorithm='ball_tree').fit(self.dataset)
+            df = self.dataset
 
-        return NearestNeighbors(n_neighbors=100, algorithm='ball_tree').fit(df)
+        return NearestNeighbors(n_neighbors=min(100, len(df)), algorithm=algoritmo).fit(df.to_numpy())
 
 
-    def jogar_carta(self, rodada, pontuacao_cartas):
-        """Método que considera as jogadas em que o bot saiu vitorioso e retorna a pontuação mais próxima a ser jogada em determinada rodada."""
-        registro = self.dados.retornar_registro()
-        warnings.simplefilter(action='ignore', category=UserWarning)
-        distancias, indices = self.nbrs.kneighbors((registro.to_numpy().reshape(1, -1)))
-        jogadas_vencidas = self.dataset.iloc[indices.tolist()[0]]
-        jogadas_vencidas = jogadas_vencidas[(((jogadas_vencidas.ganhadorPrimeiraRodada == 2) & ((jogadas_vencidas.ganhadorSegundaRodada == 2)) | (jogadas_vencidas.ganhadorPrimeiraRodada == 2)) & (jogadas_vencidas.ganhadorTerceiraRodada == 2) | ((jogadas_vencidas.ganhadorSegundaRodada == 2) & (jogadas_vencidas.ganhadorTerceiraRodada == 2)))]
-        ordem_carta_jogada = 'CartaRobo'
-        if ((rodada) == 3): ordem_carta_jogada = 'primeira' + ordem_carta_jogada
-        elif ((rodada) == 2): ordem_carta_jogada = 'segunda' + ordem_carta_jogada
-        elif ((rodada) == 1): ordem_carta_jogada = 'terceira' + ordem_carta_jogada
-
-        valor_referencia = jogadas_vencidas[ordem_carta_jogada].value_counts().index.to_list()[0]
-        if (valor_referencia <= 0):
-            return -1
-
-        carta_escolhida = min(pontuacao_cartas, key=lambda x:abs(x-valor_referencia))
-        # print(jogadas_vencidas[ordem_carta_jogada].value_counts())
-        # print(pontuacao_cartas)
-        # print(carta_escolhida)
-        # return carta_escolhida
-        return pontuacao_cartas.index(int(carta_escolhida))
+    def criar_busca(self, nome, posicoes=None, linhas=None, matriz=None):
+        """Cria o motor de busca dos vizinhos sobre a base de casos carregada, opcionalmente restrita a algumas linhas e colunas."""
+        if (matriz is None):
+            matriz = self.matriz
 
-    def truco(self, tipo, quem_pediu, qualidade_mao_bot):
-        """Método que considera o pedido de truco e retorna a melhor opção entre aceitar, aumentar ou fugir."""
-        registro = self.dados.retornar_registro()
-        warnings.simplefilter(action='ignore', category=UserWarning)
-        distancias, indices = self.nbrs.kneighbors((registro.to_numpy().reshape(1, -1)))
-        jogadas = perdidas = self.dataset.iloc[indices.tolist()[0]]
-        jogadas = jogadas[(jogadas.quemGanhouTruco == 2)]
-        perdidas = perdidas[(perdidas.quemGanhouTruco == 1)]
+        if (posicoes is None):
+            posicoes = slice(None)
 
-        vencidas = jogadas['quemGanhouTruco'].value_counts().index.to_list()[0]
-        perdidas = perdidas['quemGanhouTruco'].value_counts().index.to_list()[0]
-        retruco = jogadas['quemRetruco'].value_counts().index.to_list()[0]
-        qualidade_mao_humana = jogadas['qualidadeMaoHumano'].dropna().value_counts().index.to_list()[0]
+        if (linhas is None):
+            linhas = slice(None)
 
+        if (nome in ('ball_tree', 'kd_tree')):
+            return self.vizinhos_proximos(pd.DataFrame(matriz[linhas][:, posicoes], copy=False), algoritmo=nome)
 
-        if (vencidas > perdidas and qualidade_mao_bot > qualidade_mao_humana):
-            return 2
+        elif (nome == 'bruta'):
+            return BuscaBruta(matriz[linhas][:, posicoes], 100)
 
-        elif (qualidade_mao_bot > qualidade_mao_humana):
-            return 1
+        elif (nome == 'blocos'):
+            return BuscaBrutaBlocos(matriz[linhas][:, posicoes], 100)
 
-        else:
-            return 0
+        elif (nome == 'ivf'):
+            return BuscaIVF(matriz[linhas][:, posicoes], 100, IVF_LISTAS, self.sondas)
 
+        raise ValueError(f"Motor de busca desconhecido: {nome}. Opções: auto, {', '.join(BUSCAS + BUSCAS_APROXIMADAS)}")
 
-    def envido(self, tipo, quem_pediu, pontos_envido_robo, robo_perdendo=None):
-        """Método que considera o pedido de envido e retorna a melhor opção entre aceitar, pedir real envido, falta envido ou fugir."""
-        registro = self.dados.retornar_registro()
-        warnings.simplefilter(action='ignore', category=UserWarning)
-        distancias, indices = self.nbrs.kneighbors((registro.to_numpy().reshape(1, -1)))
-        jogadas = self.dataset.iloc[indices.tolist()[0]]
-        ganhas = jogadas[((jogadas.pontosEnvidoRobo > jogadas.pontosEnvidoHumano) | (jogadas.quemGanhouEnvido == 2))]
-        perdidas = jogadas[((jogadas.pontosEnvidoRobo < jogadas.pontosEnvidoHumano) | (jogadas.quemGanhouEnvido == 1))]
-        # 'quemPediuEnvido', 'quemPediuFaltaEnvido', 'quemPediuRealEnvido', 'pontosEnvidoRobo', 'pontosEnvidoHumano', 'quemNegouEnvido', 'quemGanhouEnvido', 'quemEscondeuPontosEnvido'
-        # print(jogadas)
-        envido_ganhas = ganhas['quemGanhouEnvido'].value_counts().index.to_list()[0]
-        envido_perdidas = perdidas['quemGanhouEnvido'].value_counts().index.to_list()[0]
-        real_envido_ganhas = ganhas['quemPediuRealEnvido'].value_counts().index.to_list()[0]
-        real_envido_perdidas = perdidas['quemPediuFaltaEnvido'].value_counts().index.to_list()[0]
-        falta_envido_ganhas = ganhas['quemPediuFaltaEnvido'].value_counts().index.to_list()[0]
-        falta_envido_perdidas = perdidas['quemPediuFaltaEnvido'].value_counts().index.to_list()[0]
-        pontos_jogador = ganhas['pontosEnvidoHumano'].value_counts().index.to_list()[0]
-
-        # Condição especial quando o robô considera pedir o envido na primeira jogada
-        if (quem_pediu == 2 and pontos_envido_robo > 5):
-            if (pontos_jogador < pontos_envido_robo and real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas):
-                if (robo_perdendo):
-                    return 8
-
-                return 7
-
-            elif (envido_ganhas > envido_perdidas or envido_ganhas < envido_perdidas):
-                if (robo_perdendo):
-                    return 8
-
-                return 6
-
-        if (tipo == 6):
-            if (pontos_jogador < pontos_envido_robo and real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas):
-                return 2
-
-            elif (real_envido_ganhas > real_envido_perdidas and envido_ganhas > envido_perdidas and robo_perdendo):
-                return 3
-
-            elif (envido_ganhas > envido_perdidas or envido_ganhas < envido_perdidas):
-                return 1
+
+    def calibrar_busca(self, consultas=16):
+        """Mede o tempo de consulta de cada motor na base carregada e retorna o mais rápido, registrando a escolha e os tempos."""
+        motores = {nome: self.criar_busca(nome) for nome in BUSCAS}
+        posicoes = np.linspace(0, len(self.matriz) - 1, min(consultas, len(self.matriz))).astype(int)
+        self.busca, self.tempos_busca = calibrar(motores, self.matriz[posicoes])
+        return motores[self.busca]
+
+
+    def caminho_indice(self):
+        """Retorna o caminho do índice persistido para o motor de busca configurado, ao lado do CSV da base (com ou sem o cache
+        binário), ou None se a base não veio de um CSV."""
+        if (self.origem is None):
+            return None
+
+        sufixo = '-compacta' if self.compacta else ''
+        return Path(self.origem['caminho']).with_suffix(f'.indice-{self.busca_configurada}{sufixo}.pkl')
+
+
+    def metadados_indice(self):
+        """Metadados que precisam coincidir para que o índice persistido seja reaproveitado."""
+        return {'versao': VERSAO_INDICE, 'hash': self.origem['hash'], 'colunas': list(self.colunas), 'busca': self.busca_configurada, 'ivf_listas': IVF_LISTAS,
+                'compacta': None if self.layout is None else self.layout.deslocamentos.tolist(), 'python': platform.python_version(), 'numpy': np.__version__, 'sklearn': sklearn.__version__}
+
+
+    def carregar_indice(self):
+        """Carrega o índice persistido sem ajustá-lo novamente, ou retorna None caso ele não exista ou esteja desatualizado.
+        Os metadados apenas detectam índices desatualizados: o pickle ao lado do CSV é carregado sem outra verificação e precisa ser confiável."""
+        caminho = self.caminho_indice()
+        if (caminho is None):
+            return None
+
+        try:
+            with open(caminho, 'rb') as arquivo:
+                artefato = pickle.load(arquivo)
+
+            if (artefato['metadados'] != self.metadados_indice()):
+                return None
+
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+            return None
+
+        self.busca, self.tempos_busca = artefato['busca'], artefato['tempos']
+        return artefato['motor']
+
+
+    def salvar_indice(self):
+        """Salva o índice ajustado, o motor escolhido e os metadados, com troca atômica do arquivo."""
+        caminho = self.caminho_indice()
+        if (caminho is None):
+            return False
+
+        artefato = {'metadados': self.metadados_indice(), 'busca': self.busca, 'tempos': self.tempos_busca, 'motor': self.nbrs}
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        try:
+            with open(temporario, 'wb') as arquivo:
+                pickle.dump(artefato, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temporario, caminho)
+        except (OSError, pickle.PicklingError):
+            return False
+
+        return True
+
+
+    def motor_compactado(self, matriz):
+        """Constrói o motor de busca escolhido sobre a base compactada com os casos retidos (executado em segundo plano)."""
+        return self.criar_busca(self.busca, matriz=matriz)
+
+
+    def reter_caso(self, valores=None):
+        """Retém um caso na base em uso (por padrão, o registro atual), sem reajustar o índice; retorna os casos ainda no buffer."""
+        if (valores is None):
+            valores = self.dados.retornar_registro().valores
+
+        pendentes = self.retencao.adicionar(self.layout.codificar(valores) if self.compacta else np.array(valores, dtype=self.matriz.dtype))
+        self.limpar_caches()
+        return pendentes
+
+
+    def sincronizar_base(self):
+        """Passa a usar o índice compactado mais recente, descartando os índices derivados e os vizinhos calculados na base anterior."""
+        estado = self.retencao.estado
+        if (estado.versao != self.versao_base):
+            self.matriz, self.nbrs, self.versao_base = estado.matriz, estado.motor, estado.versao
+            self.indices_decisao = {}
+            self.indices_particao = {}
+            self.limpar_caches()
+
+
+    def codificar(self, consultas):
+        """Leva as consultas ao espaço da matriz usada pelos motores de busca (deslocadas, no armazenamento compacto)."""
+        return consultas if self.layout is None else self.layout.codificar_consulta(consultas)
+
+
+    def decodificar(self, casos):
+        """Volta casos da matriz usada pelos motores de busca aos valores originais, lidos pelos votos."""
+        return casos if self.layout is None else self.layout.decodificar(casos)
+
+
+    def memoria_base(self):
+        """Relatório da memória da base de casos em uso em relação à base em int16."""
+        layout = self.layout or LayoutCompacto(np.zeros(self.matriz.shape[1]), [self.matriz.dtype] * self.matriz.shape[1])
+        return economia_memoria(self.matriz, layout)
+
+
+    def definir_sondas(self, sondas):
+        """Ajusta o número de listas sondadas pelos motores 'ivf' já construídos, trocando exatidão por tempo de consulta."""
+        self.sondas = sondas
+        motores = [self.nbrs, self.retencao.estado.motor] + [motor for motor, posicoes in self.indices_decisao.values()]
+        motores += [motor for motor, linhas, posicoes in self.indices_particao.values()]
+        for motor in motores:
+            if (isinstance(motor, BuscaIVF)):
+                motor.n_sondas = sondas
+
+        self.limpar_caches()
+
+
+    def compartilhado(self):
+        """Cbr para o outro assento de uma mesma partida: usa a base, os índices e as decisões memorizadas deste, com um registro
+        (Dados) próprio, já que cada bot enriquece o registro do seu ponto de vista."""
+        outro = copy.copy(self)
+        outro.dados = Dados()
+        return outro
+
+
+    def limpar_caches(self):
+        """Descarta os vizinhos e as decisões memorizados, que deixam de valer quando a base ou a busca mudam."""
+        self.cache.limpar()
+        self.decisoes.limpar()
+
+
+    def caminho_decisoes(self):
+        """Retorna o caminho do índice de estados exatos persistido, ou None se a base não veio de um CSV."""
+        caminho = self.caminho_indice()
+        return None if caminho is None else caminho.with_name(caminho.name.replace('.indice-', '.decisoes-'))
+
+
+    def metadados_decisoes(self):
+        """Metadados que precisam coincidir para reaproveitar as decisões persistidas: os do índice e a configuração da recuperação."""
+        metadados = self.metadados_indice()
+        metadados.update({'busca_escolhida': self.busca, 'projecoes': self.projecoes, 'particoes': self.particoes, 'sondas': self.sondas})
+        return metadados
+
+
+    def carregar_decisoes(self):
+        """Preenche o índice de estados exatos com as decisões persistidas, caso existam e estejam atualizadas (o pickle precisa ser confiável,
+        como o do índice)."""
+        caminho = self.caminho_decisoes()
+        if (caminho is None):
+            return False
+
+        try:
+            with open(caminho, 'rb') as arquivo:
+                artefato = pickle.load(arquivo)
+
+            if (artefato['metadados'] != self.metadados_decisoes()):
+                return False
+
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+            return False
+
+        for chave, decisao in artefato['decisoes']:
+            self.decisoes.adicionar(chave, decisao)
+
+        return True
+
+
+    def salvar_decisoes(self):
+        """Salva o índice de estados exatos com troca atômica do arquivo; decisões que dependem de casos retidos não são salvas."""
+        caminho = self.caminho_decisoes()
+        if (caminho is None or self.retencao.estado.versao > 0 or self.retencao.pendentes() > 0):
+            return False
+
+        artefato = {'metadados': self.metadados_decisoes(), 'decisoes': list(self.decisoes.itens.items())}
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        try:
+            with open(temporario, 'wb') as arquivo:
+                pickle.dump(artefato, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temporario, caminho)
+        except (OSError, pickle.PicklingError):
+            return False
+
+        return True
+
+
+    def posicoes_decisao(self, decisao):
+        """Retorna as posições das colunas relevantes para a decisão."""
+        return np.array([self.colunas[coluna] for coluna in dict.fromkeys(COLUNAS_DECISAO[decisao]) if coluna in self.colunas])
+
+
+    def indice_decisao(self, decisao):
+        """Retorna o motor de busca projetado nas colunas da decisão e as posições dessas colunas, construindo-o na primeira chamada."""
+        if (decisao not in self.indices_decisao):
+            posicoes = self.posicoes_decisao(decisao)
+            self.indices_decisao[decisao] = (self.criar_busca(self.busca, posicoes), posicoes)
+
+        return self.indices_decisao[decisao]
+
+
+    def indice_particao(self, particao, decisao=None):
+        """Retorna o motor de busca da partição, as linhas da base que a compõem e as colunas usadas, construindo-o na primeira chamada."""
+        chave = (particao, decisao if self.projecoes else None)
+        if (chave not in self.indices_particao):
+            linhas = np.flatnonzero(PARTICOES[particao](self.decodificar(self.matriz), self.colunas))
+            posicoes = self.posicoes_decisao(decisao) if (self.projecoes and decisao is not None) else None
+            motor = self.criar_busca(self.busca, posicoes, linhas) if len(linhas) else None
+            self.indices_particao[chave] = (motor, linhas, posicoes)
+
+        return self.indices_particao[chave]
+
+
+    def casos_particao(self, particao, decisao=None):
+        """Retorna os k casos da partição mais próximos do registro atual."""
+        motor, linhas, posicoes = self.indice_particao(particao, decisao)
+        if (motor is None):
+            return self.decodificar(self.matriz[linhas])
+
+        consulta = self.codificar(self.dados.retornar_registro().valores)
+        if (posicoes is not None):
+            consulta = consulta[posicoes]
+
+        distancias, indices = motor.kneighbors(consulta.reshape(1, -1))
+        indices = linhas[np.asarray(indices)[0]]
+        return self.decodificar(self.expandir(indices, self.matriz[indices])[1])
+
+
+    def votos_particionados(self, decisao):
+        """Calcula os votos da decisão buscando diretamente nas partições da base, reaproveitando o resultado para o mesmo estado."""
+        chave = ('particoes', decisao, self.dados.retornar_registro().valores.tobytes())
+        votos = self.cache.obter(chave)
+        if (votos is None):
+            if (decisao == 'truco'):
+                votos = votar_truco(self.casos_particao('truco_ganho', decisao), self.casos_particao('truco_perdido', decisao), self.colunas)
+
+            elif (decisao == 'envido'):
+                votos = votar_envido(self.casos_particao('envido_ganho', decisao), self.casos_particao('envido_perdido', decisao), self.colunas)
 
             else:
-                return 0
+                votos = votar_jogada(self.casos_particao('jogadas_vencidas', decisao), self.colunas)
+
+            self.cache.adicionar(chave, votos)
+
+        return votos
+
+
+    def obter_votos(self, decisao):
+        """Retorna os votos da decisão ('truco', 'envido', 'flor' ou 'jogada_<rodada>'), pela vizinhança filtrada ou pelas partições."""
+        self.sincronizar_base()
+        # A flor, rara na base, não tem partições próprias: os votos vêm sempre da vizinhança
+        if (self.particoes and decisao != 'flor'):
+            return self.votos_particionados(decisao)
+
+        vizinhanca = self.recuperar_vizinhos(decisao)
+        if (decisao == 'truco'):
+            return vizinhanca.votos_truco()
+
+        elif (decisao == 'envido'):
+            return vizinhanca.votos_envido()
 
-        elif (tipo == 7):
-            if ((pontos_jogador < pontos_envido_robo) or (envido_ganhas > envido_perdidas and real_envido_ganhas > real_envido_perdidas)):
-                return 1
+        elif (decisao == 'flor'):
+            return vizinhanca.votos_flor()
 
+        return vizinhanca.votos_jogada()
+
+
+    def expandir(self, indices, casos):
+        """Repete cada vizinho pela sua multiplicidade na base condensada, mantendo os k primeiros, para que os votos contem
+        os casos como na base original; sem pesos (ou para casos retidos na sessão) cada vizinho vale um caso."""
+        if (self.pesos is None):
+            return indices, casos
+
+        pesos = np.ones(len(indices), dtype=np.int64)
+        originais = indices < len(self.pesos)
+        pesos[originais] = self.pesos[indices[originais]]
+        repetidos = np.repeat(np.arange(len(indices)), pesos)[:100]
+        return indices[repetidos], casos[repetidos]
+
+
+    def recuperar_vizinhos(self, decisao=None):
+        """Recupera os casos vizinhos do registro atual, reaproveitando a consulta anterior caso o estado do jogo não tenha mudado."""
+        self.sincronizar_base()
+        registro = self.dados.retornar_registro()
+        consulta = self.codificar(registro.valores)
+        projetada = self.projecoes and decisao is not None
+        if (projetada):
+            nbrs, posicoes = self.indice_decisao(decisao)
+            consulta = consulta[posicoes]
+
+        chave = (decisao if self.projecoes else None, consulta.tobytes())
+        vizinhos = self.cache.obter(chave)
+        if (vizinhos is None):
+            if (projetada):
+                distancias, indices = nbrs.kneighbors(consulta.reshape(1, -1))
+                indices = np.asarray(indices)[0]
+                casos = self.matriz[indices]
             else:
-                return 0
+                indices, casos = self.retencao.vizinhos(consulta)
+
+            indices, casos = self.expandir(indices, casos)
+            vizinhos = Vizinhanca(indices, self.decodificar(casos), self.colunas)
+            self.cache.adicionar(chave, vizinhos)
 
+        return vizinhos
+
+
+    def vizinhos_lote(self, consultas, decisao=None):
+        """Recupera os casos vizinhos (lote, k, colunas) de várias consultas com uma única busca."""
+        consultas = self.codificar(consultas)
+        if (self.projecoes and decisao is not None):
+            nbrs, posicoes = self.indice_decisao(decisao)
+            distancias, indices = nbrs.kneighbors(consultas[:, posicoes])
+            indices = np.asarray(indices)
+            casos = self.matriz[indices]
         else:
-            if ((pontos_jogador < pontos_envido_robo) or falta_envido_ganhas > falta_envido_perdidas and pontos_jogador < pontos_envido_robo):
-                return 1
+            indices, casos = self.retencao.vizinhos_lote(consultas)
 
-            else:
-                return 0
+        if (self.pesos is None):
+            return self.decodificar(casos)
+
+        return self.decodificar(np.array([self.expandir(linha, casos_linha)[1] for linha, casos_linha in zip(indices, casos)]))
+
+
+    def casos_particao_lote(self, particao, decisao, consultas):
+        """Retorna os k casos da partição mais próximos de cada consulta do lote."""
+        motor, linhas, posicoes = self.indice_particao(particao, decisao)
+        if (motor is None):
+            casos = self.decodificar(self.matriz[linhas])
+            return np.broadcast_to(casos, (len(consultas),) + casos.shape)
+
+        consultas = self.codificar(consultas)
+        if (posicoes is not None):
+            consultas = consultas[:, posicoes]
+
+        distancias, indices = motor.kneighbors(consultas)
+        indices = linhas[np.asarray(indices)]
+        if (self.pesos is None):
+            return self.decodificar(self.matriz[indices])
+
+        return self.decodificar(np.array([self.expandir(linha, self.matriz[linha])[1] for linha in indices]))
+
+
+    def votos_lote(self, decisao, consultas, casos=None):
+        """Calcula os votos de uma decisão para todas as consultas do lote em uma única passada vetorizada."""
+        if (self.particoes):
+            if (decisao == 'truco'):
+                return votar_truco_lote(self.casos_particao_lote('truco_ganho', decisao, consultas), None,
+                                        self.casos_particao_lote('truco_perdido', decisao, consultas), None, self.colunas)
+
+            elif (decisao == 'envido'):
+                return votar_envido_lote(self.casos_particao_lote('envido_ganho', decisao, consultas), None,
+                                         self.casos_particao_lote('envido_perdido', decisao, consultas), None, self.colunas)
+
+            return votar_jogada_lote(self.casos_particao_lote('jogadas_vencidas', decisao, consultas), None, self.colunas)
+
+        if (casos is None):
+            casos = self.vizinhos_lote(consultas, decisao)
+
+        if (decisao == 'truco'):
+            return votar_truco_lote(casos, mascara_truco_ganho(casos, self.colunas), casos, mascara_truco_perdido(casos, self.colunas), self.colunas)
+
+        elif (decisao == 'envido'):
+            return votar_envido_lote(casos, mascara_envido_ganho(casos, self.colunas), casos, mascara_envido_perdido(casos, self.colunas), self.colunas)
+
+        return votar_jogada_lote(casos, mascara_jogadas_vencidas(casos, self.colunas), self.colunas)
+
+
+    def decidir_lote(self, pedidos):
+        """Decide vários pedidos (vetor do registro, método de decisão e argumentos, um por jogo) com uma busca e uma votação por lote.
+        Retorna as decisões na ordem dos pedidos, iguais às de jogar_carta, truco e envido para o mesmo registro."""
+        self.sincronizar_base()
+        if (len(pedidos) == 0):
+            return []
+
+        consultas = np.array([pedido.consulta for pedido in pedidos], dtype=np.int16).reshape(len(pedidos), -1)
+        chaves = [chave_decisao(pedido.decisao, pedido.argumentos, consulta) for pedido, consulta in zip(pedidos, consultas)]
+        resultados = [self.decisoes.obter(chave) for chave in chaves]
+        # Apenas os estados ainda não vistos passam pela busca e pela votação
+        pendentes = [i for i, resultado in enumerate(resultados) if resultado is None]
+        if (len(pendentes) == 0):
+            return resultados
+
+        grupos = {}
+        for i in pendentes:
+            grupos.setdefault(decisao_votos(pedidos[i].decisao, pedidos[i].argumentos), []).append(i)
+
+        # Sem projeções ou partições, todas as decisões usam os mesmos vizinhos: uma única busca para o lote inteiro
+        casos = None if (self.projecoes or self.particoes) else self.vizinhos_lote(consultas[pendentes])
+        posicao = {i: j for j, i in enumerate(pendentes)}
+        for decisao, linhas in grupos.items():
+            casos_grupo = None if casos is None else casos[[posicao[i] for i in linhas]]
+            votos = self.votos_lote(decisao, consultas[linhas], casos_grupo)
+            for i, voto in zip(linhas, votos):
+                resultados[i] = DECISOES[pedidos[i].decisao](voto, *pedidos[i].argumentos)
+                self.decisoes.adicionar(chaves[i], resultados[i])
+
+        return resultados
+
+
+    def estatisticas_cache(self):
+        """Retorna os acertos e falhas do cache de vizinhos."""
+        return self.cache.estatisticas()
+
+
+    def estatisticas_decisoes(self):
+        """Retorna os acertos e falhas do índice de estados exatos."""
+        return self.decisoes.estatisticas()
+
+
+    def decidir(self, decisao, argumentos):
+        """Retorna a decisão para o registro atual pelo índice de estados exatos, recuperando os vizinhos apenas na primeira vez que o estado aparece."""
+        self.sincronizar_base()
+        chave = chave_decisao(decisao, argumentos, self.dados.retornar_registro().valores)
+        resultado = self.decisoes.obter(chave)
+        if (resultado is None):
+            resultado = DECISOES[decisao](self.obter_votos(decisao_votos(decisao, argumentos)), *argumentos)
+            self.decisoes.adicionar(chave, resultado)
+
+        return resultado
+
+
+    def jogar_carta(self, rodada, pontuacao_cartas):
+        """Método que considera as jogadas em que o bot saiu vitorioso e retorna a pontuação mais próxima a ser jogada em determinada rodada."""
+        return self.decidir('jogar_carta', (rodada, pontuacao_cartas))
+
+    def truco(self, tipo, quem_pediu, qualidade_mao_bot):
+        """Método que considera o pedido de truco e retorna a melhor opção entre aceitar, aumentar ou fugir."""
+        return self.decidir('truco', (tipo, quem_pediu, qualidade_mao_bot))
+
+
+    def envido(self, tipo, quem_pediu, pontos_envido_robo, robo_perdendo=None):
+        """Método que considera o pedido de envido e retorna a melhor opção entre aceitar, pedir real envido, falta envido ou fugir."""
+        return self.decidir('envido', (tipo, quem_pediu, pontos_envido_robo, robo_perdendo))
+
+
+    def contraflor(self, estado, pontos_flor_robo):
+        """Método que considera o pedido de contraflor (ou contraflor e resto) e retorna 1 para aceitar ou 0 para recusar."""
+        return self.decidir('contraflor', (estado, pontos_flor_robo))
@@ -0,0 +1,104 @@
+import argparse
+import numpy as np
+from pathlib import Path
+
+# Tipos inteiros candidatos para as colunas da base compacta, do mais estreito ao mais largo
+TIPOS_INTEIROS = (np.int8, np.int16, np.int32)
+
+
+def tipo_minimo(minimo, maximo):
+    """Retorna o tipo inteiro mais estreito que comporta o intervalo [minimo, maximo]."""
+    for tipo in TIPOS_INTEIROS:
+        informacao = np.iinfo(tipo)
+        if (informacao.min <= minimo and maximo <= informacao.max):
+            return np.dtype(tipo)
+
+    return np.dtype(np.int64)
+
+
+class LayoutCompacto():
+    """Layout da base compacta: cada coluna é deslocada por uma constante e todas são guardadas no tipo da coluna mais larga.
+    Deslocar uma coluna não altera as diferenças entre os casos, e portanto as distâncias euclidianas e os vizinhos,
+    desde que as consultas recebam o mesmo deslocamento."""
+    def __init__(self, deslocamentos, tipos):
+        self.deslocamentos = np.array(deslocamentos, dtype=np.int32)
+        self.tipos = [np.dtype(tipo) for tipo in tipos]
+        self.tipo = max(self.tipos, key=lambda tipo: tipo.itemsize) if self.tipos else np.dtype(np.int8)
+
+
+    def codificar(self, valores):
+        """Converte casos (ou um caso) para a matriz compacta, C-contígua; valores fora do intervalo do tipo geram ValueError."""
+        deslocados = np.asarray(valores, dtype=np.int64) - self.deslocamentos
+        informacao = np.iinfo(self.tipo)
+        if (deslocados.size and (deslocados.min() < informacao.min or deslocados.max() > informacao.max)):
+            raise ValueError(f"Caso fora do intervalo do armazenamento compacto ({self.tipo}): {valores}")
+
+        return np.ascontiguousarray(deslocados.astype(self.tipo))
+
+
+    def codificar_consulta(self, consultas):
+        """Aplica o deslocamento às consultas sem estreitar o tipo, pois uma consulta pode ter valores que nenhum caso tem."""
+        return np.asarray(consultas, dtype=np.int32) - self.deslocamentos
+
+
+    def decodificar(self, casos):
+        """Volta casos compactos (em qualquer formato terminado pelas colunas) aos valores originais, em int16."""
+        return (np.asarray(casos, dtype=np.int32) + self.deslocamentos).astype(np.int16)
+
+
+def criar_layout(matriz):
+    """Escolhe o tipo mais estreito de cada coluna. Colunas que só não cabem em int8 por causa de um sentinel
+    (como os -130 da base) são deslocadas para que o sentinel fique no limite do int8."""
+    matriz = np.asarray(matriz)
+    if (len(matriz) == 0):
+        return LayoutCompacto(np.zeros(matriz.shape[1]), [np.int8] * matriz.shape[1])
+
+    deslocamentos, tipos = [], []
+    informacao = np.iinfo(np.int8)
+    for minimo, maximo in zip(matriz.min(axis=0).tolist(), matriz.max(axis=0).tolist()):
+        deslocamento = 0
+        if (tipo_minimo(minimo, maximo) != np.int8 and maximo - minimo <= informacao.max - informacao.min):
+            deslocamento = minimo - informacao.min if minimo < informacao.min else maximo - informacao.max
+
+        deslocamentos.append(deslocamento)
+        tipos.append(tipo_minimo(minimo - deslocamento, maximo - deslocamento))
+
+    return LayoutCompacto(deslocamentos, tipos)
+
+
+def economia_memoria(compacta, layout):
+    """Relatório do armazenamento compacto em relação à base em int16: bytes das duas matrizes, economia e quantidade de colunas por tipo."""
+    colunas_por_tipo = {}
+    for tipo in layout.tipos:
+        colunas_por_tipo[str(tipo)] = colunas_por_tipo.get(str(tipo), 0) + 1
+
+    bytes_originais = compacta.size * np.dtype(np.int16).itemsize
+    return {'tipo': str(compacta.dtype), 'bytes_originais': bytes_originais, 'bytes_compactos': compacta.nbytes,
+            'economia': 1 - compacta.nbytes / bytes_originais if bytes_originais else 0.0, 'colunas_por_tipo': colunas_por_tipo,
+            'colunas_deslocadas': int(np.count_nonzero(layout.deslocamentos))}
+
+
+def main(argumentos=None):
+    """Mede pela linha de comando a memória da base de casos no armazenamento compacto."""
+    from .avaliacao import BASES, carregar_base
+
+    parser = argparse.ArgumentParser(description='Memória da base de casos no armazenamento compacto (tipo mais estreito por coluna).')
+    parser.add_argument('--bases', nargs='+', default=None)
+    args = parser.parse_args(argumentos)
+
+    base_dir = Path(__file__).resolve().parent.parent
+    relatorios = {}
+    for base in (args.bases or [base_dir / nome for nome in BASES]):
+        matriz, colunas = carregar_base(base)
+        layout = criar_layout(matriz)
+        relatorio = economia_memoria(layout.codificar(matriz), layout)
+        relatorios[str(base)] = relatorio
+        print(f"{Path(base).name}: {len(matriz)} casos, {relatorio['bytes_originais'] // 1024} KiB em int16 -> {relatorio['bytes_compactos'] // 1024} KiB "
+              f"em {relatorio['tipo']} (economia de {relatorio['economia']:.1%}); colunas por tipo {relatorio['colunas_por_tipo']}, "
+              f"{relatorio['colunas_deslocadas']} deslocadas")
+
+    return relatorios
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import numpy as np
+import pandas as pd
+import time
+from pathlib import Path
+from .avaliacao import BASES, DECISOES_VOTOS, carregar_base, decisoes_votos
+from .busca import BuscaBruta, calibrar
+from .cbr import COLUNAS_DECISAO
+from .dados import COLUNA_PESO, Dados
+from .votos import (mascara_envido_ganho, mascara_envido_perdido, mascara_jogadas_vencidas, mascara_truco_ganho, mascara_truco_perdido,
+                    votar_envido_lote, votar_jogada_lote, votar_truco_lote)
+
+
+def deduplicar(matriz, pesos=None):
+    """Retorna as linhas da primeira ocorrência de cada caso distinto, em ordem, e a multiplicidade de cada um."""
+    unicos, primeiras, inversos = np.unique(matriz, axis=0, return_index=True, return_inverse=True)
+    multiplicidade = np.bincount(inversos.ravel(), weights=pesos, minlength=len(unicos)).astype(np.int64)
+    ordem = np.argsort(primeiras)
+    return primeiras[ordem], multiplicidade[ordem]
+
+
+def consultas_decisao(matriz, colunas, modelo, linhas):
+    """Consultas como as do registro no momento de cada decisão: o modelo zerado com apenas as colunas da decisão
+    (COLUNAS_DECISAO) copiadas dos casos indicados. Retorna as consultas e a decisão de cada uma."""
+    consultas, decisoes = [], []
+    for decisao in DECISOES_VOTOS:
+        posicoes = [colunas[coluna] for coluna in dict.fromkeys(COLUNAS_DECISAO[decisao]) if coluna in colunas]
+        parciais = np.tile(np.asarray(modelo, dtype=matriz.dtype), (len(linhas), 1))
+        parciais[:, posicoes] = matriz[linhas][:, posicoes]
+        consultas.append(parciais)
+        decisoes += [decisao] * len(linhas)
+
+    return np.concatenate(consultas), np.array(decisoes)
+
+
+class Condensador():
+    """Remove da base de casos os casos cuja remoção não altera os votos (e portanto as decisões) das consultas de ajuste.
+    A busca é exata e considera a multiplicidade de cada caso, como o Cbr faz com bases condensadas."""
+    def __init__(self, matriz, colunas, pesos=None, k=100):
+        self.matriz = matriz
+        self.colunas = colunas
+        self.pesos = np.ones(len(matriz), dtype=np.int64) if pesos is None else np.asarray(pesos, dtype=np.int64)
+        self.k = k
+        self.casos = matriz.astype(np.float32)
+        self.normas = np.einsum('ij,ij->i', self.casos, self.casos)
+        self.ativos = np.ones(len(matriz), dtype=bool)
+
+
+    def vizinhos(self, consultas):
+        """Retorna os índices (lote, k) dos vizinhos de cada consulta entre os casos ativos, repetidos pela multiplicidade."""
+        ativos = np.flatnonzero(self.ativos)
+        k = min(self.k, len(ativos))
+        distancias2 = self.normas[ativos] - 2 * (consultas.astype(np.float32) @ self.casos[ativos].T)
+        candidatos = np.argpartition(distancias2, k - 1, axis=1)[:, :k] if k < len(ativos) else np.tile(np.arange(len(ativos)), (len(consultas), 1))
+        # Ordem por (distância, índice), o mesmo desempate das buscas do Cbr
+        ordem = np.lexsort((candidatos, np.take_along_axis(distancias2, candidatos, axis=1)), axis=1)
+        indices = ativos[np.take_along_axis(candidatos, ordem, axis=1)]
+        if ((self.pesos[ativos] == 1).all()):
+            return indices
+
+        total = min(self.k, int(self.pesos[ativos].sum()))
+        return np.array([np.repeat(linha, self.pesos[linha])[:total] for linha in indices])
+
+
+    def assinaturas(self, indices, decisoes):
+        """Votos de cada consulta que são usados pela sua decisão; votos iguais garantem decisões iguais para quaisquer argumentos."""
+        casos = self.matriz[indices]
+        assinaturas = np.zeros((len(indices), 7), dtype=np.int64)
+        for decisao in np.unique(decisoes):
+            linhas = np.flatnonzero(decisoes == decisao)
+            grupo = casos[linhas]
+            if (decisao == 'truco'):
+                votos = votar_truco_lote(grupo, mascara_truco_ganho(grupo, self.colunas), grupo, mascara_truco_perdido(grupo, self.colunas), self.colunas)
+                assinaturas[linhas, :4] = [[voto.vencidas, voto.perdidas, voto.retruco, voto.qualidade_mao_humana] for voto in votos]
+
+            elif (decisao == 'envido'):
+                votos = votar_envido_lote(grupo, mascara_envido_ganho(grupo, self.colunas), grupo, mascara_envido_perdido(grupo, self.colunas), self.colunas)
+                assinaturas[linhas, :7] = [[voto.envido_ganhas, voto.envido_perdidas, voto.real_envido_ganhas, voto.real_envido_perdidas,
+                                            voto.falta_envido_ganhas, voto.falta_envido_perdidas, voto.pontos_jogador] for voto in votos]
+
+            else:
+                rodada = int(decisao.split('_')[1])
+                votos = votar_jogada_lote(grupo, mascara_jogadas_vencidas(grupo, self.colunas), self.colunas)
+                assinaturas[linhas, 0] = [voto.referencias[rodada] for voto in votos]
+
+        return assinaturas
+
+
+    def condensar(self, consultas, decisoes, tamanho_lote=64):
+        """Remove os casos nunca recuperados pelas consultas e, em seguida, tenta remover os demais em lotes (dos menos para os
+        mais recuperados), dividindo ao meio os lotes que alteram algum voto. Retorna a máscara dos casos mantidos."""
+        vizinhos = self.vizinhos(consultas)
+        referencia = self.assinaturas(vizinhos, decisoes)
+        recuperacoes = np.bincount(vizinhos.ravel(), minlength=len(self.matriz))
+        # Casos fora de todas as vizinhanças podem sair juntos: nenhuma consulta de ajuste muda
+        self.ativos[recuperacoes == 0] = False
+        candidatos = np.argsort(recuperacoes, kind='stable')
+        candidatos = candidatos[recuperacoes[candidatos] > 0]
+        pendentes = [candidatos[inicio:inicio + tamanho_lote] for inicio in range(0, len(candidatos), tamanho_lote)][::-1]
+        while (pendentes):
+            lote = pendentes.pop()
+            if (self.ativos.sum() - len(lote) < self.k):
+                continue
+
+            removidos = np.zeros(len(self.matriz), dtype=bool)
+            removidos[lote] = True
+            afetadas = np.flatnonzero(removidos[vizinhos].any(axis=1))
+            self.ativos[lote] = False
+            novos = self.vizinhos(consultas[afetadas])
+            if ((self.assinaturas(novos, decisoes[afetadas]) == referencia[afetadas]).all()):
+                vizinhos[afetadas] = novos
+                continue
+
+            self.ativos[lote] = True
+            if (len(lote) > 1):
+                pendentes += [lote[len(lote) // 2:], lote[:len(lote) // 2]]
+
+        return self.ativos.copy()
+
+
+def avaliar_condensacao(matriz, colunas, modelo, fracao_ajuste=0.5, tamanho_lote=64, semente=0):
+    """Deduplica e condensa a base, medindo redução, tempo de consulta e concordância das decisões em consultas de teste separadas das de ajuste."""
+    inicio = time.perf_counter()
+    linhas, pesos = deduplicar(matriz)
+    sorteio = np.random.default_rng(semente).permutation(len(matriz))
+    corte = int(len(matriz) * fracao_ajuste)
+    consultas_ajuste, decisoes_ajuste = consultas_decisao(matriz, colunas, modelo, np.sort(sorteio[:corte]))
+    consultas_teste, decisoes_teste = consultas_decisao(matriz, colunas, modelo, np.sort(sorteio[corte:]))
+
+    condensador = Condensador(matriz[linhas], colunas, pesos)
+    mantidos = condensador.condensar(consultas_ajuste, decisoes_ajuste, tamanho_lote)
+    linhas, pesos = linhas[mantidos], pesos[mantidos]
+    duracao = time.perf_counter() - inicio
+
+    # Concordância no teste: decisões da base original e da condensada, em uma grade fixa de argumentos
+    original = Condensador(matriz, colunas)
+    indices_originais, indices_condensados = original.vizinhos(consultas_teste), condensador.vizinhos(consultas_teste)
+    iguais = []
+    for decisao in DECISOES_VOTOS:
+        grupo = decisoes_teste == decisao
+        iguais.append(decisoes_votos(matriz[indices_originais[grupo]], colunas, decisao) == decisoes_votos(condensador.matriz[indices_condensados[grupo]], colunas, decisao))
+
+    votos_iguais = (original.assinaturas(indices_originais, decisoes_teste) == condensador.assinaturas(indices_condensados, decisoes_teste)).all(axis=1)
+    tempos = calibrar({'original': BuscaBruta(matriz, 100), 'condensada': BuscaBruta(matriz[linhas], 100)}, consultas_teste[::max(1, len(consultas_teste) // 200)], 1)[1]
+    return {'linhas': linhas, 'pesos': pesos, 'casos_originais': len(matriz), 'casos_distintos': len(condensador.matriz), 'casos_condensados': len(linhas),
+            'reducao': 1 - len(linhas) / len(matriz), 'bytes_originais': matriz.nbytes, 'bytes_condensados': matriz[linhas].nbytes,
+            'tempo_original_ms': tempos['original'] * 1000, 'tempo_condensada_ms': tempos['condensada'] * 1000,
+            'concordancia_decisoes': float(np.concatenate([igual.ravel() for igual in iguais]).mean()), 'concordancia_votos': float(votos_iguais.mean()),
+            'consultas_ajuste': len(consultas_ajuste), 'consultas_teste': len(consultas_teste), 'duracao_s': duracao}
+
+
+def salvar_base_condensada(csv_origem, csv_destino, linhas, pesos):
+    """Grava as linhas mantidas do CSV original, sem alterar o seu formato, com a coluna de multiplicidade."""
+    df = pd.read_csv(csv_origem, sep='\t', dtype=str, keep_default_na=False, encoding='utf-8')
+    df = df.iloc[linhas].copy()
+    df[COLUNA_PESO] = pesos
+    df.to_csv(csv_destino, sep='\t', index=False, encoding='utf-8')
+
+
+def main(argumentos=None):
+    """Condensa as bases de casos pela linha de comando, exibe o relatório e, opcionalmente, grava a base condensada."""
+    parser = argparse.ArgumentParser(description='Condensação da base de casos: remove duplicatas e casos que não alteram as decisões do bot.')
+    parser.add_argument('--bases', nargs='+', default=None)
+    parser.add_argument('--saida', default=None, help='diretório onde gravar <base>.condensada.csv')
+    parser.add_argument('--fracao-ajuste', type=float, default=0.5)
+    parser.add_argument('--tamanho-lote', type=int, default=64)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argumentos)
+
+    base_dir = Path(__file__).resolve().parent.parent
+    colunas_modelo, modelo = Dados().modelo_registro()
+    relatorios = {}
+    for base in (args.bases or [base_dir / nome for nome in BASES]):
+        matriz, colunas = carregar_base(base)
+        relatorio = avaliar_condensacao(matriz, colunas, modelo, args.fracao_ajuste, args.tamanho_lote, args.semente)
+        relatorios[str(base)] = relatorio
+        print(f"{Path(base).name}: {relatorio['casos_originais']} casos, {relatorio['casos_distintos']} distintos, {relatorio['casos_condensados']} após a condensação "
+              f"(redução de {relatorio['reducao']:.1%}, {relatorio['bytes_originais'] // 1024} KiB -> {relatorio['bytes_condensados'] // 1024} KiB)")
+        print(f"  busca exata: {relatorio['tempo_original_ms']:.3f} -> {relatorio['tempo_condensada_ms']:.3f} ms/consulta; "
+              f"concordância no teste ({relatorio['consultas_teste']} consultas): decisões {relatorio['concordancia_decisoes']:.4f}, votos {relatorio['concordancia_votos']:.4f}")
+        if (args.saida):
+            destino = Path(args.saida) / Path(base).with_suffix('.condensada.csv').name
+            salvar_base_condensada(base, destino, relatorio['linhas'], relatorio['pesos'])
+            print(f"  base condensada gravada em {destino}")
+
+    return relatorios
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,244 @@
 import pandas as pd
+import numpy as np
+import hashlib
+import json
 import os
 from pathlib import Path
+from .compacta import criar_layout, LayoutCompacto
+
+# Base de casos compartilhada pelo processo: o CSV e o modelo de registro são lidos e tratados uma única vez
+_BASE_CASOS = {}
+
+# Cache binário da base de casos tratada: matriz int16 em .npy (aberta com mmap) e cabeçalho .json com colunas e hash do CSV
+CACHE_BINARIO = True
+VERSAO_CACHE = 2
+
+# Coluna opcional das bases condensadas (python -m truco.condensacao): quantas linhas idênticas da base original cada caso representa
+COLUNA_PESO = 'pesoCaso'
+
+
+class Registro():
+    """Registro da mão atual: vetor int16 de tamanho fixo, na ordem das colunas da base de casos, atualizado no lugar."""
+    def __init__(self, colunas, valores):
+        self.__dict__['colunas'] = list(colunas)
+        self.__dict__['indices'] = {coluna: i for i, coluna in enumerate(self.colunas)}
+        self.__dict__['valores'] = np.array(valores, dtype=np.int16)
+
+
+    def __getattr__(self, nome):
+        """Retorna a coluna como uma visão de um elemento do vetor, como a coluna do antigo dataframe de uma linha."""
+        indices = self.__dict__.get('indices', {})
+        if (nome in indices):
+            return self.valores[indices[nome]:indices[nome] + 1]
+
+        raise AttributeError(nome)
+
+
+    def __setattr__(self, nome, valor):
+        """Atualiza a coluna no vetor; nomes que não são colunas são guardados como atributos comuns."""
+        indice = self.indices.get(nome)
+        if (indice is None):
+            self.__dict__[nome] = valor
+            return
+
+        # valores ausentes recebem o mesmo sentinel usado no tratamento da base de casos
+        self.valores[indice] = -100 if valor is None else int(valor)
+
+
+    def zerar(self, valores):
+        """Volta o vetor aos valores do modelo e descarta os atributos extras."""
+        self.valores[:] = valores
+        for nome in list(self.__dict__):
+            if (nome not in ('colunas', 'indices', 'valores')):
+                del self.__dict__[nome]
+
+
+    def para_dataframe(self):
+        """Retorna o registro como um dataframe de uma linha, no formato do modelo de caso."""
+        return pd.DataFrame([self.valores], columns=self.colunas, index=pd.Index([0], name='idMao'))
+
 
 class Dados():
     def __init__(self):
         self.colunas = ['idMao', 'jogadorMao', 'cartaAltaRobo', 'cartaMediaRobo', 'cartaBaixaRobo', 'cartaAltaHumano', 'cartaMediaHumano', 'cartaBaixaHumano', 'primeiraCartaRobo', 'primeiraCartaHumano', 'segundaCartaRobo', 'segundaCartaHumano', 'terceiraCartaRobo', 'terceiraCartaHumano', 'ganhadorPrimeiraRodada', 'ganhadorSegundaRodada', 'ganhadorTerceiraRodada', 'quemPediuEnvido', 'quemPediuFaltaEnvido', 'quemPediuRealEnvido', 'pontosEnvidoRobo', 'pontosEnvidoHumano', 'quemNegouEnvido', 'quemGanhouEnvido', 'quemFlor', 'quemContraFlor', 'quemContraFlorResto', 'quemNegouFlor', 'pontosFlorRobo', 'pontosFlorHumano', 'quemGanhouFlor', 'quemEscondeuPontosEnvido', 'quemEscondeuPontosFlor', 'quemTruco', 'quemRetruco', 'quemValeQuatro', 'quemNegouTruco', 'quemGanhouTruco','quemEnvidoEnvido', 'quemFlor', 'naipeCartaAltaRobo', 'naipeCartaMediaRobo', 'naipeCartaBaixaRobo', 'naipeCartaAltaHumano', 'naipeCartaMediaHumano', 'naipeCartaBaixaHumano', 'naipePrimeiraCartaRobo', 'naipePrimeiraCartaHumano', 'naipeSegundaCartaRobo', 'naipeSegundaCartaHumano', 'naipeTerceiraCartaRobo', 'naipeTerceiraCartaHumano', 'qualidadeMaoRobo', 'qualidadeMaoHumano']
-        self.registro = self.carregar_modelo_zerado()
-        self.casos = self.tratamento_inicial_df()
+        colunas, valores = self.modelo_registro()
+        self.registro = Registro(colunas, valores)
+        self.casos = self.carregar_casos()
 
-    def tratamento_inicial_df(self):
-        """Tratamento de dados do dataframe que será utilizado para alimentar a base de casos"""
+
+    def modelo_registro(self):
+        """Retorna as colunas e os valores do modelo de caso zerado, compartilhados pelo processo."""
+        if ('registro' not in _BASE_CASOS):
+            modelo = self.carregar_modelo_zerado()
+            valores = modelo.to_numpy()[0].astype(np.int16)
+            valores.flags.writeable = False
+            _BASE_CASOS['registro'] = (modelo.columns.to_list(), valores)
+
+        return _BASE_CASOS['registro']
+
+
+    def carregar_casos(self):
+        """Retorna a base de casos compartilhada (somente leitura), tratando o CSV apenas na primeira chamada do processo."""
+        if ('casos' not in _BASE_CASOS):
+            csv_path = self.caminho_casos()
+            if (CACHE_BINARIO and csv_path is not None):
+                _BASE_CASOS['casos'] = self.carregar_cache_binario(csv_path)
+            else:
+                if (csv_path is not None):
+                    _BASE_CASOS['origem'] = {'caminho': str(csv_path), 'hash': self.hash_arquivo(csv_path)}
+
+                _BASE_CASOS['pesos'] = self.ler_pesos(csv_path)
+                df = self.tratamento_inicial_df(csv_path)
+                valores = df.to_numpy()
+                valores.flags.writeable = False
+                _BASE_CASOS['casos'] = pd.DataFrame(valores, index=df.index, columns=df.columns, copy=False)
+
+        return _BASE_CASOS['casos']
+
+
+    def origem_casos(self):
+        """Retorna o caminho e o hash do CSV de origem da base de casos, ou None caso ela não tenha vindo de um CSV."""
+        return _BASE_CASOS.get('origem')
+
+
+    def casos_compactos(self):
+        """Retorna a base de casos no armazenamento compacto (matriz C-contígua somente leitura) e o seu layout, compartilhados pelo processo."""
+        if ('compacta' not in _BASE_CASOS):
+            casos = self.carregar_casos()
+            origem = self.origem_casos()
+            if (CACHE_BINARIO and origem is not None):
+                _BASE_CASOS['compacta'] = self.carregar_cache_compacto(Path(origem['caminho']), origem['hash'], casos)
+            else:
+                layout = criar_layout(casos.to_numpy())
+                valores = layout.codificar(casos.to_numpy())
+                valores.flags.writeable = False
+                _BASE_CASOS['compacta'] = (valores, layout)
+
+        return _BASE_CASOS['compacta']
+
+
+    def pesos_casos(self):
+        """Retorna a multiplicidade de cada caso em uma base condensada, ou None para bases sem a coluna de pesos."""
+        return _BASE_CASOS.get('pesos')
+
+
+    def ler_pesos(self, csv_path):
+        """Lê a coluna de pesos do CSV, caso exista."""
+        if (csv_path is None):
+            return None
+
+        try:
+            df = pd.read_csv(csv_path, usecols=lambda coluna: coluna == COLUNA_PESO, sep='\t', encoding='utf-8')
+        except (OSError, ValueError):
+            return None
+
+        if (COLUNA_PESO not in df.columns):
+            return None
+
+        pesos = df[COLUNA_PESO].to_numpy(dtype=np.int64)
+        pesos.flags.writeable = False
+        return pesos
+
+
+    def caminho_casos(self):
+        """Retorna o caminho do CSV da base de casos, ou None caso o arquivo não exista."""
         base_dir = Path(__file__).resolve().parent.parent
-        csv_path = base_dir / 'dbtrucoimitacao_maos.csv'
+        for csv_path in [base_dir / 'dbtrucoimitacao_maos.csv', Path('dbtrucoimitacao_maos.csv')]:
+            if (csv_path.is_file()):
+                return csv_path
+
+        return None
+
+
+    def caminhos_cache(self, csv_path):
+        """Retorna os caminhos da matriz (.npy) e do cabeçalho (.json) do cache binário de um CSV."""
+        return csv_path.with_suffix('.casos.npy'), csv_path.with_suffix('.casos.json')
+
+
+    def caminhos_cache_compacto(self, csv_path):
+        """Retorna os caminhos da matriz compacta (.npy) e do seu cabeçalho (.json) no cache binário de um CSV."""
+        return csv_path.with_suffix('.casos-compacta.npy'), csv_path.with_suffix('.casos-compacta.json')
+
+
+    def hash_arquivo(self, caminho):
+        """Calcula o hash SHA-256 do conteúdo de um arquivo."""
+        with open(caminho, 'rb') as arquivo:
+            return hashlib.sha256(arquivo.read()).hexdigest()
+
+
+    def carregar_cache_binario(self, csv_path):
+        """Abre o cache binário com mmap, gerando-o a partir do CSV caso não exista ou esteja desatualizado."""
+        npy_path, json_path = self.caminhos_cache(csv_path)
+        assinatura = self.hash_arquivo(csv_path)
+        _BASE_CASOS['origem'] = {'caminho': str(csv_path), 'hash': assinatura}
+        try:
+            with open(json_path, encoding='utf-8') as arquivo:
+                cabecalho = json.load(arquivo)
+
+            if (cabecalho['versao'] == VERSAO_CACHE and cabecalho['hash'] == assinatura and cabecalho['colunas_origem'] == self.colunas):
+                valores = np.load(npy_path, mmap_mode='r')
+                _BASE_CASOS['pesos'] = None if cabecalho['pesos'] is None else np.array(cabecalho['pesos'], dtype=np.int64)
+                indice = pd.Index(cabecalho['indice'], name=cabecalho['nome_indice'])
+                return pd.DataFrame(valores, index=indice, columns=cabecalho['colunas'], copy=False)
+
+        except (OSError, ValueError, KeyError):
+            pass
+
+        df = self.tratamento_inicial_df(csv_path)
+        valores = np.ascontiguousarray(df.to_numpy(dtype=np.int16))
+        _BASE_CASOS['pesos'] = self.ler_pesos(csv_path)
+        cabecalho = {'versao': VERSAO_CACHE, 'hash': assinatura, 'colunas_origem': self.colunas, 'colunas': df.columns.to_list(),
+                     'nome_indice': df.index.name, 'indice': df.index.to_list(),
+                     'pesos': None if _BASE_CASOS['pesos'] is None else _BASE_CASOS['pesos'].tolist()}
+        valores = self.gravar_cache(npy_path, json_path, valores, cabecalho)
+        return pd.DataFrame(valores, index=df.index, columns=df.columns, copy=False)
+
+
+    def gravar_cache(self, npy_path, json_path, valores, cabecalho):
+        """Grava a matriz e o cabeçalho de um cache binário e retorna a matriz reaberta com mmap (ou a própria matriz, somente leitura, se a escrita falhar)."""
+        try:
+            # Escrita em arquivos temporários e troca atômica, pois vários processos podem gerar o cache ao mesmo tempo
+            sufixo = f'.{os.getpid()}.tmp'
+            with open(str(npy_path) + sufixo, 'wb') as arquivo:
+                np.save(arquivo, valores)
+
+            with open(str(json_path) + sufixo, 'w', encoding='utf-8') as arquivo:
+                json.dump(cabecalho, arquivo)
+
+            os.replace(str(npy_path) + sufixo, npy_path)
+            os.replace(str(json_path) + sufixo, json_path)
+            return np.load(npy_path, mmap_mode='r')
+
+        except OSError:
+            valores.flags.writeable = False
+            return valores
+
+
+    def carregar_cache_compacto(self, csv_path, assinatura, casos):
+        """Abre a matriz compacta com mmap, gerando-a a partir da base tratada caso não exista ou esteja desatualizada."""
+        npy_path, json_path = self.caminhos_cache_compacto(csv_path)
+        try:
+            with open(json_path, encoding='utf-8') as arquivo:
+                cabecalho = json.load(arquivo)
+
+            if (cabecalho['versao'] == VERSAO_CACHE and cabecalho['hash'] == assinatura and cabecalho['colunas'] == casos.columns.to_list()):
+                return np.load(npy_path, mmap_mode='r'), LayoutCompacto(cabecalho['deslocamentos'], cabecalho['tipos'])
+
+        except (OSError, ValueError, KeyError):
+            pass
+
+        layout = criar_layout(casos.to_numpy())
+        cabecalho = {'versao': VERSAO_CACHE, 'hash': assinatura, 'colunas': casos.columns.to_list(),
+                     'deslocamentos': layout.deslocamentos.tolist(), 'tipos': [str(tipo) for tipo in layout.tipos]}
+        return self.gravar_cache(npy_path, json_path, layout.codificar(casos.to_numpy()), cabecalho), layout
+
+
+    def tratamento_inicial_df(self, csv_path=None):
+        """Tratamento de dados do dataframe que será utilizado para alimentar a base de casos"""
+        if (csv_path is None):
+            base_dir = Path(__file__).resolve().parent.parent
+            csv_path = base_dir / 'dbtrucoimitacao_maos.csv'
+
         # leitura robusta: arquivo neste projeto usa separador por tab e contém 'NULL' como string para valores ausentes
         try:
             df = pd.read_csv(csv_path, usecols=self.colunas, index_col='idMao', sep='\t', na_values=['NULL'], encoding='utf-8', low_memory=False)
@@ -154,6 +381,14 @@ class Dados():
 
     def carregar_modelo_zerado(self):
         """Carrega um dataframe zerado, para ser utilizado como modelo de caso."""
+        if ('modelo' not in _BASE_CASOS):
+            _BASE_CASOS['modelo'] = self.ler_modelo_zerado()
+
+        return _BASE_CASOS['modelo'].copy()
+
+
+    def ler_modelo_zerado(self):
+        """Lê do disco o modelo de caso zerado."""
         base_dir = Path(__file__).resolve().parent.parent
         modelo_path = base_dir / 'modelo_registro.csv'
         try:
@@ -175,12 +410,12 @@ class Dados():
     def finalizar_partida(self):
         """Método para salvar as jogadas da partida em um csv."""
         if not(os.path.isfile('jogadas.csv')):
-            self.registro.to_csv('jogadas.csv', header=self.registro.columns)
+            self.registro.para_dataframe().to_csv('jogadas.csv', header=self.registro.colunas)
         else:
-            self.registro.to_csv('jogadas.csv', mode='a', header=False)
+            self.registro.para_dataframe().to_csv('jogadas.csv', mode='a', header=False)
 
 
     def resetar(self):
         """Resetar variáveis ligadas a rodada."""
-        self.casos = self.tratamento_inicial_df()
-        self.registro = self.carregar_modelo_zerado()
\ No newline at end of file
+        colunas, valores = self.modelo_registro()
+        self.registro.zerar(valores)
\ No newline at end of file
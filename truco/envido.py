@@ -1,5 +1,26 @@
-class Envido():
-    def __init__(self):
+from .agentes import AgenteJogador, AgenteTerminal, Pergunta, perguntar
+from .apostas import ACEITAR, ACOES, PEDE, RECUSAR, RESPONDE, TRANSICOES, VALOR_FALTA, Aposta
+from .estado import EstadoJogo, campo_estado, campo_estado_jogador
+from .interface import Interface
+
+
+class Envido(Aposta):
+    APOSTA = 'envido'
+    # Andamento do envido, guardado no EstadoJogo compartilhado com o motor
+    valor_envido = campo_estado('valor_envido')
+    estado_atual = campo_estado('estado_envido')
+    jogador_pediu_envido = campo_estado('envido_pediu')
+    quem_fugiu = campo_estado('envido_fugiu')
+    quem_venceu_envido = campo_estado('envido_vencedor')
+    jogador_bloqueado = campo_estado('envido_bloqueado')
+    jogador1_pontos = campo_estado_jogador('pontos_envido', 0)
+    jogador2_pontos = campo_estado_jogador('pontos_envido', 1)
+
+    def __init__(self, agentes=None, interface=None, estado=None):
+        self.estado = estado or EstadoJogo()
+        # Agentes que respondem aos pedidos em cada posição; por padrão, o humano no terminal é o jogador 1 e o bot o jogador 2
+        self.interface = interface or Interface()
+        self.agentes = agentes or {1: AgenteTerminal(self.interface), 2: AgenteJogador()}
         self.valor_envido = 2
         self.estado_atual = 0
         self.jogador_pediu_envido = 0
@@ -12,24 +33,19 @@ class Envido():
         self.jogador2_pontos = 0
 
 
-    def inverter_jogador_bloqueado(self):
-        """Lógica para impedir que o mesmo jogador não peça o aumento de aposta seguidamente."""
-        if (self.jogador_bloqueado == 1):
-            self.jogador_bloqueado = 2
-        
-        else:
-            self.jogador_bloqueado = 1
-
-
-    def inicializar_jogador_bloqueado(self, quem_pediu):
-        """Inicialização do jogador que foi bloqueado e não pode pedir aumento da aposta do jogo."""
-        self.jogador_bloqueado = quem_pediu
+    def responder_pedido(self, cbr, quem_pediu, jogador1, jogador2):
+        """Pede ao agente do adversário de quem pediu a resposta ao pedido de envido atual."""
+        estado = self.estado
+        quem = 2 if quem_pediu == 1 else 1
+        jogador = jogador2 if quem == 2 else jogador1
+        opcoes = ACOES[(self.APOSTA, estado.estado_envido, RESPONDE)]
+        pergunta = Pergunta('envido', quem, jogador, cbr, opcoes, estado.estado_envido, estado.valor_envido, estado.pontos_envido[quem - 1], padrao=1)
+        return perguntar(self.agentes[quem], pergunta)
 
 
     def controlador_envido(self, cbr, dados, tipo, quem_pediu, jogador1, jogador2, interface):
         """Controlador de métodos, para selecionar o que pode ser chamado ou não."""
-        print(2)
-        if (self.estado_atual != 0 or tipo == self.estado_atual):
+        if (self.transicao(PEDE, tipo) is None):
             return None
         
         if (quem_pediu == self.jogador_bloqueado):
@@ -39,138 +55,69 @@ class Envido():
             self.inicializar_jogador_bloqueado(quem_pediu)
 
         self.definir_pontos_jogadores(jogador1, jogador2)
-
-        if (tipo == 6):
-            self.envido(cbr, quem_pediu, jogador1, jogador2)
-
-        if (tipo ==  7):
-            self.real_envido(cbr, quem_pediu, jogador1, jogador2)
-
-        if (tipo ==  8):
-            self.falta_envido(cbr, quem_pediu, jogador1, jogador2)
-        
-        # else:
-        #     return None
+        self.apostar(tipo, cbr, quem_pediu, jogador1, jogador2)
 
         if (self.quem_fugiu == 0):
             interface.mostrar_vencedor_envido(self.quem_venceu_envido, jogador1.nome, self.jogador1_pontos, jogador2.nome, self.jogador2_pontos)
 
-        
-    def envido(self, cbr, quem_pediu, jogador1, jogador2):
-        self.estado_atual = 6
-        print("Jogador pediu Envido!")
-
-        if (quem_pediu == 1):
-            self.jogador_pediu_envido = 1
-            escolha = jogador2.avaliar_envido(cbr, self.estado_atual, 1, self.jogador2_pontos)
-            # cbr, tipo, quem_pediu, pontos_jogador1)
-
-        else:
-            self.jogador_pediu_envido = 2
-            escolha = -1
-            while(escolha not in [0, 1, 2, 3]):
-                escolha = int(input(f"Jogador {quem_pediu}, você aceita o pedido de envido?\n[0] Recusar\n[1] Aceitar\n[2] Real Envido\n[3] Falta Envido"))
-        
-
-        if escolha == 0:
-            print(f"fugiu")
-            if (quem_pediu == 1):
-                jogador1.pontos += 1
-                self.quem_fugiu = 2
-
-            else:
-                jogador2.pontos += 1
-                self.quem_fugiu = 1
-
-            return
-
-        elif escolha == 1:
-            print('Jogador aceitou envido!')
-            self.avaliar_vencedor_envido(quem_pediu, jogador1, jogador2)
 
-        elif escolha == 2:
-            self.inverter_jogador_bloqueado()
-            self.real_envido(cbr, self.jogador_bloqueado, jogador1, jogador2)
-        
-        else:
-            self.inverter_jogador_bloqueado()
-            self.falta_envido(cbr, self.jogador_bloqueado, jogador1, jogador2)
+    def apostar(self, nivel, cbr, quem_pediu, jogador1, jogador2):
+        """Pede o nível de envido informado (6 envido, 7 real envido, 8 falta envido) e segue a tabela de transições
+        enquanto quem responde aumentar o pedido. Retorna False se o pedido foi recusado."""
+        estado = self.estado
+        while True:
+            estado.estado_envido = nivel
+            estado.envido_pediu = quem_pediu
+            _, pontos_recusa, valor = TRANSICOES[(self.APOSTA, nivel, RESPONDE, ACEITAR)]
+            if (valor == VALOR_FALTA):
+                # O falta envido vale o que falta para o adversário de quem pediu vencer a partida
+                valor = 12 - (jogador2.pontos if quem_pediu == 1 else jogador1.pontos)
 
-        
-    def real_envido(self, cbr, quem_pediu, jogador1, jogador2):
-        self.estado_atual = 7
-        self.valor_envido = 5
-        print("Jogador pediu Real Envido")
+            estado.valor_envido = valor
+            nome = self.nome_nivel(nivel)
+            self.interface.mostrar_aposta(f"Jogador pediu {nome}!")
+            escolha = self.responder_pedido(cbr, quem_pediu, jogador1, jogador2)
 
-        if (quem_pediu == 1):
-            # self.jogador_pediu_real_envido = 1
-            escolha = jogador2.avaliar_envido(cbr, self.estado_atual, 1, self.jogador2_pontos)
+            if (escolha == RECUSAR):
+                self.interface.mostrar_aposta(f"Fugiu do {nome}!")
+                if (quem_pediu == 1):
+                    jogador1.pontos += pontos_recusa
+                    estado.envido_fugiu = 2
 
-        else:
-            # self.jogador_pediu_real_envido = 2
-            escolha = -1
-            while(escolha not in [0, 1, 2]):
-                escolha = int(input(f"Jogador {quem_pediu}, você aceita o pedido de Real envido?\n[0] Recusar\n[1] Aceitar\n[2] Falta Envido"))
-        
-
-        if escolha == 0:
-            print(f"Fugiu do Real Envido!")
-            if (quem_pediu == 1):
-                jogador1.pontos += 2
-                self.quem_fugiu = 2
+                else:
+                    jogador2.pontos += pontos_recusa
+                    estado.envido_fugiu = 1
 
-            else:
-                jogador2.pontos += 2
-                self.quem_fugiu = 1
+                return False
 
-            return
+            if (escolha == ACEITAR):
+                self.interface.mostrar_aposta(f"Jogador aceitou {nome}!")
+                if (nivel == 8):
+                    self.avaliar_vencedor_falta_envido(quem_pediu, jogador1, jogador2)
 
-        elif escolha == 1:
-            print('Jogador aceitou Real envido!')
-            self.avaliar_vencedor_envido(quem_pediu, jogador1, jogador2)
-
-        else:
-            self.inverter_jogador_bloqueado()
-            self.falta_envido(cbr, self.jogador_bloqueado, jogador1, jogador2)
+                else:
+                    self.avaliar_vencedor_envido(quem_pediu, jogador1, jogador2)
 
+                return True
 
-    def falta_envido(self, cbr, quem_pediu, jogador1, jogador2):
-        self.estado_atual = 8
-        if (quem_pediu == 1):
-            print(1)
-            self.valor_envido = 12 - jogador2.pontos
+            # Quem respondeu aumenta o pedido e passa a ser o jogador bloqueado
+            nivel = TRANSICOES[(self.APOSTA, nivel, RESPONDE, escolha)][0]
+            quem_pediu = estado.envido_bloqueado = 3 - quem_pediu
 
-        else:
-            print(2)
-            self.valor_envido = 12 - jogador1.pontos
-        print("Jogador pediu Falta Envido!")
 
-        if (quem_pediu == 1):
-            self.jogador_pediu_envido = 1
-            escolha = jogador2.avaliar_envido(cbr, self.estado_atual, 1, self.jogador2_pontos)
+    def envido(self, cbr, quem_pediu, jogador1, jogador2):
+        """Pedido de envido, que vale 2 pontos."""
+        return self.apostar(6, cbr, quem_pediu, jogador1, jogador2)
 
-        else:
-            self.jogador_pediu_envido = 2
-            escolha = -1
-            while(escolha not in [0, 1]):
-                escolha = int(input(f"Jogador {quem_pediu}, você aceita o pedido de envido?\n[0] Recusar\n[1] Aceitar\n"))
         
+    def real_envido(self, cbr, quem_pediu, jogador1, jogador2):
+        """Pedido de real envido, que vale 5 pontos."""
+        return self.apostar(7, cbr, quem_pediu, jogador1, jogador2)
 
-        if escolha == 0:
-            print(f"Fugiu do falta envido!")
-            if (quem_pediu == 1):
-                jogador1.pontos += 5
-                self.quem_fugiu = 2
-
-            else:
-                jogador2.pontos += 5
-                self.quem_fugiu = 1
-
-            return False
 
-        else:
-            print('Aceitou Falta envido!')
-            self.avaliar_vencedor_falta_envido(quem_pediu, jogador1, jogador2)
+    def falta_envido(self, cbr, quem_pediu, jogador1, jogador2):
+        """Pedido de falta envido, que vale os pontos que faltam para o adversário de quem pediu vencer a partida."""
+        return self.apostar(8, cbr, quem_pediu, jogador1, jogador2)
 
     
     def avaliar_vencedor_envido(self, quem_pediu, jogador1, jogador2):
@@ -185,12 +132,10 @@ class Envido():
 
     def avaliar_vencedor_falta_envido(self, quem_pediu, jogador1, jogador2):
         if self.jogador1_pontos >= self.jogador2_pontos:
-            print(3)
             jogador1.pontos += self.valor_envido
             self.quem_venceu_envido = 1
 
         else:
-            print(4)
             jogador2.pontos += self.valor_envido
             self.quem_venceu_envido = 2
 
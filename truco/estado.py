@@ -0,0 +1,115 @@
+from .carta import codificar_carta
+
+
+class EstadoJogo():
+    """Estado de uma mão em um único registro: cartas como códigos de 0 a 39 (carta.codificar_carta), placar, rodadas,
+    vencedores das rodadas, vez e o andamento de truco, envido e flor. Todos os campos são inteiros, textos ou tuplas,
+    portanto clone() é uma cópia rasa dos campos e o estado pode ser comparado e usado como chave de dicionário."""
+    __slots__ = ('maos', 'mesa', 'pontos', 'rodadas', 'vencedores', 'vez', 'quem_comeca',
+                 'valor_truco', 'estado_truco', 'truco_bloqueado', 'truco_pediu', 'truco_fugiu',
+                 'valor_envido', 'estado_envido', 'envido_bloqueado', 'envido_pediu', 'envido_fugiu', 'envido_vencedor', 'pontos_envido',
+                 'valor_flor', 'estado_flor', 'flor_vencedor')
+
+    def __init__(self):
+        self.maos = ((), ())
+        self.mesa = ()
+        self.pontos = (0, 0)
+        self.rodadas = (0, 0)
+        self.vencedores = ()
+        self.vez = 0
+        self.quem_comeca = 0
+        self.valor_truco = 1
+        self.estado_truco = ""
+        self.truco_bloqueado = 0
+        self.truco_pediu = 0
+        self.truco_fugiu = 0
+        self.valor_envido = 2
+        self.estado_envido = 0
+        self.envido_bloqueado = 0
+        self.envido_pediu = 0
+        self.envido_fugiu = 0
+        self.envido_vencedor = 0
+        self.pontos_envido = (0, 0)
+        self.valor_flor = 3
+        self.estado_flor = ""
+        self.flor_vencedor = 0
+
+
+    def como_tupla(self):
+        """Retorna os campos do estado, na ordem de __slots__."""
+        return tuple(getattr(self, campo) for campo in self.__slots__)
+
+
+    def clone(self):
+        """Cópia independente do estado; como os campos são imutáveis, basta copiar as referências."""
+        copia = EstadoJogo.__new__(EstadoJogo)
+        for campo in self.__slots__:
+            setattr(copia, campo, getattr(self, campo))
+
+        return copia
+
+
+    def __eq__(self, outro):
+        if (not isinstance(outro, EstadoJogo)):
+            return NotImplemented
+
+        return self.como_tupla() == outro.como_tupla()
+
+
+    def __hash__(self):
+        return hash(self.como_tupla())
+
+
+    def __repr__(self):
+        return f"EstadoJogo(maos={self.maos}, pontos={self.pontos}, rodadas={self.rodadas}, vez={self.vez}, truco={self.valor_truco})"
+
+
+    def nova_mao(self, quem_comeca):
+        """Limpa as cartas e as rodadas para o início de uma mão."""
+        self.maos = ((), ())
+        self.mesa = ()
+        self.rodadas = (0, 0)
+        self.vencedores = ()
+        self.vez = quem_comeca
+        self.quem_comeca = quem_comeca
+
+
+    def registrar_jogadores(self, jogador1, jogador2):
+        """Copia as mãos, os pontos e as rodadas dos jogadores para o estado."""
+        self.maos = (codificar_mao(jogador1.mao), codificar_mao(jogador2.mao))
+        self.pontos = (jogador1.pontos, jogador2.pontos)
+        self.rodadas = (jogador1.rodadas, jogador2.rodadas)
+
+
+    def registrar_carta(self, quem, carta):
+        """Registra a carta jogada na rodada atual e passa a vez ao adversário."""
+        self.mesa = self.mesa + (codificar_carta(carta.numero, carta.naipe),)
+        self.vez = 3 - quem
+
+
+    def registrar_rodada(self, vencedor):
+        """Registra o vencedor da rodada, que passa a ter a vez, e limpa a mesa."""
+        self.vencedores = self.vencedores + (vencedor,)
+        self.mesa = ()
+        self.vez = vencedor
+
+
+def codificar_mao(cartas):
+    """Converte uma lista de objetos Carta em uma tupla de códigos."""
+    return tuple(codificar_carta(carta.numero, carta.naipe) for carta in cartas)
+
+
+def campo_estado(campo):
+    """Propriedade das classes de regras que lê e escreve o campo do EstadoJogo compartilhado (atributo estado)."""
+    return property(lambda self: getattr(self.estado, campo), lambda self, valor: setattr(self.estado, campo, valor),
+                    doc=f"Campo {campo} do EstadoJogo.")
+
+
+def campo_estado_jogador(campo, posicao):
+    """Propriedade que lê e escreve a posição de um campo do EstadoJogo guardado como par (jogador 1, jogador 2)."""
+    def escrever(self, valor):
+        par = list(getattr(self.estado, campo))
+        par[posicao] = valor
+        setattr(self.estado, campo, tuple(par))
+
+    return property(lambda self: getattr(self.estado, campo)[posicao], escrever, doc=f"Campo {campo}[{posicao}] do EstadoJogo.")
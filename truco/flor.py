@@ -1,5 +1,21 @@
-class Flor():
-    def __init__(self):
+from .agentes import AgenteJogador, AgenteTerminal, Pergunta, perguntar
+from .apostas import PEDE, RESPONDE, Aposta
+from .estado import EstadoJogo, campo_estado
+from .interface import Interface
+
+
+class Flor(Aposta):
+    APOSTA = 'flor'
+    # Andamento da flor, guardado no EstadoJogo compartilhado com o motor
+    valor_flor = campo_estado('valor_flor')
+    estado_atual = campo_estado('estado_flor')
+    quem_venceu_flor = campo_estado('flor_vencedor')
+
+    def __init__(self, agentes=None, interface=None, estado=None):
+        self.estado = estado or EstadoJogo()
+        # Agentes que respondem aos pedidos em cada posição; por padrão, o humano no terminal é o jogador 1 e o bot o jogador 2
+        self.interface = interface or Interface()
+        self.agentes = agentes or {1: AgenteTerminal(self.interface), 2: AgenteJogador()}
         self.valor_flor = 3
         self.quem_pediu_flor = 0
         self.quem_pediu_contraflor = 0
@@ -10,7 +26,7 @@ class Flor():
 
     def pedir_flor(self, quem_pediu, jogador1, jogador2, interface):
         """Pedido de flor, permitindo controlar os métodos de contraflor ou contraflor e resto."""
-        if (self.estado_atual != ""):
+        if (self.transicao(PEDE, "Flor") is None):
             return
             
         else:
@@ -23,21 +39,18 @@ class Flor():
             jogador1.pediu_flor = True
             
         if (jogador1.flor and jogador2.flor):
-            if (jogador2.pontos < int((jogador1.pontos/1.5))):
-                self.estado_atual = "Contraflor e Resto"
-                if self.decisao_jogador(): 
-                    self.contraflor_resto(2, jogador1, jogador2)
-
-                else:
-                    jogador2.pontos += 4
-
-            else: 
-                self.estado_atual = "Contraflor"
-                if self.decisao_jogador(): 
+            contraflor = "Contraflor e Resto" if jogador2.pontos < int((jogador1.pontos/1.5)) else "Contraflor"
+            pontos_recusa = self.transicao(PEDE, contraflor)[1]
+            self.estado_atual = contraflor
+            if self.decisao_jogador(jogador1): 
+                if (contraflor == "Contraflor"):
                     self.contraflor(2, jogador1, jogador2)
 
                 else:
-                    jogador2.pontos += 4
+                    self.contraflor_resto(2, jogador1, jogador2)
+
+            else:
+                jogador2.pontos += pontos_recusa
             
         elif (jogador1.flor):
             jogador1.pontos += self.valor_flor
@@ -53,7 +66,7 @@ class Flor():
 
 
     def contraflor(self, quem_pediu, jogador1, jogador2):
-        self.valor_flor = 6
+        self.valor_flor = self.transicao(RESPONDE, 1, "Contraflor")[2]
         jogador1_pontos = jogador1.retorna_pontos_envido()
         jogador2_pontos = jogador2.retorna_pontos_envido()
 
@@ -89,11 +102,10 @@ class Flor():
             self.quem_venceu_flor = 2
 
 
-    def decisao_jogador(self):
-        escolha = -1
-        while (escolha not in [0, 1]):
-            escolha = int(input(f"Jogador 1, você aceita o pedido de {self.estado_atual}?\n[0] Não\n[1] Sim"))
-        
+    def decisao_jogador(self, jogador1=None):
+        """Pergunta ao agente do jogador 1 se aceita a contraflor (ou contraflor e resto) pedida pelo jogador 2."""
+        opcoes = self.acoes_validas(RESPONDE, "Contraflor")
+        escolha = perguntar(self.agentes[1], Pergunta('flor', 1, jogador1, None, opcoes, self.estado_atual, self.valor_flor, padrao=1))
         if (escolha == 0):
             return False
         
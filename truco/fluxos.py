@@ -0,0 +1,41 @@
+import numpy as np
+
+from .baralho import CARTAS_POR_MAO, BaralhoIndices
+
+# Fluxos aleatórios de cada partida. Cada fluxo é derivado da semente mestre pela chave (partida, fluxo, índice),
+# e não da ordem em que as partidas são jogadas, o que permite dividir um torneio entre processos de forma reprodutível.
+# Os agentes também precisam decidir igual em todos os processos: o CBR dos trabalhadores usa um motor de busca fixo
+# (torneio.BUSCA_TORNEIO), e não um calibrado em cada processo.
+FLUXO_BARALHO = 0
+FLUXO_AGENTE = 1
+
+
+def semente_mestre(semente=None):
+    """Retorna a semente mestre informada ou, sem semente, uma sorteada pela entropia do sistema (que pode ser registrada
+    para reproduzir a execução)."""
+    return np.random.SeedSequence(semente).entropy
+
+
+def chave_partida(semente, partida):
+    """Chave do Philox (duas palavras de 64 bits) dos baralhos da partida, derivada de (semente mestre, partida)."""
+    return np.random.SeedSequence(semente, spawn_key=(partida, FLUXO_BARALHO, 0)).generate_state(2, np.uint64)
+
+
+def gerador_mao(chave, mao):
+    """Gerador do baralho de uma mão: Philox com a chave da partida e o número da mão na palavra mais alta do contador.
+    Como o Philox é baseado em contador, o gerador de qualquer mão é obtido diretamente, sem gerar as mãos anteriores."""
+    return np.random.Generator(np.random.Philox(counter=np.array([0, 0, 0, mao], dtype=np.uint64), key=chave))
+
+
+def semente_agente(semente, partida, assento):
+    """Semente inteira do gerador próprio do agente do assento informado (1 ou 2) na partida."""
+    estado = np.random.SeedSequence(semente, spawn_key=(partida, FLUXO_AGENTE, assento)).generate_state(2, np.uint64)
+    return (int(estado[0]) << 64) | int(estado[1])
+
+
+def distribuir_mao(semente, partida, mao):
+    """Regenera as 6 cartas (códigos) distribuídas na mão informada da partida, sem jogar as mãos anteriores:
+    as três primeiras são do jogador 1 e as três últimas do jogador 2."""
+    baralho = BaralhoIndices()
+    baralho.embaralhar(gerador_mao(chave_partida(semente, partida), mao))
+    return baralho.ordem[:CARTAS_POR_MAO].copy()
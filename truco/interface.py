@@ -76,6 +76,18 @@ class Interface():
              self.border_msg(f"Jogador 2 - {jogador2}: Venceu o envido com {jogador2_pontos} pontos\nJogador 1 - {jogador1}: PERDEU o envido com {jogador1_pontos} pontos", title='Jogador 2 Vencedor Envido')
 
 
+    def mostrar_aposta(self, mensagem):
+        """Exibe os pedidos e as respostas de truco, envido e flor."""
+        print(mensagem)
+
+
+    def mostrar_opcoes_jogada(self, jogador, quem, opcoes):
+        """Exibe as cartas da mão e as demais jogadas possíveis para o jogador."""
+        print(f"\n<< {jogador} - Jogador {quem} >>")
+        for codigo, descricao in opcoes.items():
+            print(f"[{codigo}] {descricao}")
+
+
     def mostrar_ganhador_jogo(self, jogador):
         """Exibe o jogador que obteu a pontuação necessária para vencer o jogo."""
         print(f"\n{jogador} ganhou o jogo")
@@ -130,4 +142,14 @@ class Interface():
         print('\n'.join(map('  '.join, zip(*(self.desenhar_cartas(c) for c in cartas)))))
 
     def exibir_unica_carta(self, carta):
-        print('\n'.join(map('  '.join, zip(*(self.desenhar_cartas(carta))))))
\ No newline at end of file
+        print('\n'.join(map('  '.join, zip(*(self.desenhar_cartas(carta))))))
+
+
+class InterfaceSilenciosa():
+    """Interface que descarta todas as mensagens, utilizada nas partidas simuladas."""
+    def __getattr__(self, nome):
+        return self._ignorar
+
+
+    def _ignorar(self, *args, **kwargs):
+        pass
@@ -1,3 +1,6 @@
+from .maos import avaliar_mao
+
+
 class Jogador():
     def __init__(self, nome):
         self.nome = nome
@@ -71,6 +74,10 @@ class Jogador():
 
     def calcula_envido(self, mao):
         """Realização do cálculo de envido."""
+        avaliacao = avaliar_mao(mao)
+        if (avaliacao is not None):
+            return avaliacao.envido
+
         pontos_envido = []
 
         for i in range(len(mao)):
@@ -90,6 +97,10 @@ class Jogador():
     
     def checa_flor(self):
         """Verifica se o jogador possui flor em sua mão."""
+        avaliacao = avaliar_mao(self.mao)
+        if (avaliacao is not None):
+            return avaliacao.flor
+
         if all(carta.retornar_naipe() == self.mao[0].retornar_naipe() for carta in self.mao):
             # print('Flor do Jogador')
             return True
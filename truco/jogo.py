@@ -1,9 +1,13 @@
 from .baralho import Baralho
 from .jogador import Jogador
 from .bot import Bot
-from .pontos import MANILHA, CARTAS_VALORES
+from .carta import forca_carta, e_manilha, FORCA_CARTA
+import numpy as np
 import random
 
+# Força de cada carta indexada pelo código (0 a 39), para a resolução de rodadas em lote
+FORCA = np.array(FORCA_CARTA, dtype=np.int8)
+
 class Jogo():
     def __init__(self):
         self.rodadas = []
@@ -87,28 +91,24 @@ class Jogo():
 
     def verificar_carta_vencedora(self, carta_jogador_01, carta_jogador_02):
         """Verifica a carta vencedora entre as duas cartas escolhidas"""
-        if ((str(carta_jogador_01.numero)+" de "+carta_jogador_01.naipe) in MANILHA and (str(carta_jogador_02.numero)+" de "+carta_jogador_02.naipe) in MANILHA):
-            if MANILHA[str(carta_jogador_01.numero)+" de "+carta_jogador_01.naipe] > MANILHA[str(carta_jogador_02.numero)+" de "+carta_jogador_02.naipe]:
-                return carta_jogador_01
-           
-            elif (MANILHA[str(carta_jogador_02.numero)+" de "+carta_jogador_02.naipe] > MANILHA[str(carta_jogador_01.numero)+" de "+carta_jogador_01.naipe]):
-                return carta_jogador_02
-        
-        elif ((str(carta_jogador_01.numero)+" de "+carta_jogador_01.naipe) in MANILHA):
+        forca_01 = forca_carta(carta_jogador_01)
+        forca_02 = forca_carta(carta_jogador_02)
+        if (forca_01 > forca_02):
             return carta_jogador_01
-        
-        elif ((str(carta_jogador_02.numero)+" de "+carta_jogador_02.naipe) in MANILHA):
+
+        elif (forca_02 > forca_01):
             return carta_jogador_02
-        
-        else:
-            if (CARTAS_VALORES[str(carta_jogador_01.numero)] >= CARTAS_VALORES[str(carta_jogador_02.numero)]):
-                return carta_jogador_01
-        
-            elif (CARTAS_VALORES[str(carta_jogador_01.retornar_numero())] < CARTAS_VALORES[str(carta_jogador_02.retornar_numero())]):
-                return carta_jogador_02
-        
-            # else:
-            #     return "Empate"
+
+        # Empate entre cartas comuns favorece o jogador 1
+        elif (not e_manilha(carta_jogador_01)):
+            return carta_jogador_01
+
+
+    def verificar_cartas_vencedoras(self, cartas_jogador_01, cartas_jogador_02):
+        """Resolve várias rodadas de uma vez a partir dos códigos das cartas, retornando 1 ou 2 para o vencedor e 0 para empate."""
+        forca_01 = FORCA[np.asarray(cartas_jogador_01)]
+        forca_02 = FORCA[np.asarray(cartas_jogador_02)]
+        return np.where(forca_01 > forca_02, 1, np.where(forca_02 > forca_01, 2, 0)).astype(np.int8)
 
 
     def jogador_fugiu(self, jogador, jogador1, jogador2, pontos):
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Métodos de decisão do Cbr que podem ser pedidos em lote
+METODOS_DECISAO = ('jogar_carta', 'truco', 'envido')
+
+
+class Pedido():
+    """Pedido de decisão de um jogo: vetor do registro, método de decisão do Cbr e os argumentos desse método."""
+    __slots__ = ('consulta', 'decisao', 'argumentos')
+
+    def __init__(self, consulta, decisao, argumentos=()):
+        if (decisao not in METODOS_DECISAO):
+            raise ValueError(f"Decisão desconhecida: {decisao}. Opções: {', '.join(METODOS_DECISAO)}")
+
+        self.consulta = np.array(consulta, dtype=np.int16)
+        self.decisao = decisao
+        self.argumentos = tuple(argumentos)
+
+
+class FilaDecisoes():
+    """Fila que agrupa pedidos de decisão enviados individualmente e os resolve em lote no Cbr,
+    quando o lote atinge o tamanho máximo ou quando o prazo do pedido mais antigo expira."""
+    def __init__(self, cbr, tamanho_lote=64, prazo=0.002):
+        self.cbr = cbr
+        self.tamanho_lote = tamanho_lote
+        self.prazo = prazo
+        self.pendentes = []
+        self.encerrada = False
+        self.lotes = 0
+        self.pedidos = 0
+        self.condicao = threading.Condition()
+        self.executor = threading.Thread(target=self.executar, name='fila-decisoes', daemon=True)
+        self.executor.start()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *erro):
+        self.encerrar()
+
+
+    def submeter(self, consulta, decisao, *argumentos):
+        """Envia um pedido de decisão e retorna um Future com o resultado, preenchido quando o lote for processado."""
+        pedido = Pedido(consulta, decisao, argumentos)
+        futuro = Future()
+        with self.condicao:
+            if (self.encerrada):
+                raise RuntimeError('fila de decisões encerrada')
+
+            self.pendentes.append((pedido, futuro, time.monotonic()))
+            self.condicao.notify()
+
+        return futuro
+
+
+    def decidir(self, consulta, decisao, *argumentos):
+        """Envia um pedido de decisão e aguarda o seu resultado."""
+        return self.submeter(consulta, decisao, *argumentos).result()
+
+
+    def executar(self):
+        """Laço da thread da fila: espera o lote encher ou o prazo expirar e processa os pedidos acumulados."""
+        while (True):
+            with self.condicao:
+                while (not self.pendentes and not self.encerrada):
+                    self.condicao.wait()
+
+                if (not self.pendentes):
+                    return
+
+                limite = self.pendentes[0][2] + self.prazo
+                while (len(self.pendentes) < self.tamanho_lote and not self.encerrada):
+                    restante = limite - time.monotonic()
+                    if (restante <= 0):
+                        break
+
+                    self.condicao.wait(restante)
+
+                lote, self.pendentes = self.pendentes[:self.tamanho_lote], self.pendentes[self.tamanho_lote:]
+
+            self.processar(lote)
+
+
+    def processar(self, lote):
+        """Resolve um lote no Cbr e entrega cada resultado (ou o erro) ao Future do seu pedido."""
+        pedidos, futuros = [], []
+        for pedido, futuro, instante in lote:
+            if (futuro.set_running_or_notify_cancel()):
+                pedidos.append(pedido)
+                futuros.append(futuro)
+
+        try:
+            resultados = self.cbr.decidir_lote(pedidos)
+        except Exception as erro:
+            for futuro in futuros:
+                futuro.set_exception(erro)
+
+            return
+
+        for futuro, resultado in zip(futuros, resultados):
+            futuro.set_result(resultado)
+
+        self.lotes += 1
+        self.pedidos += len(pedidos)
+
+
+    def tamanho_medio_lote(self):
+        """Retorna a quantidade média de pedidos por lote processado."""
+        return self.pedidos / self.lotes if self.lotes else 0.0
+
+
+    def encerrar(self):
+        """Processa os pedidos pendentes e encerra a thread da fila."""
+        with self.condicao:
+            self.encerrada = True
+            self.condicao.notify()
+
+        self.executor.join()
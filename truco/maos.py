@@ -0,0 +1,118 @@
+import itertools
+import numpy as np
+from .carta import FORCA_CARTA, ENVIDO_CARTA, NAIPE_CODIGO_CARTA, codificar_carta
+
+# Tabela pré-calculada de todas as C(40, 3) = 9880 mãos possíveis, indexadas pelos códigos das cartas (ver truco.carta).
+# As tabelas por mão seguem a ordem crescente dos códigos; as tabelas "ordenadas" são indexadas pela chave
+# c0 * 1600 + c1 * 40 + c2 das cartas na ordem em que estão na mão, pois a classificação depende dessa ordem nos empates.
+CLASSIFICACOES = ('Alta', 'Media', 'Baixa')
+PERMUTACOES = tuple(itertools.permutations(range(3)))
+
+
+def _calcular_tabelas():
+    """Calcula as tabelas de avaliação de todas as mãos de forma vetorizada."""
+    maos = np.array(list(itertools.combinations(range(40), 3)), dtype=np.int16)
+    forca = np.array(FORCA_CARTA, dtype=np.int16)[maos]
+    envido = np.array(ENVIDO_CARTA, dtype=np.int16)[maos]
+    naipe = np.array(NAIPE_CODIGO_CARTA, dtype=np.int16)[maos]
+
+    # Envido: maior valor entre os pares de cartas, conforme Jogador.calcula_envido
+    pares = []
+    for i, j in [(0, 1), (0, 2), (1, 2)]:
+        mesmo_naipe = naipe[:, i] == naipe[:, j]
+        ambas_pontuam = (envido[:, i] > 0) & (envido[:, j] > 0)
+        pares.append(np.where(mesmo_naipe, np.where(ambas_pontuam, 20 + envido[:, i] + envido[:, j], 0), np.maximum(envido[:, i], envido[:, j])))
+
+    envido_mao = np.max(pares, axis=0).astype(np.int8)
+    flor_mao = (naipe[:, 0] == naipe[:, 1]) & (naipe[:, 1] == naipe[:, 2])
+    pontos_flor_mao = np.where(flor_mao, 20 + envido.sum(axis=1), 0).astype(np.int8)
+
+    # Qualidade: média harmônica usada por Bot.calcular_qualidade_mao, com as pontuações alta, média e baixa
+    ordenada = np.sort(forca, axis=1).astype(np.float64)
+    baixa, media, alta = ordenada[:, 0], ordenada[:, 1], ordenada[:, 2]
+    m1 = (2 / ((1/alta) + (1/media)))
+    m2 = ((2 * media) + (baixa)/2+1)
+    qualidade_mao = ((2 * m1) + m2) / (2+1)
+
+    # Classificação para cada ordem das cartas na mão, reproduzindo os desempates de Carta.classificar_carta
+    indice_ordenado = np.full(40 * 40 * 40, -1, dtype=np.int16)
+    classificacao_ordenada = np.full((40 * 40 * 40, 3), -1, dtype=np.int8)
+    linhas = np.arange(len(maos))
+    for permutacao in PERMUTACOES:
+        codigos = maos[:, permutacao]
+        f = forca[:, permutacao]
+        alta_01 = np.where(f[:, 0] > f[:, 1], 0, 1)
+        carta_alta = np.where(f[linhas, alta_01] > f[:, 2], alta_01, 2)
+        baixa_01 = np.where(f[:, 0] < f[:, 1], 0, 1)
+        carta_baixa = np.where(f[linhas, baixa_01] < f[:, 2], baixa_01, 2)
+        carta_alta = np.where(carta_alta == carta_baixa, 0, carta_alta)
+
+        classificacao = np.ones((len(maos), 3), dtype=np.int8)
+        classificacao[linhas, carta_alta] = 0
+        classificacao[linhas, carta_baixa] = 2
+
+        chave = codigos[:, 0].astype(np.int32) * 1600 + codigos[:, 1] * 40 + codigos[:, 2]
+        indice_ordenado[chave] = linhas
+        classificacao_ordenada[chave] = classificacao
+
+    return maos, forca.astype(np.int8), envido_mao, flor_mao, pontos_flor_mao, qualidade_mao, indice_ordenado, classificacao_ordenada
+
+
+MAOS, PONTOS_MAO, ENVIDO_MAO, FLOR_MAO, PONTOS_FLOR_MAO, QUALIDADE_MAO, INDICE_ORDENADO, CLASSIFICACAO_ORDENADA = _calcular_tabelas()
+
+# Cópias em listas do Python para as consultas individuais, que são mais rápidas que indexar arrays do NumPy
+_INDICE = INDICE_ORDENADO.tolist()
+_ENVIDO = ENVIDO_MAO.tolist()
+_FLOR = FLOR_MAO.tolist()
+_PONTOS_FLOR = PONTOS_FLOR_MAO.tolist()
+_QUALIDADE = QUALIDADE_MAO.tolist()
+_CLASSIFICACAO = [tuple(CLASSIFICACOES[c] for c in linha) if linha[0] >= 0 else None for linha in CLASSIFICACAO_ORDENADA.tolist()]
+
+
+class AvaliacaoMao():
+    """Avaliação de uma mão de três cartas, com os dados na ordem em que as cartas estão na mão."""
+    __slots__ = ('indice', 'envido', 'flor', 'pontos_flor', 'pontos', 'classificacao', 'qualidade')
+
+    def __init__(self, indice, envido, flor, pontos_flor, pontos, classificacao, qualidade):
+        self.indice = indice
+        self.envido = envido
+        self.flor = flor
+        self.pontos_flor = pontos_flor
+        self.pontos = pontos
+        self.classificacao = classificacao
+        self.qualidade = qualidade
+
+
+def chave_mao(codigos):
+    """Retorna a chave das tabelas ordenadas para os três códigos de carta, na ordem da mão."""
+    return codigos[0] * 1600 + codigos[1] * 40 + codigos[2]
+
+
+def indice_mao(codigos):
+    """Retorna o índice (0 a 9879) da mão formada pelos três códigos, ou -1 caso haja cartas repetidas."""
+    return _INDICE[chave_mao(codigos)]
+
+
+def indices_lote(codigos):
+    """Versão vetorizada de indice_mao: recebe um array (n, 3) de códigos, como as colunas de BaralhoIndices.distribuir_lote,
+    e retorna os índices das mãos, que indexam diretamente ENVIDO_MAO, FLOR_MAO, QUALIDADE_MAO e as demais tabelas por mão."""
+    codigos = np.asarray(codigos, dtype=np.int32)
+    return INDICE_ORDENADO[codigos[:, 0] * 1600 + codigos[:, 1] * 40 + codigos[:, 2]]
+
+
+def avaliar_mao(cartas):
+    """Avalia uma mão de três cartas em O(1) pela tabela, ou retorna None caso a mão não esteja na tabela."""
+    if (len(cartas) != 3):
+        return None
+
+    codigos = [codificar_carta(carta.numero, carta.naipe) for carta in cartas]
+    if (None in codigos):
+        return None
+
+    chave = chave_mao(codigos)
+    indice = _INDICE[chave]
+    if (indice < 0):
+        return None
+
+    pontos = [FORCA_CARTA[codigo] for codigo in codigos]
+    return AvaliacaoMao(indice, _ENVIDO[indice], _FLOR[indice], _PONTOS_FLOR[indice], pontos, list(_CLASSIFICACAO[chave]), _QUALIDADE[indice])
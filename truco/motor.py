@@ -0,0 +1,262 @@
+from .agentes import AgenteJogador, Pergunta, perguntar
+from .apostas import PEDE
+from .baralho import BaralhoIndices
+from .envido import Envido
+from .estado import EstadoJogo
+from .flor import Flor
+from .fluxos import chave_partida, gerador_mao, semente_agente, semente_mestre
+from .interface import InterfaceSilenciosa
+from .jogo import Jogo
+from .truco import Truco
+
+# Jogadas especiais, além dos índices das cartas da mão
+JOGADAS_ESPECIAIS = {4: 'Truco', 5: 'Flor', 6: 'Envido', 7: 'Real Envido', 8: 'Falta Envido', 9: 'Ir ao baralho'}
+
+
+class Motor():
+    """Motor do jogo sem entrada nem saída: as decisões são pedidas aos agentes de cada posição (veja agentes.Pergunta)
+    e os acontecimentos da partida são enviados à interface. O jogo no terminal é um AgenteTerminal com a Interface;
+    a simulação usa AgenteJogador nas duas posições com a InterfaceSilenciosa."""
+    def __init__(self, jogador1, jogador2, agentes=None, cbr1=None, cbr2=None, interface=None, semente=None, pontos_vitoria=12,
+                 limite_maos=1000, ao_encerrar_mao=None):
+        self.jogo = Jogo()
+        self.interface = interface or InterfaceSilenciosa()
+        self.jogador1 = jogador1
+        self.jogador2 = jogador2
+        self.cbr = {1: cbr1, 2: cbr2}
+        self.agentes = agentes or {1: AgenteJogador(cbr1), 2: AgenteJogador(cbr2)}
+        # Os baralhos de cada mão vêm de fluxos derivados de (semente mestre, partida, mão); veja truco.fluxos
+        self.semente = semente_mestre(semente)
+        self.baralho = BaralhoIndices()
+        self.pontos_vitoria = pontos_vitoria
+        self.limite_maos = limite_maos
+        self.ao_encerrar_mao = ao_encerrar_mao
+        self.estado = EstadoJogo()
+        self.truco = Truco(self.agentes, self.interface, self.estado)
+        self.envido = Envido(self.agentes, self.interface, self.estado)
+        self.flor = Flor(self.agentes, self.interface, self.estado)
+        self.proxima_partida = 0
+        self.iniciar_partida(0)
+
+
+    def iniciar_partida(self, partida):
+        """Prepara os fluxos aleatórios da partida informada: a chave dos baralhos e a semente dos agentes com gerador próprio."""
+        self.partida = partida
+        self.numero_mao = 0
+        self.chave = chave_partida(self.semente, partida)
+        for assento in (1, 2):
+            semear = getattr(self.jogador(assento), 'semear', None)
+            if (semear is not None):
+                semear(semente_agente(self.semente, partida, assento))
+
+
+    def jogar_partida(self, partida=None):
+        """Joga uma partida completa, alternando quem é mão, até um jogador alcançar os pontos de vitória.
+        Partidas com o mesmo número (por padrão, a seguinte à última jogada) e a mesma semente mestre são idênticas."""
+        self.iniciar_partida(self.proxima_partida if partida is None else partida)
+        self.proxima_partida = self.partida + 1
+        self.jogador1.pontos = 0
+        self.jogador2.pontos = 0
+        maos = 0
+        while (not self.partida_encerrada()):
+            if (maos >= self.limite_maos):
+                raise RuntimeError(f"Partida não terminou após {self.limite_maos} mãos.")
+
+            self.numero_mao = maos
+            self.jogar_mao(1 if maos % 2 == 0 else 2)
+            maos += 1
+            self.interface.mostrar_placar_total(self.jogador1.nome, self.jogador1.pontos, self.jogador2.nome, self.jogador2.pontos)
+            if (self.ao_encerrar_mao is not None):
+                self.ao_encerrar_mao(self)
+
+        vencedor = 1 if self.jogador1.pontos >= self.pontos_vitoria else 2
+        self.interface.mostrar_ganhador_jogo(self.jogador(vencedor).nome)
+        return vencedor, maos
+
+
+    def partida_encerrada(self):
+        """Verifica se algum dos jogadores já alcançou os pontos de vitória."""
+        return self.jogador1.pontos >= self.pontos_vitoria or self.jogador2.pontos >= self.pontos_vitoria
+
+
+    def jogar_mao(self, quem_comeca):
+        """Distribui as cartas e joga as rodadas de uma mão, até alguém vencer duas rodadas ou fugir."""
+        self.preparar_mao(quem_comeca)
+        primeiro = quem_comeca
+        while True:
+            cartas = {}
+            carta = self.turno(primeiro, None)
+            if (carta is None):
+                return
+
+            cartas[primeiro] = carta
+            carta = self.turno(3 - primeiro, carta)
+            if (carta is None):
+                return
+
+            cartas[3 - primeiro] = carta
+            ganhador = self.jogo.verificar_ganhador(cartas[1], cartas[2], self.interface)
+            self.jogo.quem_joga_primeiro(self.jogador1, self.jogador2, cartas[1], cartas[2], ganhador)
+            vencedor = self.jogo.adicionar_rodada(self.jogador1, self.jogador2, cartas[1], cartas[2], ganhador)
+            self.enriquecer(cartas, vencedor)
+            self.estado.registrar_rodada(vencedor)
+
+            if (self.jogador1.rodadas == 2 or self.jogador2.rodadas == 2):
+                self.jogador(vencedor).adicionar_pontos(self.truco.retornar_valor_aposta())
+                self.estado.registrar_jogadores(self.jogador1, self.jogador2)
+                self.interface.mostrar_ganhador_rodada(self.jogador(vencedor).nome)
+                return
+
+            if (self.partida_encerrada()):
+                return
+
+            self.interface.mostrar_placar_rodadas(self.jogador1.nome, self.jogador1.rodadas, self.jogador2.nome, self.jogador2.rodadas)
+            primeiro = vencedor
+
+
+    def preparar_mao(self, quem_comeca=1):
+        """Reinicia jogadores, apostas e baralho para uma nova mão."""
+        self.jogador1.resetar()
+        self.jogador2.resetar()
+        self.truco.resetar()
+        self.envido.resetar()
+        self.flor.resetar_flor()
+        for quem in (1, 2):
+            dados = self.dados(quem)
+            if (dados is not None):
+                dados.resetar()
+
+        self.baralho.embaralhar(gerador_mao(self.chave, self.numero_mao))
+        for jogador in (self.jogador1, self.jogador2):
+            jogador.criar_mao(self.baralho)
+            jogador.flor = jogador.checa_flor()
+            jogador.pediu_flor = False
+
+        self.estado.nova_mao(quem_comeca)
+        self.estado.registrar_jogadores(self.jogador1, self.jogador2)
+
+
+    def opcoes_jogada(self, quem):
+        """Jogadas válidas do jogador na sua vez: as cartas da mão, os pedidos de aposta ainda possíveis e ir ao baralho."""
+        jogador = self.jogador(quem)
+        mao = jogador.checa_mao()
+        opcoes = {i: carta.retornar_carta() for i, carta in enumerate(mao)}
+        if (jogador.pediu_truco is False):
+            opcoes[4] = JOGADAS_ESPECIAIS[4]
+
+        if (len(mao) == 3 and jogador.flor and jogador.pediu_flor is False):
+            opcoes[5] = JOGADAS_ESPECIAIS[5]
+
+        if (len(mao) == 3 and self.flor.estado_atual == ""):
+            opcoes.update(self.envido.acoes_validas(PEDE))
+
+        opcoes[9] = JOGADAS_ESPECIAIS[9]
+        return opcoes
+
+
+    def turno(self, quem, carta_adversario):
+        """Turno de um jogador: trata os pedidos de aposta e retorna a carta jogada, ou None caso a mão termine."""
+        jogador = self.jogador(quem)
+        adversario = self.jogador(3 - quem)
+        if (len(jogador.checa_mao()) == 3):
+            dados = self.dados(quem)
+            if (carta_adversario is not None and dados is not None):
+                jogador.enriquecer_bot(dados=dados, carta_jogador_01=carta_adversario)
+
+            self.oferecer_envido(quem)
+
+        for _ in range(10):
+            self.estado.registrar_jogadores(self.jogador1, self.jogador2)
+            pergunta = Pergunta('jogada', quem, jogador, self.cbr[quem], self.opcoes_jogada(quem), self.truco)
+            escolha = perguntar(self.agentes[quem], pergunta)
+            if (escolha == 4):
+                jogador.pediu_truco = True
+                if (self.truco.controlador_truco(self.cbr[3 - quem], None, quem, self.jogador1, self.jogador2) is False):
+                    self.interface.mostrar_placar_total_jogador_fugiu(adversario, self.jogador1.nome, self.jogador1.pontos, self.jogador2.nome, self.jogador2.pontos)
+                    return None
+
+            elif (escolha == 5):
+                if (len(jogador.checa_mao()) == 3):
+                    self.flor.pedir_flor(quem, self.jogador1, self.jogador2, self.interface)
+
+                jogador.pediu_flor = True
+
+            elif (escolha in (6, 7, 8)):
+                if (len(jogador.checa_mao()) == 3):
+                    self.pedir_envido(quem, escolha)
+
+            elif (escolha == 9):
+                adversario.adicionar_pontos(self.truco.retornar_valor_aposta())
+                self.interface.mostrar_placar_total_jogador_fugiu(jogador, self.jogador1.nome, self.jogador1.pontos, self.jogador2.nome, self.jogador2.pontos)
+                return None
+
+            elif (-len(jogador.checa_mao()) <= escolha < len(jogador.checa_mao())):
+                # Índices negativos acompanham o ajuste de índices feito pelo próprio bot
+                carta = jogador.mao.pop(escolha)
+                self.estado.registrar_carta(quem, carta)
+                self.interface.mostrar_carta_jogada(jogador.nome, carta)
+                return carta
+
+        raise RuntimeError(f"O agente {jogador.nome} não escolheu uma jogada válida.")
+
+
+    def oferecer_envido(self, quem):
+        """Permite que o jogador peça envido antes de jogar sua primeira carta; a flor bloqueia o envido."""
+        if (self.envido.estado_atual != 0 or self.flor.estado_atual != ""):
+            return
+
+        adversario = self.jogador(3 - quem)
+        pergunta = Pergunta('pedir_envido', quem, self.jogador(quem), self.cbr[quem], pontos=adversario.pontos)
+        escolha = perguntar(self.agentes[quem], pergunta)
+        if (not escolha):
+            return
+
+        self.pedir_envido(quem, escolha if escolha in [6, 7, 8] else 6)
+
+
+    def pedir_envido(self, quem, tipo):
+        """Pede o envido do tipo informado; se algum jogador tem flor, a flor é cantada no lugar do envido."""
+        if (self.envido.estado_atual != 0 or self.flor.estado_atual != ""):
+            return
+
+        if (self.jogador1.flor or self.jogador2.flor):
+            self.flor.pedir_flor(1 if self.jogador1.flor else 2, self.jogador1, self.jogador2, self.interface)
+            return
+
+        self.envido.controlador_envido(self.cbr[3 - quem], None, tipo, quem, self.jogador1, self.jogador2, self.interface)
+
+
+    def enriquecer(self, cartas, vencedor):
+        """Enriquece o registro de cada bot com as cartas da rodada, do ponto de vista do próprio bot."""
+        for quem in (1, 2):
+            dados = self.dados(quem)
+            if (dados is not None):
+                ganhador = 2 if vencedor == quem else 1
+                self.jogador(quem).enriquecer_bot(dados, cartas[3 - quem], cartas[quem], ganhador)
+
+
+    def instantaneo(self):
+        """Cópia do estado atual da mão, com as mãos e o placar dos jogadores atualizados."""
+        self.estado.registrar_jogadores(self.jogador1, self.jogador2)
+        return self.estado.clone()
+
+
+    def usar_estado(self, estado):
+        """Passa a usar o estado informado (por exemplo, um instantâneo anterior) no motor e nas classes de regras."""
+        self.estado = estado
+        self.truco.estado = estado
+        self.envido.estado = estado
+        self.flor.estado = estado
+
+
+    def jogador(self, quem):
+        """Retorna o jogador da posição informada (1 ou 2)."""
+        if (quem == 1):
+            return self.jogador1
+
+        return self.jogador2
+
+
+    def dados(self, quem):
+        """Retorna os dados do CBR utilizado pelo jogador da posição informada, se houver."""
+        return getattr(self.cbr[quem], 'dados', None)
@@ -0,0 +1,112 @@
+import threading
+import numpy as np
+
+
+class EstadoBase():
+    """Fotografia imutável da base: matriz e motor do índice principal, buffer delta dos casos retidos e versão do índice."""
+    __slots__ = ('matriz', 'motor', 'delta', 'versao')
+
+    def __init__(self, matriz, motor, delta, versao):
+        self.matriz = matriz
+        self.motor = motor
+        self.delta = delta
+        self.versao = versao
+
+
+class BaseIncremental():
+    """Base de casos com retenção online: os casos novos vão para um buffer delta buscado junto com o índice principal
+    e, ao passar do limite, são compactados em um novo índice construído em segundo plano e trocado de uma só vez."""
+    def __init__(self, matriz, motor, criar_motor, limite_compactacao=256, em_segundo_plano=True):
+        delta = np.empty((0, matriz.shape[1]), dtype=matriz.dtype)
+        self.estado = EstadoBase(matriz, motor, delta, 0)
+        self.criar_motor = criar_motor
+        self.limite_compactacao = limite_compactacao
+        self.em_segundo_plano = em_segundo_plano
+        self.trava = threading.Lock()
+        self.compactacao = None
+        self.compactacoes = 0
+
+
+    def adicionar(self, caso):
+        """Adiciona um caso ao buffer delta, disparando a compactação quando o buffer atinge o limite."""
+        caso = np.asarray(caso, dtype=self.estado.matriz.dtype).reshape(1, -1)
+        with self.trava:
+            estado = self.estado
+            delta = np.concatenate([estado.delta, caso])
+            delta.flags.writeable = False
+            self.estado = EstadoBase(estado.matriz, estado.motor, delta, estado.versao)
+            compactar = len(delta) >= self.limite_compactacao and self.compactacao is None
+            if (compactar):
+                self.compactacao = threading.Thread(target=self.compactar, name='compactacao-casos', daemon=True)
+
+        if (compactar):
+            if (self.em_segundo_plano):
+                self.compactacao.start()
+            else:
+                self.compactar()
+
+        return len(delta)
+
+
+    def compactar(self):
+        """Reconstrói o índice principal com os casos do buffer e o troca atomicamente, mantendo no buffer os casos que chegaram durante a construção."""
+        try:
+            estado = self.estado
+            retidos = len(estado.delta)
+            matriz = np.concatenate([estado.matriz, estado.delta])
+            matriz.flags.writeable = False
+            motor = self.criar_motor(matriz)
+            with self.trava:
+                atual = self.estado
+                self.estado = EstadoBase(matriz, motor, atual.delta[retidos:], atual.versao + 1)
+                self.compactacoes += 1
+
+        finally:
+            with self.trava:
+                self.compactacao = None
+
+
+    def aguardar_compactacao(self, timeout=None):
+        """Aguarda a compactação em andamento, se houver."""
+        compactacao = self.compactacao
+        if (compactacao is not None and compactacao is not threading.current_thread() and compactacao.is_alive()):
+            compactacao.join(timeout)
+
+
+    def pendentes(self):
+        """Retorna a quantidade de casos no buffer delta, ainda fora do índice principal."""
+        return len(self.estado.delta)
+
+
+    def vizinhos(self, consulta):
+        """Retorna os índices e os casos vizinhos da consulta, mesclando pela distância o índice principal e o buffer delta."""
+        estado = self.estado
+        distancias, indices = estado.motor.kneighbors(consulta.reshape(1, -1))
+        return self.mesclar(estado, consulta, np.asarray(indices)[0])
+
+
+    def vizinhos_lote(self, consultas):
+        """Retorna os índices (lote, k) e os casos (lote, k, colunas) vizinhos de várias consultas, com uma única busca no índice principal."""
+        estado = self.estado
+        distancias, indices = estado.motor.kneighbors(consultas)
+        indices = np.asarray(indices)
+        if (len(estado.delta) == 0):
+            return indices, estado.matriz[indices]
+
+        mescladas = [self.mesclar(estado, consulta, linha) for consulta, linha in zip(consultas, indices)]
+        return np.array([indices for indices, casos in mescladas]), np.array([casos for indices, casos in mescladas])
+
+
+    def mesclar(self, estado, consulta, indices):
+        """Mescla os vizinhos do índice principal com os casos do buffer delta, mantendo os k mais próximos."""
+        if (len(estado.delta) == 0):
+            return indices, estado.matriz[indices]
+
+        # Distâncias exatas em inteiros, para que empates entre o índice e o buffer sejam resolvidos pelo menor índice
+        casos = np.concatenate([estado.matriz[indices], estado.delta])
+        posicoes = np.concatenate([indices, len(estado.matriz) + np.arange(len(estado.delta))])
+        diferencas = casos.astype(np.int64) - consulta.astype(np.int64)
+        distancias2 = np.einsum('ij,ij->i', diferencas, diferencas)
+        k = min(getattr(estado.motor, 'n_neighbors', len(indices)), len(casos))
+        ordem = np.lexsort((posicoes, distancias2))[:k]
+        return posicoes[ordem], casos[ordem]
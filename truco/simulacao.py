@@ -0,0 +1,233 @@
+import argparse
+import random
+import time
+
+from .agentes import AgenteJogador
+from .bot import Bot
+from .interface import InterfaceSilenciosa
+from .maos import avaliar_mao
+from .motor import Motor
+
+
+class BotAleatorio(Bot):
+    """Agente que escolhe cartas e respostas de apostas ao acaso, a partir de uma semente própria."""
+    def __init__(self, nome, semente=None, chance_truco=0.3, chance_envido=0.3):
+        super().__init__(nome)
+        self.rng = random.Random(semente)
+        self.chance_truco = chance_truco
+        self.chance_envido = chance_envido
+
+
+    def semear(self, semente):
+        """Reinicia o gerador do agente; o motor chama no início de cada partida com a semente do fluxo do assento."""
+        self.rng.seed(semente)
+
+
+    def jogar_carta(self, cbr, truco):
+        """Escolhe ao acaso entre pedir flor, pedir truco ou jogar uma das cartas da mão."""
+        if (len(self.mao) == 3 and self.flor and self.pediu_flor is False):
+            return 5
+
+        if (len(self.mao) <= 2 and self.pediu_truco is False and self.rng.random() < self.chance_truco):
+            self.pediu_truco = True
+            return 4
+
+        escolha = self.rng.randrange(len(self.mao))
+        self.ajustar_indices(escolha)
+        self.rodada += 1
+        return escolha
+
+
+    def avaliar_truco(self, cbr, tipo, quem_pediu):
+        """Recusa, aceita ou aumenta a aposta ao acaso."""
+        return self.rng.choice([0, 1, 2])
+
+
+    def avaliar_envido(self, cbr, tipo, quem_pediu, pontos_totais_adversario):
+        """Decide ao acaso se pede envido ou como responde a um pedido."""
+        if (tipo == 6):
+            return self.rng.choice([0, 1, 2, 3])
+
+        if (tipo == 7):
+            return self.rng.choice([0, 1, 2])
+
+        if (tipo == 8):
+            return self.rng.choice([0, 1])
+
+        return int(self.rng.random() < self.chance_envido)
+
+
+    def avaliar_flor(self, cbr, estado):
+        """Aceita a contraflor ao acaso."""
+        return self.rng.random() < 0.5
+
+
+class BotRoteirizado(Bot):
+    """Agente determinístico: joga sempre a carta mais forte e aposta conforme limites fixos."""
+    def __init__(self, nome, limite_truco=20, limite_envido=27, limite_flor=30):
+        super().__init__(nome)
+        self.limite_truco = limite_truco
+        self.limite_envido = limite_envido
+        self.limite_flor = limite_flor
+
+
+    def jogar_carta(self, cbr, truco):
+        """Pede flor quando possível, pede truco com mão boa e joga a carta de maior pontuação."""
+        if (len(self.mao) == 3 and self.flor and self.pediu_flor is False):
+            return 5
+
+        if (len(self.mao) <= 2 and self.pediu_truco is False and self.qualidade_mao >= self.limite_truco):
+            self.pediu_truco = True
+            return 4
+
+        escolha = self.pontuacao_cartas.index(max(self.pontuacao_cartas))
+        self.ajustar_indices(escolha)
+        self.rodada += 1
+        return escolha
+
+
+    def avaliar_truco(self, cbr, tipo, quem_pediu):
+        """Aceita o truco apenas com mão acima do limite."""
+        if (self.qualidade_mao >= self.limite_truco):
+            return 1
+
+        return 0
+
+
+    def avaliar_envido(self, cbr, tipo, quem_pediu, pontos_totais_adversario):
+        """Pede ou aceita o envido apenas com pontos acima do limite."""
+        if (self.envido >= self.limite_envido):
+            return 1
+
+        return 0
+
+
+    def avaliar_flor(self, cbr, estado):
+        """Aceita a contraflor apenas com pontos de flor acima do limite."""
+        avaliacao = avaliar_mao(self.mao)
+        return avaliacao is not None and avaliacao.pontos_flor >= self.limite_flor
+
+
+class ResultadoPartida():
+    """Resultado de uma partida simulada."""
+    def __init__(self, vencedor, pontos_jogador1, pontos_jogador2, maos):
+        self.vencedor = vencedor
+        self.pontos = {1: pontos_jogador1, 2: pontos_jogador2}
+        self.maos = maos
+
+
+class ResumoSimulacao():
+    """Acumula vitórias, pontos e mãos jogadas de um conjunto de partidas simuladas."""
+    def __init__(self):
+        self.partidas = 0
+        self.vitorias = {1: 0, 2: 0}
+        self.pontos = {1: 0, 2: 0}
+        self.maos = 0
+        self.duracao = 0.0
+
+
+    def adicionar(self, resultado):
+        """Adiciona o resultado de uma partida ao resumo."""
+        self.partidas += 1
+        self.vitorias[resultado.vencedor] += 1
+        self.pontos[1] += resultado.pontos[1]
+        self.pontos[2] += resultado.pontos[2]
+        self.maos += resultado.maos
+
+
+    def combinar(self, outro):
+        """Soma outro resumo a este, mantendo a duração mais longa (execuções em paralelo)."""
+        self.partidas += outro.partidas
+        self.vitorias[1] += outro.vitorias[1]
+        self.vitorias[2] += outro.vitorias[2]
+        self.pontos[1] += outro.pontos[1]
+        self.pontos[2] += outro.pontos[2]
+        self.maos += outro.maos
+        self.duracao = max(self.duracao, outro.duracao)
+
+
+    def maos_por_segundo(self):
+        """Retorna a vazão da simulação em mãos por segundo."""
+        if (self.duracao <= 0):
+            return 0.0
+
+        return self.maos / self.duracao
+
+
+    def partidas_por_segundo(self):
+        """Retorna a vazão da simulação em partidas por segundo."""
+        if (self.duracao <= 0):
+            return 0.0
+
+        return self.partidas / self.duracao
+
+
+    def __repr__(self):
+        return (f"ResumoSimulacao(partidas={self.partidas}, vitorias={self.vitorias}, pontos={self.pontos}, "
+                f"maos={self.maos}, maos_por_segundo={self.maos_por_segundo():.1f})")
+
+
+class Simulador(Motor):
+    """Executa partidas completas entre dois agentes, sem ler do terminal nem exibir mensagens."""
+    def __init__(self, jogador1, jogador2, cbr1=None, cbr2=None, semente=None, pontos_vitoria=12, limite_maos=1000):
+        agentes = {1: AgenteJogador(cbr1), 2: AgenteJogador(cbr2)}
+        super().__init__(jogador1, jogador2, agentes, cbr1, cbr2, InterfaceSilenciosa(), semente, pontos_vitoria, limite_maos)
+
+
+    def simular(self, partidas, primeira_partida=0):
+        """Joga as partidas numeradas a partir de primeira_partida e retorna o resumo dos resultados."""
+        resumo = ResumoSimulacao()
+        inicio = time.perf_counter()
+        for partida in range(primeira_partida, primeira_partida + partidas):
+            resumo.adicionar(self.jogar_partida(partida))
+
+        resumo.duracao = time.perf_counter() - inicio
+        return resumo
+
+
+    def jogar_partida(self, partida=None):
+        """Joga uma partida completa e retorna o seu resultado."""
+        vencedor, maos = super().jogar_partida(partida)
+        return ResultadoPartida(vencedor, self.jogador1.pontos, self.jogador2.pontos, maos)
+
+
+def criar_agente(tipo, nome, semente=None):
+    """Cria um agente a partir do seu tipo: 'bot', 'aleatorio' ou 'roteirizado'."""
+    if (tipo == 'bot'):
+        return Bot(nome)
+
+    if (tipo == 'aleatorio'):
+        return BotAleatorio(nome, semente)
+
+    if (tipo == 'roteirizado'):
+        return BotRoteirizado(nome)
+
+    raise ValueError(f"Tipo de agente desconhecido: {tipo}")
+
+
+def main(argumentos=None):
+    """Executa uma simulação pela linha de comando e exibe o resumo."""
+    parser = argparse.ArgumentParser(description='Simulação de partidas de truco entre agentes, sem interação.')
+    parser.add_argument('--partidas', type=int, default=10)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--agente1', default='bot', choices=['bot', 'aleatorio', 'roteirizado'])
+    parser.add_argument('--agente2', default='aleatorio', choices=['bot', 'aleatorio', 'roteirizado'])
+    args = parser.parse_args(argumentos)
+
+    jogador1 = criar_agente(args.agente1, 'Jogador 1', args.semente)
+    jogador2 = criar_agente(args.agente2, 'Jogador 2', None if args.semente is None else args.semente + 1)
+    cbr1 = cbr2 = None
+    if ('bot' in (args.agente1, args.agente2)):
+        # Um único CBR (base e índice ajustados uma vez); o segundo bot usa uma cópia com registro próprio
+        from .cbr import Cbr
+        cbr = Cbr()
+        cbr1 = cbr if args.agente1 == 'bot' else None
+        cbr2 = (cbr.compartilhado() if cbr1 is not None else cbr) if args.agente2 == 'bot' else None
+
+    resumo = Simulador(jogador1, jogador2, cbr1, cbr2, semente=args.semente).simular(args.partidas)
+    print(resumo)
+    return resumo
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .simulacao import Simulador, ResumoSimulacao, criar_agente
+
+# Estado de cada processo trabalhador: a base de casos é carregada uma única vez por processo
+_CONTEXTO = {}
+
+# Motor de busca do CBR nos trabalhadores. É fixo, e não calibrado em cada processo, porque os motores desempatam vizinhos
+# à mesma distância de formas diferentes; a busca bruta desempata pelo índice do caso, então o resultado não depende do processo
+BUSCA_TORNEIO = 'bruta'
+
+
+def _inicializar_trabalhador(agente1, agente2):
+    """Inicializa o processo trabalhador, carregando o CBR dos agentes do tipo 'bot' uma única vez."""
+    _CONTEXTO.clear()
+    _CONTEXTO['cbr'] = {1: None, 2: None}
+    if ('bot' in (agente1, agente2)):
+        # Um único CBR por processo, como em simulacao.main; o segundo bot usa uma cópia com registro próprio
+        from .cbr import Cbr
+        cbr = Cbr(busca=BUSCA_TORNEIO)
+        if (agente1 == 'bot'):
+            _CONTEXTO['cbr'][1] = cbr
+
+        if (agente2 == 'bot'):
+            _CONTEXTO['cbr'][2] = cbr.compartilhado() if agente1 == 'bot' else cbr
+
+
+def _jogar_shard(agente1, agente2, partidas, semente, primeira_partida=0):
+    """Joga um shard de partidas no processo atual, reaproveitando o CBR já carregado. Os baralhos e os agentes aleatórios
+    de cada partida usam fluxos derivados de (semente mestre, número da partida), então o resultado não depende do shard."""
+    if (not _CONTEXTO):
+        _inicializar_trabalhador(agente1, agente2)
+
+    jogador1 = criar_agente(agente1, 'Jogador 1')
+    jogador2 = criar_agente(agente2, 'Jogador 2')
+    simulador = Simulador(jogador1, jogador2, _CONTEXTO['cbr'][1], _CONTEXTO['cbr'][2], semente=semente)
+    return simulador.simular(partidas, primeira_partida)
+
+
+def dividir_shards(partidas, tamanho_shard, semente):
+    """Divide as partidas em shards de tamanho fixo: (tamanho, (semente mestre, número da primeira partida do shard))."""
+    shards = []
+    inicio = 0
+    while (inicio < partidas):
+        tamanho = min(tamanho_shard, partidas - inicio)
+        shards.append((tamanho, (semente, inicio)))
+        inicio += tamanho
+
+    return shards
+
+
+def executar_torneio(agente1, agente2, partidas, trabalhadores=None, semente=0, tamanho_shard=25):
+    """Executa as partidas em um pool de processos e agrega os resumos na ordem dos shards, independente da quantidade de trabalhadores."""
+    if (trabalhadores is None):
+        trabalhadores = os.cpu_count() or 1
+
+    shards = dividir_shards(partidas, tamanho_shard, semente)
+    resumo = ResumoSimulacao()
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_inicializar_trabalhador, initargs=(agente1, agente2)) as executor:
+        parciais = executor.map(_jogar_shard, [agente1] * len(shards), [agente2] * len(shards), [tamanho for tamanho, _ in shards],
+                                [semente_shard for _, (semente_shard, _) in shards], [inicio_shard for _, (_, inicio_shard) in shards])
+        for parcial in parciais:
+            resumo.combinar(parcial)
+
+    resumo.duracao = time.perf_counter() - inicio
+    return resumo
+
+
+def medir_escalabilidade(agente1, agente2, partidas, max_trabalhadores=None, semente=0, tamanho_shard=25):
+    """Executa o mesmo torneio com 1 até N trabalhadores e retorna partidas/s e aceleração de cada execução."""
+    if (max_trabalhadores is None):
+        max_trabalhadores = os.cpu_count() or 1
+
+    medicoes = []
+    base = None
+    for trabalhadores in range(1, max_trabalhadores + 1):
+        resumo = executar_torneio(agente1, agente2, partidas, trabalhadores, semente, tamanho_shard)
+        vazao = resumo.partidas_por_segundo()
+        if (base is None):
+            base = vazao
+
+        medicoes.append({'trabalhadores': trabalhadores, 'partidas_por_segundo': vazao, 'aceleracao': vazao / base if base else 0.0, 'resumo': resumo})
+
+    return medicoes
+
+
+def main(argumentos=None):
+    """Executa um torneio pela linha de comando e exibe o resumo ou a tabela de escalabilidade."""
+    parser = argparse.ArgumentParser(description='Torneio de truco entre agentes, distribuído em vários processos.')
+    parser.add_argument('--partidas', type=int, default=100)
+    parser.add_argument('--trabalhadores', type=int, default=None)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--tamanho-shard', type=int, default=25)
+    parser.add_argument('--agente1', default='bot', choices=['bot', 'aleatorio', 'roteirizado'])
+    parser.add_argument('--agente2', default='aleatorio', choices=['bot', 'aleatorio', 'roteirizado'])
+    parser.add_argument('--escalabilidade', action='store_true', help='mede partidas/s de 1 até N trabalhadores')
+    args = parser.parse_args(argumentos)
+
+    if (args.escalabilidade):
+        medicoes = medir_escalabilidade(args.agente1, args.agente2, args.partidas, args.trabalhadores, args.semente, args.tamanho_shard)
+        for medicao in medicoes:
+            print(f"{medicao['trabalhadores']:>3} trabalhador(es): {medicao['partidas_por_segundo']:.2f} partidas/s (x{medicao['aceleracao']:.2f})")
+
+        return medicoes
+
+    resumo = executar_torneio(args.agente1, args.agente2, args.partidas, args.trabalhadores, args.semente, args.tamanho_shard)
+    print(resumo)
+    return resumo
+
+
+if __name__ == '__main__':
+    main()
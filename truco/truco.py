@@ -1,5 +1,23 @@
-class Truco():
-    def __init__(self):
+from .agentes import AgenteJogador, AgenteTerminal, Pergunta, perguntar
+from .apostas import ACEITAR, ACOES, PEDE, RECUSAR, RESPONDE, TRANSICOES, Aposta
+from .estado import EstadoJogo, campo_estado
+from .interface import Interface
+
+
+class Truco(Aposta):
+    APOSTA = 'truco'
+    # Andamento da aposta, guardado no EstadoJogo compartilhado com o motor
+    valor_aposta = campo_estado('valor_truco')
+    estado_atual = campo_estado('estado_truco')
+    jogador_bloqueado = campo_estado('truco_bloqueado')
+    jogador_pediu = campo_estado('truco_pediu')
+    jogador_fugiu = campo_estado('truco_fugiu')
+
+    def __init__(self, agentes=None, interface=None, estado=None):
+        self.estado = estado or EstadoJogo()
+        # Agentes que respondem aos pedidos em cada posição; por padrão, o humano no terminal é o jogador 1 e o bot o jogador 2
+        self.interface = interface or Interface()
+        self.agentes = agentes or {1: AgenteTerminal(self.interface), 2: AgenteJogador()}
         self.valor_aposta = 1
         self.jogador_bloqueado = 0
         self.jogador_pediu = 0
@@ -9,149 +27,75 @@ class Truco():
         self.estado_atual = ""
 
 
-    def inverter_jogador_bloqueado(self):
-        """Lógica para impedir que o mesmo jogador não peça o aumento de aposta seguidamente."""
-        if (self.jogador_bloqueado == 1):
-            self.jogador_bloqueado = 2
-        
-        else:
-            self.jogador_bloqueado = 1
-
-
-    def inicializar_jogador_bloqueado(self, quem_pediu):
-        """Inicialização do jogador que foi bloqueado e não pode pedir aumento da aposta do jogo."""
-        self.jogador_bloqueado = quem_pediu
+    def responder_pedido(self, cbr, quem_pediu, jogador1, jogador2, opcoes):
+        """Pede ao agente do adversário de quem pediu a resposta ao aumento, bloqueando quem respondeu de pedir em seguida."""
+        estado = self.estado
+        quem = 2 if quem_pediu == 1 else 1
+        jogador = jogador2 if quem == 2 else jogador1
+        escolha = perguntar(self.agentes[quem], Pergunta('truco', quem, jogador, cbr, opcoes, estado.estado_truco, estado.valor_truco, padrao=1))
+        estado.truco_bloqueado = quem_pediu
+        return escolha
 
 
     def controlador_truco(self, cbr, dados, quem_pediu, jogador1, jogador2):
         """Controlador de métodos, para selecionar o que pode ser chamado ou não."""
-        if (self.estado_atual == "vale_quatro"):
-            return None
-
         if (quem_pediu == self.jogador_bloqueado):
             return None
-        else:
-            self.inicializar_jogador_bloqueado(quem_pediu)
 
-        if (self.estado_atual == ""):
-            estado = self.pedir_truco(cbr, quem_pediu, jogador1, jogador2)
+        pedidos = self.acoes_validas(PEDE)
+        if (not pedidos):
+            return None
 
-        elif (self.estado_atual == "truco"):
-            estado = self.pedir_retruco(cbr, quem_pediu, jogador1, jogador2)
+        self.inicializar_jogador_bloqueado(quem_pediu)
+        return self.apostar(next(iter(pedidos)), cbr, quem_pediu, jogador1, jogador2)
 
-        elif (self.estado_atual == "retruco"):
-            estado = self.pedir_retruco(cbr, quem_pediu, jogador1, jogador2)
-            
-        else:
-            return None
 
-        return estado
+    def apostar(self, nivel, cbr, quem_pediu, jogador1, jogador2):
+        """Pede o nível de aposta informado e segue a tabela de transições enquanto quem responde aumentar a aposta.
+        Retorna True se o pedido foi aceito e False se foi recusado (quem pediu recebe os pontos da recusa)."""
+        estado = self.estado
+        while True:
+            estado.estado_truco = nivel
+            _, pontos_recusa, estado.valor_truco = TRANSICOES[(self.APOSTA, nivel, RESPONDE, ACEITAR)]
+            self.interface.mostrar_aposta(self.nome_nivel(nivel))
+            escolha = self.responder_pedido(cbr, quem_pediu, jogador1, jogador2, ACOES[(self.APOSTA, nivel, RESPONDE)])
 
+            if (escolha == RECUSAR):
+                if (quem_pediu == 1):
+                    jogador1.pontos += pontos_recusa
 
-    def pedir_truco(self, cbr, quem_pediu, jogador1, jogador2):
-        """Aumenta a aposta inicial do jogo, que passa a valer 2 pontos."""
-        print("Truco")
-        self.estado_atual = "truco"
+                else:
+                    jogador2.pontos += pontos_recusa
 
-        if (quem_pediu == 1):
-            escolha = jogador2.avaliar_truco(cbr, self.estado_atual, quem_pediu)
-            self.jogador_bloqueado = 1
+                return False
 
-        else:
-            escolha = -1
-            while(escolha not in [0, 1, 2]):
-                escolha = int(input(f"{quem_pediu}, você aceita o pedido (a mão passa a valer {(self.valor_aposta)} pontos)\n[0] Recusar\n[1] Aceitar\n[2] Aumentar Aposta"))
-            self.jogador_bloqueado = 2
-        
+            if (escolha == ACEITAR):
+                self.interface.mostrar_aposta(f"Jogador {quem_pediu} aceitou o pedido.")
+                if ((self.APOSTA, nivel, PEDE) not in ACOES):
+                    jogador1.pediu_truco = True
+                    jogador2.pediu_truco = True
 
-        if escolha == 0:
-            if (quem_pediu == 1):
-                jogador1.pontos += 1
+                return True
 
-            else:
-                jogador2.pontos += 1
+            # Quem respondeu aumenta a aposta e passa a ser o jogador bloqueado
+            nivel = TRANSICOES[(self.APOSTA, nivel, RESPONDE, escolha)][0]
+            quem_pediu = estado.truco_bloqueado = 3 - quem_pediu
+            self.interface.mostrar_aposta(f"Jogador {quem_pediu} pediu {self.nome_nivel(nivel)}.")
 
-            return False
 
-        elif escolha == 1:
-            print(f"Jogador {quem_pediu} aceitou o pedido.")
-            # self.valor_aposta += self.valor_aposta
-            return True
-                
-        elif escolha == 2:
-            print(f"Jogador {quem_pediu} pediu Retruco.")
-            self.inverter_jogador_bloqueado()
-            return self.pedir_retruco(cbr, self.jogador_bloqueado, jogador1, jogador2)
+    def pedir_truco(self, cbr, quem_pediu, jogador1, jogador2):
+        """Aumenta a aposta inicial do jogo, que passa a valer 2 pontos."""
+        return self.apostar('truco', cbr, quem_pediu, jogador1, jogador2)
 
 
     def pedir_retruco(self, cbr, quem_pediu, jogador1, jogador2):
         """Aumenta a aposta, que passa a valer 3 pontos."""
-        self.valor_aposta = 3
-        self.estado_atual = "retruco"
-        print("Retruco")
-
-        if (quem_pediu == 1):
-            escolha = jogador2.avaliar_truco(cbr, self.estado_atual, quem_pediu)
-            self.jogador_bloqueado = 1
-
-        else:
-            escolha = -1
-            while(escolha not in [0, 1, 2]):
-                escolha = int(input(f"Jogador {quem_pediu}, você aceita o pedido (a mão passa a valer {(self.valor_aposta)} pontos)\n[0] Recusar\n[1] Aceitar\n[2] Aumentar Aposta"))
-            self.jogador_bloqueado = 2
-        
-
-        if escolha == 0:
-            if (quem_pediu == 1):
-                jogador1.pontos += 2
-
-            else:
-                jogador2.pontos += 2
-
-            return False
-
-        elif escolha == 1:
-            print(f"Jogador {quem_pediu} aceitou o pedido.")
-            # self.valor_aposta += self.valor_aposta
-            return True
-                
-        elif escolha == 2:
-            print(f"Jogador {quem_pediu} pediu Retruco.")
-            self.inverter_jogador_bloqueado()
-            return self.pedir_vale_quatro(cbr, self.jogador_bloqueado, jogador1, jogador2)
+        return self.apostar('retruco', cbr, quem_pediu, jogador1, jogador2)
 
 
     def pedir_vale_quatro(self, cbr, quem_pediu, jogador1, jogador2):
         """Aumenta a aposta, que passa a valer 4 pontos"""
-        self.valor_aposta = 4
-        print("Vale 4")
-
-        if (quem_pediu == 1):
-            escolha = jogador2.avaliar_truco(cbr, self.estado_atual, quem_pediu)
-            self.jogador_bloqueado = 1
-
-        else:
-            escolha = -1
-            while(escolha not in [0, 1]):
-                escolha = int(input(f"Jogador {quem_pediu}, você aceita o pedido (a mão passa a valer {(self.valor_aposta)} pontos)\n[0] Recusar\n[1] Aceitar"))
-            self.jogador_bloqueado = 2
-        
-
-        if escolha == 0:
-            if (quem_pediu == 1):
-                jogador1.pontos += 3
-
-            else:
-                jogador2.pontos += 3
-
-            return False
-
-        else:
-            print(f"Jogador {quem_pediu} aceitou o pedido.")
-            jogador1.pediu_truco = True
-            jogador2.pediu_truco = True
-            # self.valor_aposta += self.valor_aposta
-            return True
+        return self.apostar('vale_quatro', cbr, quem_pediu, jogador1, jogador2)
 
 
     def retornar_valor_aposta(self):
@@ -0,0 +1,225 @@
+import numpy as np
+
+
+def moda(valores, padrao=None):
+    """Retorna o valor mais frequente; em empate vence o valor que aparece primeiro, ou seja, o do vizinho mais próximo."""
+    if (len(valores) == 0):
+        if (padrao is None):
+            raise IndexError('moda de um conjunto vazio')
+
+        return padrao
+
+    deslocados = valores.astype(np.int64) - int(valores.min())
+    contagem = np.bincount(deslocados)
+    return int(valores[np.argmax(contagem[deslocados] == contagem.max())])
+
+
+# Valor usado quando nenhum vizinho satisfaz o filtro da decisão (antes, value_counts de uma série vazia gerava IndexError).
+# Fica fora do domínio das colunas (os ausentes são -100), para que as decisões reconheçam a falta de votos e não a confundam com 0
+SEM_VOTOS = np.iinfo(np.int16).min
+
+
+def moda_lote(valores, mascara=None, padrao=SEM_VOTOS):
+    """Moda de cada linha entre os valores selecionados pela máscara, com o mesmo desempate de moda; linhas sem valores recebem o padrão."""
+    linhas = len(valores)
+    if (valores.size == 0):
+        return np.full(linhas, padrao, dtype=np.int64)
+
+    if (mascara is None):
+        mascara = np.ones(valores.shape, dtype=bool)
+
+    # Contagem de todas as linhas em um único bincount, deslocando os valores de cada linha para uma faixa própria
+    deslocados = valores.astype(np.int64) - int(valores.min())
+    faixa = int(deslocados.max()) + 1
+    chaves = deslocados + faixa * np.arange(linhas)[:, None]
+    contagem = np.bincount(chaves[mascara], minlength=linhas * faixa)
+    contagem_elementos = np.where(mascara, contagem[chaves], -1)
+    modas = valores[np.arange(linhas), contagem_elementos.argmax(axis=1)].astype(np.int64)
+    return np.where(mascara.any(axis=1), modas, padrao)
+
+
+def mascara_jogadas_vencidas(casos, colunas):
+    """Casos em que o bot venceu a terceira rodada e a primeira ou a segunda."""
+    return (casos[..., colunas['ganhadorTerceiraRodada']] == 2) & ((casos[..., colunas['ganhadorPrimeiraRodada']] == 2) | (casos[..., colunas['ganhadorSegundaRodada']] == 2))
+
+
+def mascara_truco_ganho(casos, colunas):
+    """Casos em que o bot ganhou o truco."""
+    return casos[..., colunas['quemGanhouTruco']] == 2
+
+
+def mascara_truco_perdido(casos, colunas):
+    """Casos em que o bot perdeu o truco."""
+    return casos[..., colunas['quemGanhouTruco']] == 1
+
+
+def mascara_envido_ganho(casos, colunas):
+    """Casos em que o bot ganhou o envido ou tinha mais pontos de envido."""
+    return (casos[..., colunas['pontosEnvidoRobo']] > casos[..., colunas['pontosEnvidoHumano']]) | (casos[..., colunas['quemGanhouEnvido']] == 2)
+
+
+def mascara_envido_perdido(casos, colunas):
+    """Casos em que o bot perdeu o envido ou tinha menos pontos de envido."""
+    return (casos[..., colunas['pontosEnvidoRobo']] < casos[..., colunas['pontosEnvidoHumano']]) | (casos[..., colunas['quemGanhouEnvido']] == 1)
+
+
+def mascara_flor_ganha(casos, colunas):
+    """Casos em que o bot ganhou a flor."""
+    return casos[..., colunas['quemGanhouFlor']] == 2
+
+
+def mascara_flor_perdida(casos, colunas):
+    """Casos em que o bot perdeu a flor."""
+    return casos[..., colunas['quemGanhouFlor']] == 1
+
+
+# Partições da base de casos pelos resultados filtrados em cada decisão
+PARTICOES = {
+    'jogadas_vencidas': mascara_jogadas_vencidas,
+    'truco_ganho': mascara_truco_ganho,
+    'truco_perdido': mascara_truco_perdido,
+    'envido_ganho': mascara_envido_ganho,
+    'envido_perdido': mascara_envido_perdido,
+}
+
+
+class VotosTruco():
+    """Estatísticas dos vizinhos usadas na decisão do truco."""
+    __slots__ = ('vencidas', 'perdidas', 'retruco', 'qualidade_mao_humana')
+
+    def __init__(self, vencidas, perdidas, retruco, qualidade_mao_humana):
+        self.vencidas = vencidas
+        self.perdidas = perdidas
+        self.retruco = retruco
+        self.qualidade_mao_humana = qualidade_mao_humana
+
+
+class VotosEnvido():
+    """Estatísticas dos vizinhos usadas na decisão do envido."""
+    __slots__ = ('envido_ganhas', 'envido_perdidas', 'real_envido_ganhas', 'real_envido_perdidas', 'falta_envido_ganhas', 'falta_envido_perdidas', 'pontos_jogador')
+
+    def __init__(self, envido_ganhas, envido_perdidas, real_envido_ganhas, real_envido_perdidas, falta_envido_ganhas, falta_envido_perdidas, pontos_jogador):
+        self.envido_ganhas = envido_ganhas
+        self.envido_perdidas = envido_perdidas
+        self.real_envido_ganhas = real_envido_ganhas
+        self.real_envido_perdidas = real_envido_perdidas
+        self.falta_envido_ganhas = falta_envido_ganhas
+        self.falta_envido_perdidas = falta_envido_perdidas
+        self.pontos_jogador = pontos_jogador
+
+
+class VotosJogada():
+    """Carta mais jogada pelo bot em cada rodada, entre os vizinhos em que ele venceu a mão."""
+    __slots__ = ('referencias',)
+
+    def __init__(self, referencias):
+        self.referencias = referencias
+
+
+class VotosFlor():
+    """Estatísticas dos vizinhos usadas na resposta à contraflor."""
+    __slots__ = ('ganhas', 'perdidas', 'pontos_jogador')
+
+    def __init__(self, ganhas, perdidas, pontos_jogador):
+        self.ganhas = ganhas
+        self.perdidas = perdidas
+        self.pontos_jogador = pontos_jogador
+
+
+def votar_truco(jogadas, perdidas, colunas):
+    """Calcula os votos do truco a partir dos casos com truco ganho e perdido pelo bot."""
+    return VotosTruco(moda(jogadas[:, colunas['quemGanhouTruco']], SEM_VOTOS), moda(perdidas[:, colunas['quemGanhouTruco']], SEM_VOTOS),
+                      moda(jogadas[:, colunas['quemRetruco']], SEM_VOTOS), moda(jogadas[:, colunas['qualidadeMaoHumano']], SEM_VOTOS))
+
+
+def votar_envido(ganhas, perdidas, colunas):
+    """Calcula os votos do envido a partir dos casos com envido ganho e perdido pelo bot."""
+    return VotosEnvido(moda(ganhas[:, colunas['quemGanhouEnvido']], SEM_VOTOS), moda(perdidas[:, colunas['quemGanhouEnvido']], SEM_VOTOS),
+                       moda(ganhas[:, colunas['quemPediuRealEnvido']], SEM_VOTOS), moda(perdidas[:, colunas['quemPediuFaltaEnvido']], SEM_VOTOS),
+                       moda(ganhas[:, colunas['quemPediuFaltaEnvido']], SEM_VOTOS), moda(perdidas[:, colunas['quemPediuFaltaEnvido']], SEM_VOTOS),
+                       moda(ganhas[:, colunas['pontosEnvidoHumano']], SEM_VOTOS))
+
+
+def votar_flor(ganhas, perdidas, colunas):
+    """Calcula os votos da contraflor: quantos vizinhos o bot ganhou e perdeu a flor e os pontos de flor mais comuns do adversário nas perdidas."""
+    return VotosFlor(len(ganhas), len(perdidas), moda(perdidas[:, colunas['pontosFlorHumano']], SEM_VOTOS))
+
+
+def votar_jogada(vencidas, colunas):
+    """Calcula a carta mais jogada pelo bot em cada rodada, a partir dos casos em que ele venceu a mão."""
+    referencias = {}
+    for rodada, nome in [(3, 'primeiraCartaRobo'), (2, 'segundaCartaRobo'), (1, 'terceiraCartaRobo')]:
+        referencias[rodada] = moda(vencidas[:, colunas[nome]], SEM_VOTOS)
+
+    return VotosJogada(referencias)
+
+
+def votar_truco_lote(jogadas, mascara_jogadas, perdidas, mascara_perdidas, colunas):
+    """Votos do truco de um lote de consultas: casos (lote, k, colunas) e máscaras dos casos com truco ganho e perdido pelo bot."""
+    colunas_votos = [moda_lote(jogadas[..., colunas['quemGanhouTruco']], mascara_jogadas), moda_lote(perdidas[..., colunas['quemGanhouTruco']], mascara_perdidas),
+                     moda_lote(jogadas[..., colunas['quemRetruco']], mascara_jogadas), moda_lote(jogadas[..., colunas['qualidadeMaoHumano']], mascara_jogadas)]
+    return [VotosTruco(*valores) for valores in zip(*(coluna.tolist() for coluna in colunas_votos))]
+
+
+def votar_envido_lote(ganhas, mascara_ganhas, perdidas, mascara_perdidas, colunas):
+    """Votos do envido de um lote de consultas: casos (lote, k, colunas) e máscaras dos casos com envido ganho e perdido pelo bot."""
+    colunas_votos = [moda_lote(ganhas[..., colunas['quemGanhouEnvido']], mascara_ganhas), moda_lote(perdidas[..., colunas['quemGanhouEnvido']], mascara_perdidas),
+                     moda_lote(ganhas[..., colunas['quemPediuRealEnvido']], mascara_ganhas), moda_lote(perdidas[..., colunas['quemPediuFaltaEnvido']], mascara_perdidas),
+                     moda_lote(ganhas[..., colunas['quemPediuFaltaEnvido']], mascara_ganhas), moda_lote(perdidas[..., colunas['quemPediuFaltaEnvido']], mascara_perdidas),
+                     moda_lote(ganhas[..., colunas['pontosEnvidoHumano']], mascara_ganhas)]
+    return [VotosEnvido(*valores) for valores in zip(*(coluna.tolist() for coluna in colunas_votos))]
+
+
+def votar_jogada_lote(vencidas, mascara_vencidas, colunas):
+    """Votos da carta a ser jogada de um lote de consultas, entre os casos da máscara em que o bot venceu a mão."""
+    colunas_votos = [moda_lote(vencidas[..., colunas[nome]], mascara_vencidas).tolist() for nome in ['primeiraCartaRobo', 'segundaCartaRobo', 'terceiraCartaRobo']]
+    return [VotosJogada({3: primeira, 2: segunda, 1: terceira}) for primeira, segunda, terceira in zip(*colunas_votos)]
+
+
+class Vizinhanca():
+    """Casos vizinhos de uma consulta (matriz int16), com os votos de cada decisão calculados uma única vez, sob demanda."""
+    def __init__(self, indices, casos, colunas):
+        self.indices = indices
+        self.casos = casos
+        self.colunas = colunas
+        self.votos = {}
+
+
+    def coluna(self, nome):
+        """Retorna os valores de uma coluna para todos os vizinhos."""
+        return self.casos[:, self.colunas[nome]]
+
+
+    def votos_truco(self):
+        """Votos para o truco, entre os vizinhos em que o truco foi ganho ou perdido pelo bot."""
+        if ('truco' not in self.votos):
+            self.votos['truco'] = votar_truco(self.casos[mascara_truco_ganho(self.casos, self.colunas)],
+                                              self.casos[mascara_truco_perdido(self.casos, self.colunas)], self.colunas)
+
+        return self.votos['truco']
+
+
+    def votos_envido(self):
+        """Votos para o envido, entre os vizinhos em que o envido foi ganho ou perdido pelo bot."""
+        if ('envido' not in self.votos):
+            self.votos['envido'] = votar_envido(self.casos[mascara_envido_ganho(self.casos, self.colunas)],
+                                                self.casos[mascara_envido_perdido(self.casos, self.colunas)], self.colunas)
+
+        return self.votos['envido']
+
+
+    def votos_flor(self):
+        """Votos para a contraflor, entre os vizinhos em que a flor foi ganha ou perdida pelo bot."""
+        if ('flor' not in self.votos):
+            self.votos['flor'] = votar_flor(self.casos[mascara_flor_ganha(self.casos, self.colunas)],
+                                            self.casos[mascara_flor_perdida(self.casos, self.colunas)], self.colunas)
+
+        return self.votos['flor']
+
+
+    def votos_jogada(self):
+        """Votos da carta a ser jogada, entre os vizinhos em que o bot venceu a terceira rodada e a primeira ou a segunda."""
+        if ('jogada' not in self.votos):
+            self.votos['jogada'] = votar_jogada(self.casos[mascara_jogadas_vencidas(self.casos, self.colunas)], self.colunas)
+
+        return self.votos['jogada']